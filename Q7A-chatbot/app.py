@@ -1,18 +1,42 @@
+import functools
+import hmac
+import itertools
+import os
+import random
 import re
+import time
 import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 import uvicorn
 from dotenv import load_dotenv
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, Response
 from litellm import completion
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.trace import Status, StatusCode
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    ProcessCollector,
+    generate_latest,
+)
 from pydantic import BaseModel
 
 load_dotenv()
 
 # --- Config ---
 
-MODEL = "vertex_ai/gemini-2.0-flash-lite"
+# LLM_MODEL overrides the model, e.g. to point load tests at loadtest/stub_llm.py.
+MODEL = os.environ.get("LLM_MODEL", "vertex_ai/gemini-2.0-flash-lite")
 
 SYSTEM_PROMPT = """\
 <role>
@@ -230,8 +254,12 @@ def generate_response(messages: list[dict]) -> str:
     """Generate a response using LiteLLM."""
     try:
         response = completion(model=MODEL, messages=messages)
+        record_usage(response)
         return response.choices[0].message.content
     except Exception as e:
+        span = trace.get_current_span()
+        span.record_exception(e)
+        span.set_status(Status(StatusCode.ERROR, str(e)))
         return f"Something went wrong: {e}"
 
 
@@ -279,6 +307,203 @@ def looks_like_pitch(text: str) -> bool:
 
 sessions: dict[str, list[dict]] = {}
 
+# --- Metrics ---
+
+# A registry of our own instead of prometheus_client's global one: evalkit loads
+# app.py by path, and `python -m evalkit.ab --b-app` can load a second copy of it
+# into the same process, whose metrics would otherwise clash with these.
+REGISTRY = CollectorRegistry()
+ProcessCollector(registry=REGISTRY)
+
+FAST_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 0.01)
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+REQUEST_SECONDS = Histogram(
+    "chat_request_seconds", "Time in the /chat handler", buckets=SLOW_BUCKETS, registry=REGISTRY
+)
+GUARDRAIL_SECONDS = Histogram(
+    "chat_guardrail_seconds", "Time in safety, redirect, and off-topic checks per request",
+    buckets=FAST_BUCKETS, registry=REGISTRY,
+)
+LLM_SECONDS = Histogram(
+    "chat_llm_seconds", "Time in the LLM call", buckets=SLOW_BUCKETS, registry=REGISTRY
+)
+SERIALIZATION_SECONDS = Histogram(
+    "chat_serialization_seconds", "Time serializing the /chat response",
+    buckets=FAST_BUCKETS, registry=REGISTRY,
+)
+SHORT_CIRCUITS = Counter(
+    "chat_short_circuits", "Requests answered by a guardrail instead of the model",
+    ["reason"], registry=REGISTRY,
+)
+_SHORT_CIRCUIT = {r: SHORT_CIRCUITS.labels(r) for r in ("safety", "redirect", "off_topic")}
+TOKENS = Counter("chat_llm_tokens", "LLM tokens used", ["kind"], registry=REGISTRY)
+_PROMPT_TOKENS = TOKENS.labels("prompt")
+_COMPLETION_TOKENS = TOKENS.labels("completion")
+
+# Session gauges are computed when scraped, so requests pay nothing for them.
+Gauge("chat_sessions", "Sessions held in memory", registry=REGISTRY).set_function(
+    lambda: len(sessions)
+)
+Gauge(
+    "chat_session_bytes", "UTF-8 bytes of message content held in sessions", registry=REGISTRY
+).set_function(
+    lambda: sum(
+        len((m["content"] or "").encode()) for s in list(sessions.values()) for m in list(s)
+    )
+)
+
+
+def record_usage(response) -> None:
+    """Count an LLM response's tokens, and put them and cache hits on the current span."""
+    usage = getattr(response, "usage", None)
+    if usage:
+        _PROMPT_TOKENS.inc(usage.prompt_tokens or 0)
+        _COMPLETION_TOKENS.inc(usage.completion_tokens or 0)
+    span = trace.get_current_span()
+    if not span.is_recording():
+        return
+    # litellm's response cache marks hits; cached_tokens is the provider's prompt cache.
+    hidden = getattr(response, "_hidden_params", None) or {}
+    span.set_attribute("llm.cache_hit", bool(hidden.get("cache_hit")))
+    if usage:
+        details = getattr(usage, "prompt_tokens_details", None)
+        span.set_attributes(
+            {
+                "gen_ai.usage.input_tokens": usage.prompt_tokens or 0,
+                "gen_ai.usage.output_tokens": usage.completion_tokens or 0,
+                "gen_ai.usage.cache_read.input_tokens": getattr(details, "cached_tokens", None) or 0,
+            }
+        )
+
+
+def record_chat(
+    total: float,
+    guardrail: float,
+    serialization: float,
+    llm: float | None = None,
+    short_circuit: str | None = None,
+) -> None:
+    """Record one /chat request's stage timings (seconds)."""
+    REQUEST_SECONDS.observe(total)
+    GUARDRAIL_SECONDS.observe(guardrail)
+    SERIALIZATION_SECONDS.observe(serialization)
+    if llm is not None:
+        LLM_SECONDS.observe(llm)
+    if short_circuit is not None:
+        _SHORT_CIRCUIT[short_circuit].inc()
+
+
+# --- Tracing ---
+
+# OTEL_TRACES_EXPORTER picks where spans go: "otlp" (to OTEL_EXPORTER_OTLP_ENDPOINT),
+# "console", or "none". Spans are recorded either way.
+TRACES_EXPORTER = os.environ.get("OTEL_TRACES_EXPORTER", "none")
+GUARDRAIL_STAGES = ("safety_check", "looks_like_pitch", "post_generation_check")
+
+
+def span_exporter(name: str):
+    """The span exporter for an OTEL_TRACES_EXPORTER value, or None for "none"."""
+    if name == "none":
+        return None
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter()
+    raise ValueError(f"unknown OTEL_TRACES_EXPORTER {name!r}; use otlp, console, or none")
+
+
+tracer_provider = TracerProvider(resource=Resource.create({"service.name": "pitchscan"}))
+_exporter = span_exporter(TRACES_EXPORTER)
+if _exporter is not None:
+    tracer_provider.add_span_processor(BatchSpanProcessor(_exporter))
+tracer = tracer_provider.get_tracer(__name__)
+
+
+class Stages:
+    """Per-stage timings of one request, each stage traced as a span."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.durations: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        with tracer.start_as_current_span(name) as span:
+            start = time.perf_counter()
+            try:
+                yield span
+            finally:
+                self.durations[name] = time.perf_counter() - start
+
+    def server_timing(self, total: float) -> str:
+        """A Server-Timing header value, in milliseconds, for browser devtools."""
+        entries = [*self.durations.items(), ("total", total)]
+        return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in entries)
+
+
+# --- Profiling ---
+
+# Opt-in. With PROFILE_TOKEN set, a request carrying "X-Profile-Token: <token>", or a
+# PROFILE_SAMPLE_RATE fraction of all requests, runs under pyinstrument, and the last
+# PROFILE_KEEP profiles are served from /admin/profiles. Without a token none of this
+# is installed, so requests pay nothing.
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "20"))
+PROFILE_HEADER = "X-Profile-Token"
+
+profiles: deque[dict] = deque(maxlen=PROFILE_KEEP)
+_profile_ids = itertools.count(1)
+# Set by the middleware and read by `profiled` in the handler's worker thread:
+# pyinstrument only samples the thread that starts it.
+_profile_reason: ContextVar[str | None] = ContextVar("profile_reason", default=None)
+
+
+def has_profile_token(headers) -> bool:
+    token = headers.get(PROFILE_HEADER)
+    if not PROFILE_TOKEN or token is None:
+        return False
+    # As bytes: compare_digest raises TypeError on non-ASCII str.
+    return hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode())
+
+
+def profiled(handler):
+    """Run a sync handler under pyinstrument when the middleware flagged its request.
+
+    Returns the handler unchanged when profiling is off.
+    """
+    if not PROFILE_TOKEN:
+        return handler
+    from pyinstrument import Profiler
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        reason = _profile_reason.get()
+        if reason is None:
+            return handler(*args, **kwargs)
+        profiler = Profiler(async_mode="disabled")
+        profiler.start()
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            session = profiler.stop()
+            profiles.append(
+                {
+                    "id": next(_profile_ids),
+                    "handler": handler.__name__,
+                    "reason": reason,
+                    "started": session.start_time,
+                    "duration": session.duration,
+                    "session": session,
+                }
+            )
+
+    return wrapper
+
+
 # --- FastAPI App ---
 
 app = FastAPI()
@@ -299,32 +524,82 @@ def index():
     return FileResponse("index.html")
 
 
-@app.post("/chat", response_model=ChatResponse)
-def chat(request: ChatRequest):
-    session_id = request.session_id or str(uuid.uuid4())
-
-    # Pre-generation safety check
-    safety_response = safety_check(request.message)
-    if safety_response:
-        return ChatResponse(response=safety_response, session_id=session_id)
-
-    # Pre-generation heuristic: redirect generic/non-pitch messages
-    if not looks_like_pitch(request.message):
-        return ChatResponse(response=REDIRECT_MSG, session_id=session_id)
-
-    if session_id not in sessions:
-        sessions[session_id] = build_initial_messages()
+def respond(
+    text: str, session_id: str, stages: Stages, short_circuit: str | None = None
+) -> Response:
+    """Serialize a ChatResponse ourselves, so its time can be measured, and record metrics.
+
+    The stage breakdown goes out in a Server-Timing header.
+    """
+    with stages.stage("serialize"):
+        body = ChatResponse(response=text, session_id=session_id).model_dump_json()
+    total = time.perf_counter() - stages.start
+    durations = stages.durations
+    record_chat(
+        total,
+        sum(durations.get(name, 0.0) for name in GUARDRAIL_STAGES),
+        durations["serialize"],
+        llm=durations.get("completion"),
+        short_circuit=short_circuit,
+    )
+    if short_circuit is not None:
+        trace.get_current_span().set_attribute("chat.short_circuit", short_circuit)
+    headers = {"Server-Timing": stages.server_timing(total)}
+    return Response(body, media_type="application/json", headers=headers)
 
-    sessions[session_id].append({"role": "user", "content": request.message})
 
-    response_text = generate_response(sessions[session_id])
-
-    # Post-generation backstop
-    response_text = post_generation_check(request.message, response_text)
-
-    sessions[session_id].append({"role": "assistant", "content": response_text})
-
-    return ChatResponse(response=response_text, session_id=session_id)
+@app.post("/chat", response_model=ChatResponse)
+@profiled
+def chat(request: ChatRequest):
+    stages = Stages()
+    with tracer.start_as_current_span("chat") as span:
+        session_id = request.session_id or str(uuid.uuid4())
+        span.set_attribute("chat.session_id", session_id)
+
+        # Pre-generation safety check
+        with stages.stage("safety_check") as stage:
+            safety_response = safety_check(request.message)
+            stage.set_attribute("guardrail.triggered", safety_response is not None)
+        if safety_response:
+            return respond(safety_response, session_id, stages, short_circuit="safety")
+
+        # Pre-generation heuristic: redirect generic/non-pitch messages
+        with stages.stage("looks_like_pitch") as stage:
+            is_pitch = looks_like_pitch(request.message)
+            stage.set_attribute("guardrail.triggered", not is_pitch)
+        if not is_pitch:
+            return respond(REDIRECT_MSG, session_id, stages, short_circuit="redirect")
+
+        with stages.stage("session") as stage:
+            stage.set_attribute("session.new", session_id not in sessions)
+            if session_id not in sessions:
+                sessions[session_id] = build_initial_messages()
+            sessions[session_id].append({"role": "user", "content": request.message})
+            stage.set_attribute("session.messages", len(sessions[session_id]))
+
+        with stages.stage("completion") as stage:
+            stage.set_attribute("gen_ai.request.model", MODEL)
+            response_text = generate_response(sessions[session_id])
+
+        # Post-generation backstop
+        with stages.stage("post_generation_check") as stage:
+            response_text = post_generation_check(request.message, response_text)
+            off_topic = response_text == REDIRECT_MSG
+            stage.set_attribute("guardrail.triggered", off_topic)
+
+        sessions[session_id].append({"role": "assistant", "content": response_text})
+
+        return respond(
+            response_text,
+            session_id,
+            stages,
+            short_circuit="off_topic" if off_topic else None,
+        )
+
+
+@app.get("/metrics")
+def metrics():
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.post("/clear")
@@ -334,5 +609,49 @@ def clear(session_id: str | None = None):
     return {"status": "ok"}
 
 
+if PROFILE_TOKEN:
+
+    @app.middleware("http")
+    async def flag_profiled_requests(request: Request, call_next):
+        reason = None
+        if has_profile_token(request.headers):
+            reason = "header"
+        elif PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+            reason = "sampled"
+        token = _profile_reason.set(reason)
+        try:
+            return await call_next(request)
+        finally:
+            _profile_reason.reset(token)
+
+    def require_profile_token(request: Request) -> None:
+        if not has_profile_token(request.headers):
+            raise HTTPException(status_code=403, detail=f"missing or wrong {PROFILE_HEADER}")
+
+    @app.get("/admin/profiles")
+    def list_profiles(request: Request):
+        require_profile_token(request)
+        return [{k: v for k, v in entry.items() if k != "session"} for entry in profiles]
+
+    @app.get("/admin/profiles/{profile_id}")
+    def get_profile(profile_id: int, request: Request, format: str = "html"):
+        """One profile as pyinstrument HTML, plain text, or speedscope JSON (a flamegraph)."""
+        from pyinstrument.renderers import ConsoleRenderer, HTMLRenderer, SpeedscopeRenderer
+
+        require_profile_token(request)
+        renderers = {
+            "html": (HTMLRenderer, "text/html"),
+            "text": (lambda: ConsoleRenderer(unicode=True, color=False), "text/plain"),
+            "speedscope": (SpeedscopeRenderer, "application/json"),
+        }
+        if format not in renderers:
+            raise HTTPException(status_code=400, detail=f"format must be one of {list(renderers)}")
+        entry = next((e for e in profiles if e["id"] == profile_id), None)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="no such profile (it may have been dropped)")
+        renderer, media_type = renderers[format]
+        return Response(renderer().render(entry["session"]), media_type=media_type)
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=8000)
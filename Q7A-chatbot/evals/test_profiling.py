@@ -0,0 +1,126 @@
+"""Profiling checks: only the configured token flags a request for profiling.
+
+Profiling is wired up at import time, so the end-to-end checks load a second
+copy of the app module with PROFILE_TOKEN set. The copy has its own FastAPI
+app, registry, and profile buffer; the shared `app` the other evals use is
+untouched. Requests take the redirect path, so no LLM is called.
+"""
+
+import importlib.util
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+
+from conftest import app
+
+TOKEN = "s3cret"
+AUTH = {app.PROFILE_HEADER: TOKEN}
+
+
+def headers(value: bytes) -> Headers:
+    """Headers as the middleware sees them: raw bytes, decoded as latin-1."""
+    return Headers(raw=[(app.PROFILE_HEADER.lower().encode(), value)])
+
+
+@pytest.fixture
+def token(monkeypatch):
+    monkeypatch.setattr(app, "PROFILE_TOKEN", TOKEN)
+
+
+def test_profile_token_matches(token):
+    assert app.has_profile_token(headers(b"s3cret"))
+    assert not app.has_profile_token(headers(b"wrong"))
+    assert not app.has_profile_token(Headers())
+
+
+def test_non_ascii_profile_token_is_rejected(token):
+    """A non-ASCII header is a mismatch, not a TypeError (a 500 from the middleware)."""
+    assert not app.has_profile_token(headers("sécret".encode()))
+    assert not app.has_profile_token(headers("s3cret✓".encode()))
+
+
+def test_no_token_configured(monkeypatch):
+    monkeypatch.setattr(app, "PROFILE_TOKEN", None)
+    assert not app.has_profile_token(headers(b"anything"))
+
+
+# --- End to end, with profiling enabled at import ---
+
+
+@pytest.fixture
+def profiled_app(monkeypatch):
+    """A fresh copy of app.py imported with PROFILE_TOKEN set and PROFILE_KEEP=2."""
+    monkeypatch.setenv("PROFILE_TOKEN", TOKEN)
+    monkeypatch.setenv("PROFILE_KEEP", "2")
+    monkeypatch.delenv("PROFILE_SAMPLE_RATE", raising=False)
+    spec = importlib.util.spec_from_file_location("app_profiled", app.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def client(profiled_app):
+    return TestClient(profiled_app.app)
+
+
+def chat(client, headers=None):
+    response = client.post("/chat", json={"message": "hi"}, headers=headers)
+    assert response.status_code == 200
+    return response
+
+
+def test_only_flagged_requests_are_profiled(profiled_app, client):
+    chat(client)
+    chat(client, {app.PROFILE_HEADER: "wrong"})
+    assert len(profiled_app.profiles) == 0
+    chat(client, AUTH)
+    (entry,) = profiled_app.profiles
+    assert entry["handler"] == "chat" and entry["reason"] == "header"
+
+
+def test_sampled_requests_are_profiled(profiled_app, client, monkeypatch):
+    monkeypatch.setattr(profiled_app, "PROFILE_SAMPLE_RATE", 1.0)
+    chat(client)
+    assert [e["reason"] for e in profiled_app.profiles] == ["sampled"]
+
+
+def test_keeps_the_last_profile_keep(profiled_app, client):
+    for _ in range(3):
+        chat(client, AUTH)
+    listed = client.get("/admin/profiles", headers=AUTH).json()
+    assert [e["id"] for e in listed] == [2, 3]
+    assert "session" not in listed[0]
+    assert client.get("/admin/profiles/1", headers=AUTH).status_code == 404
+
+
+def test_admin_endpoints_need_the_token(client):
+    chat(client, AUTH)
+    for headers in (None, {app.PROFILE_HEADER: "wrong"}):
+        assert client.get("/admin/profiles", headers=headers).status_code == 403
+        assert client.get("/admin/profiles/1", headers=headers).status_code == 403
+
+
+@pytest.mark.parametrize(
+    "fmt, media_type",
+    [("html", "text/html"), ("text", "text/plain"), ("speedscope", "application/json")],
+)
+def test_profile_formats(client, fmt, media_type):
+    chat(client, AUTH)
+    response = client.get("/admin/profiles/1", params={"format": fmt}, headers=AUTH)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(media_type)
+    if fmt == "html":
+        assert "<html" in response.text.lower()
+    elif fmt == "text":
+        assert "chat" in response.text
+    else:
+        assert "speedscope" in json.loads(response.text)["$schema"]
+
+
+def test_unknown_format(client):
+    chat(client, AUTH)
+    response = client.get("/admin/profiles/1", params={"format": "pdf"}, headers=AUTH)
+    assert response.status_code == 400
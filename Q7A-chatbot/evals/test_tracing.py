@@ -0,0 +1,120 @@
+"""Tracing checks: /chat stages become spans and a Server-Timing header.
+
+Spans go to an in-memory exporter, and the LLM call is litellm's
+`mock_response`, so these run offline and cost nothing.
+"""
+
+import re
+
+import litellm
+import pytest
+from fastapi.testclient import TestClient
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from conftest import app
+
+PITCH = "We're MealBox. We deliver pre-portioned ingredients to busy parents."
+STAGES = [
+    "safety_check",
+    "looks_like_pitch",
+    "session",
+    "completion",
+    "post_generation_check",
+    "serialize",
+]
+
+exporter = InMemorySpanExporter()
+app.tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+client = TestClient(app.app)
+
+
+@pytest.fixture
+def spans():
+    """Finished spans of the test's requests, by name."""
+    exporter.clear()
+    return lambda: {span.name: span for span in exporter.get_finished_spans()}
+
+
+@pytest.fixture
+def mock_llm(monkeypatch):
+    def completion(model, messages):
+        return litellm.completion(model=model, messages=messages, mock_response="STRENGTHS\n...")
+
+    monkeypatch.setattr(app, "completion", completion)
+
+
+def server_timing(response) -> dict[str, float]:
+    entries = response.headers["Server-Timing"].split(", ")
+    assert all(re.fullmatch(r"\w+;dur=\d+\.\d{3}", entry) for entry in entries), entries
+    return {name: float(dur[4:]) for name, dur in (entry.split(";") for entry in entries)}
+
+
+def test_llm_path_spans(spans, mock_llm):
+    """Every stage is a child span of "chat"; the LLM span carries token counts."""
+    response = client.post("/chat", json={"message": PITCH})
+    assert response.status_code == 200
+    by_name = spans()
+    assert set(by_name) == {"chat", *STAGES}
+    root = by_name["chat"]
+    assert all(by_name[name].parent.span_id == root.context.span_id for name in STAGES)
+    assert root.attributes["chat.session_id"] == response.json()["session_id"]
+
+    llm = by_name["completion"].attributes
+    assert llm["gen_ai.request.model"] == app.MODEL
+    assert llm["gen_ai.usage.input_tokens"] > 0
+    assert llm["gen_ai.usage.output_tokens"] > 0
+    assert llm["gen_ai.usage.cache_read.input_tokens"] == 0
+    assert llm["llm.cache_hit"] is False
+    assert by_name["session"].attributes["session.new"] is True
+    assert not by_name["post_generation_check"].attributes["guardrail.triggered"]
+
+
+def test_server_timing_header(spans, mock_llm):
+    """Server-Timing lists each stage in order, then the total, in milliseconds."""
+    timing = server_timing(client.post("/chat", json={"message": PITCH}))
+    assert list(timing) == [*STAGES, "total"]
+    assert timing["total"] >= sum(v for k, v in timing.items() if k != "total") - 0.01
+
+
+def test_safety_short_circuit(spans):
+    """A distress message stops after the safety span, before any LLM span."""
+    response = client.post("/chat", json={"message": "I feel hopeless about my startup"})
+    by_name = spans()
+    assert set(by_name) == {"chat", "safety_check", "serialize"}
+    assert by_name["safety_check"].attributes["guardrail.triggered"] is True
+    assert by_name["chat"].attributes["chat.short_circuit"] == "safety"
+    assert list(server_timing(response)) == ["safety_check", "serialize", "total"]
+
+
+def test_off_topic_short_circuit(spans, mock_llm):
+    """An off-topic request is caught by the post-generation backstop."""
+    message = "Our startup needs a recipe for chocolate cake"
+    response = client.post("/chat", json={"message": message})
+    assert response.json()["response"] == app.REDIRECT_MSG
+    by_name = spans()
+    assert by_name["post_generation_check"].attributes["guardrail.triggered"] is True
+    assert by_name["chat"].attributes["chat.short_circuit"] == "off_topic"
+
+
+def test_llm_error_marks_span(spans, monkeypatch):
+    """A failed LLM call records the exception and an error status on its span."""
+
+    def completion(model, messages):
+        raise RuntimeError("quota exceeded")
+
+    monkeypatch.setattr(app, "completion", completion)
+    client.post("/chat", json={"message": PITCH})
+    llm = spans()["completion"]
+    assert not llm.status.is_ok
+    assert llm.events[0].name == "exception"
+
+
+def test_span_exporter_choice():
+    """OTEL_TRACES_EXPORTER values map to exporters; unknown ones fail loudly."""
+    assert app.span_exporter("none") is None
+    assert isinstance(app.span_exporter("console"), ConsoleSpanExporter)
+    assert isinstance(app.span_exporter("otlp"), OTLPSpanExporter)
+    with pytest.raises(ValueError):
+        app.span_exporter("jaeger")
@@ -0,0 +1,260 @@
+"""Mergeable corpus-level accumulators for streaming evaluation.
+
+Each accumulator keeps a few running sums, never the rows themselves, so
+corpus scores over an unbounded stream use constant memory. Feed pairs one at
+a time or a chunk at a time, and combine partial states from other shards or
+processes with `merge`, map-reduce style:
+
+    acc = CorpusAccumulator()
+    for cands, refs in chunks:
+        acc.update(cands, refs)
+    acc.result()  # {"rouge1": {"precision", "recall", "f1", "macro_f1"}, ...}
+
+Overlap metrics report corpus (micro) scores computed from summed counts, as
+corpus ROUGE does, plus "macro_f1" / "macro": the mean of the per-pair scores
+from main.py, which equals `score_pairs(...)[metric].mean()`.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+import main
+from lcs import lcs_length
+
+
+def _ratio(num: float, den: float) -> float:
+    return num / den if den else 0.0
+
+
+@dataclass(kw_only=True)
+class Accumulator:
+    """Running sums that merge by addition.
+
+    Fields named in `_keys` are settings, not sums: they must match for two
+    accumulators to merge.
+    """
+
+    _keys = ()
+
+    pairs: int = 0
+    score_sum: float = 0.0
+
+    def merge(self, other: "Accumulator") -> "Accumulator":
+        """Add another accumulator's state into this one and return self."""
+        if type(other) is not type(self) or any(
+            getattr(self, k) != getattr(other, k) for k in self._keys
+        ):
+            raise ValueError(f"cannot merge {other!r} into {self!r}")
+        for f in fields(self):
+            if f.name not in self._keys:
+                setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+        return self
+
+    @property
+    def macro(self) -> float:
+        return _ratio(self.score_sum, self.pairs)
+
+
+@dataclass(kw_only=True)
+class RougeNAccumulator(Accumulator):
+    """Corpus ROUGE-N: summed clipped n-gram matches over summed n-gram counts."""
+
+    _keys = ("n",)
+
+    n: int = 1
+    overlap: int = 0
+    cand_total: int = 0
+    ref_total: int = 0
+
+    def update(self, c_tok: list, r_tok: list) -> None:
+        c_ngr, r_ngr = Counter(main._ngrams(c_tok, self.n)), Counter(main._ngrams(r_tok, self.n))
+        overlap = sum((c_ngr & r_ngr).values())
+        self.add_counts(
+            overlap, len(c_tok), len(r_tok), main.rouge_n_tokens(c_tok, r_tok, self.n)
+        )
+
+    def add_counts(self, overlap, c_len, r_len, scores) -> None:
+        """Add one pair's counts and score, or arrays of them for a batch."""
+        self.pairs += np.size(scores)
+        self.score_sum += float(np.sum(scores))
+        self.overlap += int(np.sum(overlap))
+        self.cand_total += int(np.sum(np.maximum(np.asarray(c_len) - self.n + 1, 0)))
+        self.ref_total += int(np.sum(np.maximum(np.asarray(r_len) - self.n + 1, 0)))
+
+    def result(self) -> dict[str, float]:
+        precision = _ratio(self.overlap, self.cand_total)
+        recall = _ratio(self.overlap, self.ref_total)
+        return {
+            "precision": precision,
+            "recall": recall,
+            "f1": main._f1(precision, recall),
+            "macro_f1": self.macro,
+        }
+
+
+@dataclass(kw_only=True)
+class RougeLAccumulator(Accumulator):
+    """Corpus ROUGE-L: summed LCS lengths over summed token counts."""
+
+    lcs: int = 0
+    cand_total: int = 0
+    ref_total: int = 0
+
+    def update(self, c_tok: list, r_tok: list) -> None:
+        lcs = lcs_length(c_tok, r_tok) if c_tok and r_tok else 0
+        if not c_tok or not r_tok:
+            score = 1.0 if not c_tok and not r_tok else 0.0
+        else:
+            score = main._f1(lcs / len(c_tok), lcs / len(r_tok))
+        self.pairs += 1
+        self.score_sum += score
+        self.lcs += lcs
+        self.cand_total += len(c_tok)
+        self.ref_total += len(r_tok)
+
+    def result(self) -> dict[str, float]:
+        precision = _ratio(self.lcs, self.cand_total)
+        recall = _ratio(self.lcs, self.ref_total)
+        return {
+            "precision": precision,
+            "recall": recall,
+            "f1": main._f1(precision, recall),
+            "macro_f1": self.macro,
+        }
+
+
+@dataclass(kw_only=True)
+class JaccardAccumulator(Accumulator):
+    """Corpus Jaccard: summed shared token types over summed union sizes."""
+
+    inter: int = 0
+    union: int = 0
+
+    def update(self, c_tok: list, r_tok: list) -> None:
+        a, b = set(c_tok), set(r_tok)
+        self.add_counts(len(a & b), len(a | b), main.jaccard(c_tok, r_tok))
+
+    def add_counts(self, inter, union, scores) -> None:
+        """Add one pair's counts and score, or arrays of them for a batch."""
+        self.pairs += np.size(scores)
+        self.score_sum += float(np.sum(scores))
+        self.inter += int(np.sum(inter))
+        self.union += int(np.sum(union))
+
+    def result(self) -> dict[str, float]:
+        return {"jaccard": _ratio(self.inter, self.union), "macro": self.macro}
+
+
+@dataclass(kw_only=True)
+class MeanAccumulator(Accumulator):
+    """Mean and standard deviation of a per-pair score, e.g. semantic."""
+
+    square_sum: float = 0.0
+
+    def update(self, scores) -> None:
+        """Add one score or an array of scores."""
+        scores = np.asarray(scores, dtype=np.float64)
+        self.pairs += scores.size
+        self.score_sum += float(scores.sum())
+        self.square_sum += float(np.square(scores).sum())
+
+    def result(self) -> dict[str, float]:
+        mean = self.macro
+        variance = max(_ratio(self.square_sum, self.pairs) - mean * mean, 0.0)
+        return {"mean": mean, "std": variance**0.5}
+
+
+# --- Corpus scoring over chunks ---
+
+CORPUS_METRICS = ("jaccard", "token_f1", "rouge1", "rouge2", "rougeL", "semantic")
+
+
+def _new_accumulator(name: str) -> Accumulator:
+    if name == "jaccard":
+        return JaccardAccumulator()
+    if name == "token_f1":
+        # Token F1 is the unigram case of the same count-based F1.
+        return RougeNAccumulator(n=1)
+    if name == "rougeL":
+        return RougeLAccumulator()
+    if name == "semantic":
+        return MeanAccumulator()
+    if name.startswith("rouge") and name[5:].isdigit():
+        return RougeNAccumulator(n=int(name[5:]))
+    raise ValueError(f"no corpus accumulator for {name!r} (use {CORPUS_METRICS})")
+
+
+class CorpusAccumulator:
+    """Corpus scores for several metrics, updated chunk by chunk.
+
+    Chunks are tokenized and counted with the batched engines in main.py and
+    batch_overlap.py; only the running sums are kept between chunks.
+    """
+
+    def __init__(self, metrics=CORPUS_METRICS, tok=main.tokenize, content_only: bool = False):
+        self.metrics = tuple(metrics)
+        self.tok = tok
+        self.content_only = content_only
+        self.accumulators = {name: _new_accumulator(name) for name in self.metrics}
+
+    def update(self, cands: list[str], refs: list[str], batch_size: int = 256) -> None:
+        """Add candidate i vs refs[i] (or vs refs[0] when there is one reference)."""
+        if len(refs) not in (1, len(cands)):
+            raise ValueError("refs must hold 1 reference or one per candidate")
+        if not cands:
+            return
+        needs = {"vectors"} if "semantic" in self.metrics else set()
+        if set(self.metrics) - {"semantic"}:
+            needs.add("tokens")
+        feats = main.build_features(
+            [*cands, *refs], frozenset(needs), 0, self.tok, self.content_only, batch_size
+        )
+        c_feats = [feats[c] for c in cands]
+        r_feats = [feats[r] for r in refs] * (len(cands) if len(refs) == 1 else 1)
+        self._update_features(c_feats, r_feats)
+
+    def _update_features(self, c_feats: list, r_feats: list) -> None:
+        from batch_overlap import overlap_counts, scores_from_counts
+
+        accs = self.accumulators
+        ns = tuple(sorted({a.n for a in accs.values() if isinstance(a, RougeNAccumulator)}))
+        if ns or "jaccard" in accs:
+            counts = overlap_counts([c.tokens for c in c_feats], [r.tokens for r in r_feats], ns)
+            scores = scores_from_counts(counts, ns)
+        for name, acc in accs.items():
+            if name == "jaccard":
+                acc.add_counts(counts["inter"], counts["union"], scores["jaccard"])
+            elif isinstance(acc, RougeNAccumulator):
+                acc.add_counts(
+                    counts[f"overlap{acc.n}"],
+                    counts["c_len"],
+                    counts["r_len"],
+                    scores[f"rouge{acc.n}"],
+                )
+            elif isinstance(acc, RougeLAccumulator):
+                for c, r in zip(c_feats, r_feats):
+                    acc.update(c.tokens, r.tokens)
+            else:
+                c = main.normalize_rows([f.vector for f in c_feats])
+                r = main.normalize_rows([f.vector for f in r_feats])
+                acc.update((c * r).sum(axis=1))
+
+    def update_pair(self, candidate: str, reference: str) -> None:
+        self.update([candidate], [reference])
+
+    def merge(self, other: "CorpusAccumulator") -> "CorpusAccumulator":
+        """Add another accumulator's sums (same metrics) into this one."""
+        if other.metrics != self.metrics:
+            raise ValueError("cannot merge accumulators over different metrics")
+        for name, acc in self.accumulators.items():
+            acc.merge(other.accumulators[name])
+        return self
+
+    @property
+    def pairs(self) -> int:
+        return next(iter(self.accumulators.values())).pairs if self.accumulators else 0
+
+    def result(self) -> dict[str, dict[str, float]]:
+        return {name: acc.result() for name, acc in self.accumulators.items()}
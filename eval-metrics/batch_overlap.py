@@ -0,0 +1,147 @@
+"""Vectorized Jaccard, token F1, and ROUGE-N over sparse n-gram count matrices.
+
+Every token in the batch is mapped into one shared vocabulary; n-grams become
+integer keys over those ids and are indexed with np.unique, so building the
+candidate and reference count matrices needs no per-n-gram Python work. Clipped
+overlaps, precision, recall, and F1 for all pairs are then NumPy/scipy ops.
+
+Scores are bit-identical to the scalar `jaccard`, `token_f1`, and `rouge_n`
+in main.py, including their empty-input conventions.
+
+Two modes, picked from the number of references:
+  - one reference, many candidates: `overlap_scores(cands, [ref])`
+  - many-to-many (candidate i vs. reference i): `overlap_scores(cands, refs)`
+"""
+
+import numpy as np
+from scipy import sparse
+
+_MAX_KEY = 2**63 - 1
+
+
+def _encode(token_lists: list[list[str]]) -> tuple[np.ndarray, np.ndarray, int]:
+    """Flatten texts into (token ids, row id per token, vocabulary size)."""
+    vocab: dict[str, int] = {}
+    ids = np.fromiter(
+        (vocab.setdefault(t, len(vocab)) for tokens in token_lists for t in tokens),
+        dtype=np.int64,
+    )
+    lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64)
+    rows = np.repeat(np.arange(len(token_lists)), lengths)
+    return ids, rows, len(vocab)
+
+
+def count_matrix(
+    ids: np.ndarray, rows: np.ndarray, n_rows: int, vocab_size: int, n: int
+) -> sparse.csr_matrix:
+    """Rows x n-gram count matrix for order n over the encoded batch."""
+    if len(ids) < n:
+        return sparse.csr_matrix((n_rows, 0), dtype=np.int64)
+    span = len(ids) - n + 1
+    valid = rows[:span] == rows[n - 1 :]
+    if n == 1:
+        cols = ids
+    elif vocab_size**n <= _MAX_KEY:
+        keys = np.zeros(span, dtype=np.int64)
+        for j in range(n):
+            keys = keys * vocab_size + ids[j : j + span]
+        cols = np.unique(keys[valid], return_inverse=True)[1].ravel()
+    else:
+        grams = np.stack([ids[j : j + span] for j in range(n)], axis=1)[valid]
+        cols = np.unique(grams, axis=0, return_inverse=True)[1].ravel()
+    row_idx = rows if n == 1 else rows[:span][valid]
+    n_cols = int(cols.max()) + 1 if len(cols) else 0
+    data = np.ones(len(cols), dtype=np.int64)
+    return sparse.csr_matrix((data, (row_idx, cols)), shape=(n_rows, n_cols))
+
+
+def _f1(overlap: np.ndarray, c_total: np.ndarray, r_total: np.ndarray) -> np.ndarray:
+    """Vectorized `main._f1(overlap / c_total, overlap / r_total)`."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = overlap / c_total
+        recall = overlap / r_total
+        f1 = 2 * precision * recall / (precision + recall)
+    return np.where(precision + recall == 0, 0.0, f1)
+
+
+def _apply_empty_rules(
+    scores: np.ndarray, c_len: np.ndarray, r_len: np.ndarray
+) -> np.ndarray:
+    """Both texts empty -> 1.0, exactly one empty -> 0.0."""
+    scores = np.where((c_len == 0) | (r_len == 0), 0.0, scores)
+    return np.where((c_len == 0) & (r_len == 0), 1.0, scores)
+
+
+def overlap_counts(
+    cand_tokens: list[list[str]],
+    ref_tokens: list[list[str]],
+    ns: tuple[int, ...] = (1, 2),
+) -> dict[str, np.ndarray]:
+    """Raw per-pair counts behind the overlap metrics.
+
+    Returns int arrays of length len(cand_tokens): "c_len" and "r_len"
+    (tokens), "inter" and "union" (distinct token types shared / in either),
+    and "overlap{n}" (clipped n-gram matches) for each n in ns and 1.
+    Counts add up across batches, which corpus-level scores rely on.
+    """
+    n_cands = len(cand_tokens)
+    if len(ref_tokens) not in (1, n_cands):
+        raise ValueError("ref_tokens must hold 1 reference or one per candidate")
+    one_ref = len(ref_tokens) == 1 and n_cands != 1
+
+    ids, rows, vocab_size = _encode([*cand_tokens, *ref_tokens])
+    n_rows = n_cands + len(ref_tokens)
+    ref_rows = np.zeros(n_cands, dtype=np.int64) if one_ref else np.arange(n_cands)
+
+    lengths = np.bincount(rows, minlength=n_rows)
+    counts = {"c_len": lengths[:n_cands], "r_len": lengths[n_cands:][ref_rows]}
+
+    def split(m: sparse.csr_matrix) -> tuple[sparse.csr_matrix, sparse.csr_matrix]:
+        return m[:n_cands], m[n_cands:][ref_rows]
+
+    c1, r1 = split(count_matrix(ids, rows, n_rows, vocab_size, 1))
+    c_bin, r_bin = (c1 > 0).astype(np.int64), (r1 > 0).astype(np.int64)
+    inter = np.asarray(c_bin.multiply(r_bin).sum(axis=1)).ravel()
+    counts["inter"] = inter
+    counts["union"] = np.diff(c_bin.indptr) + np.diff(r_bin.indptr) - inter
+    for n in sorted(set(ns) | {1}):
+        cn, rn = c1, r1
+        if n > 1:
+            cn, rn = split(count_matrix(ids, rows, n_rows, vocab_size, n))
+        counts[f"overlap{n}"] = np.asarray(cn.minimum(rn).sum(axis=1)).ravel()
+    return counts
+
+
+def overlap_scores(
+    cand_tokens: list[list[str]],
+    ref_tokens: list[list[str]],
+    ns: tuple[int, ...] = (1, 2),
+) -> dict[str, np.ndarray]:
+    """Jaccard, token F1, and ROUGE-n for every (candidate, reference) pair.
+
+    Returns {"jaccard", "token_f1", "rouge1", "rouge2", ...} arrays of length
+    len(cand_tokens). `ref_tokens` holds one reference (broadcast to every
+    candidate) or exactly one reference per candidate.
+    """
+    return scores_from_counts(overlap_counts(cand_tokens, ref_tokens, ns), ns)
+
+
+def scores_from_counts(
+    counts: dict[str, np.ndarray], ns: tuple[int, ...] = (1, 2)
+) -> dict[str, np.ndarray]:
+    """The `overlap_scores` metrics from `overlap_counts` output."""
+    c_len, r_len = counts["c_len"], counts["r_len"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        jac = counts["inter"] / counts["union"]
+
+    results = {"jaccard": _apply_empty_rules(jac, c_len, r_len)}
+    for n in sorted(set(ns) | {1}):
+        c_total, r_total = c_len - n + 1, r_len - n + 1
+        f1 = _f1(counts[f"overlap{n}"], c_total, r_total)
+        f1 = np.where((c_total <= 0) | (r_total <= 0), 0.0, f1)
+        f1 = _apply_empty_rules(f1, c_len, r_len)
+        if n == 1:
+            results["token_f1"] = f1
+        if n in ns:
+            results[f"rouge{n}"] = f1
+    return results
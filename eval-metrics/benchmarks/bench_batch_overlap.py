@@ -0,0 +1,62 @@
+"""Scalar feature metrics vs. the sparse batch engine, with an exactness check.
+
+    uv run python benchmarks/bench_batch_overlap.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from batch_overlap import overlap_scores
+from bench_features import make_candidates
+from main import (
+    jaccard_features,
+    reference,
+    rouge_n_features,
+    text_features,
+    token_f1_features,
+    tokenize,
+)
+
+N_PAIRS = 50_000
+
+
+def scalar(cand_tokens: list[list[str]], ref_tokens: list[str]) -> dict[str, np.ndarray]:
+    ref = text_features(ref_tokens)
+    cols = {"jaccard": [], "token_f1": [], "rouge1": [], "rouge2": []}
+    for tokens in cand_tokens:
+        f = text_features(tokens)
+        cols["jaccard"].append(jaccard_features(f, ref))
+        cols["token_f1"].append(token_f1_features(f, ref))
+        cols["rouge1"].append(rouge_n_features(f, ref, 1))
+        cols["rouge2"].append(rouge_n_features(f, ref, 2))
+    return {k: np.array(v) for k, v in cols.items()}
+
+
+if __name__ == "__main__":
+    cand_tokens = [tokenize(c) for c in make_candidates(N_PAIRS)]
+    ref_tokens = tokenize(reference)
+
+    start = time.perf_counter()
+    expected = scalar(cand_tokens, ref_tokens)
+    t_scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    one_to_many = overlap_scores(cand_tokens, [ref_tokens])
+    t_one = time.perf_counter() - start
+
+    start = time.perf_counter()
+    paired = overlap_scores(cand_tokens, [ref_tokens] * N_PAIRS)
+    t_paired = time.perf_counter() - start
+
+    for name, col in expected.items():
+        assert np.array_equal(col, one_to_many[name]), name
+        assert np.array_equal(col, paired[name]), name
+
+    print(f"{N_PAIRS} pairs, jaccard + token_f1 + rouge1 + rouge2 (results identical)")
+    print(f"  scalar features:     {t_scalar:6.2f}s")
+    print(f"  batch one-to-many:   {t_one:6.2f}s  ({t_scalar / t_one:.1f}x)")
+    print(f"  batch many-to-many:  {t_paired:6.2f}s  ({t_scalar / t_paired:.1f}x)")
@@ -0,0 +1,36 @@
+"""Pairs per second for greedy token matching, with and without IDF weights.
+
+    uv run python benchmarks/bench_bertscore.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bench_features import make_candidates
+from bertscore import doc_token_matrix, fit_idf, greedy_match
+from main import parse
+
+N_PAIRS = 10_000
+
+
+if __name__ == "__main__":
+    cands = make_candidates(N_PAIRS)
+    refs = make_candidates(N_PAIRS)[::-1]
+
+    start = time.perf_counter()
+    docs = parse([*cands, *refs])
+    mats = {text: doc_token_matrix(doc) for text, doc in docs.items()}
+    t_parse = time.perf_counter() - start
+    c_mats, r_mats = [mats[c] for c in cands], [mats[r] for r in refs]
+    idf = fit_idf(m.tokens for m in mats.values())
+    n_tokens = sum(len(m.tokens) for m in c_mats) / N_PAIRS
+
+    print(f"{N_PAIRS} pairs, {n_tokens:.0f} tokens per candidate")
+    print(f"  {'parse + token vectors':<24} {N_PAIRS / t_parse:>10,.0f} pairs/s")
+    for label, weights in (("greedy match", None), ("greedy match + IDF", idf)):
+        start = time.perf_counter()
+        greedy_match(c_mats, r_mats, weights)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<24} {N_PAIRS / elapsed:>10,.0f} pairs/s")
@@ -0,0 +1,30 @@
+"""Bootstrap CI timings for 100k rows x 6 metric columns.
+
+    uv run python benchmarks/bench_bootstrap.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bootstrap import bootstrap_ci, paired_bootstrap
+
+N_ROWS = 100_000
+N_COLUMNS = 6
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    before = rng.random((N_ROWS, N_COLUMNS))
+    after = before + rng.normal(0.002, 0.05, before.shape)
+    print(f"{N_ROWS} rows x {N_COLUMNS} columns")
+    for n_resamples in (1_000, 10_000):
+        start = time.perf_counter()
+        bootstrap_ci(before, n_resamples)
+        t_ci = time.perf_counter() - start
+        start = time.perf_counter()
+        paired_bootstrap(before, after, n_resamples)
+        t_paired = time.perf_counter() - start
+        print(f"  {n_resamples:>6} resamples  ci: {t_ci:6.2f} s  paired: {t_paired:6.2f} s")
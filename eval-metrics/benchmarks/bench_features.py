@@ -0,0 +1,83 @@
+"""Per-pair cost of re-tokenizing metrics vs. the tokenize-once feature path.
+
+    uv run python benchmarks/bench_features.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from main import (
+    candidates,
+    jaccard,
+    jaccard_features,
+    reference,
+    rouge_l,
+    rouge_l_features,
+    rouge_n,
+    rouge_n_features,
+    text_features,
+    token_f1,
+    token_f1_features,
+    tokenize,
+)
+
+N_PAIRS = 2_000
+
+
+def make_candidates(n: int, seed: int = 0) -> list[str]:
+    """Perturbed copies of the demo texts: shuffled, dropped, and swapped words."""
+    rng = random.Random(seed)
+    pool = [reference, *candidates.values()]
+    vocab = tokenize(" ".join(pool))
+    out = []
+    for _ in range(n):
+        words = rng.choice(pool).split()
+        words = [w for w in words if rng.random() > 0.15]
+        words = [rng.choice(vocab) if rng.random() < 0.1 else w for w in words]
+        out.append(" ".join(words))
+    return out
+
+
+def per_string(cands: list[str], with_lcs: bool) -> None:
+    r_tok = tokenize(reference)
+    for c in cands:
+        c_tok = tokenize(c)
+        jaccard(c_tok, r_tok)
+        token_f1(c_tok, r_tok)
+        rouge_n(c, reference, 1)
+        rouge_n(c, reference, 2)
+        if with_lcs:
+            rouge_l(c, reference)
+
+
+def per_features(cands: list[str], with_lcs: bool) -> None:
+    ref = text_features(tokenize(reference))
+    for c in cands:
+        f = text_features(tokenize(c))
+        jaccard_features(f, ref)
+        token_f1_features(f, ref)
+        rouge_n_features(f, ref, 1)
+        rouge_n_features(f, ref, 2)
+        if with_lcs:
+            rouge_l_features(f, ref)
+
+
+def timed(fn, cands: list[str], with_lcs: bool, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(cands, with_lcs)
+        best = min(best, time.perf_counter() - start)
+    return best / len(cands) * 1e6
+
+
+if __name__ == "__main__":
+    cands = make_candidates(N_PAIRS)
+    print(f"{N_PAIRS} pairs, tokenize=regex, microseconds per pair (best of 3)")
+    for label, with_lcs in (("overlap only", False), ("with rougeL", True)):
+        old = timed(per_string, cands, with_lcs)
+        new = timed(per_features, cands, with_lcs)
+        print(f"  {label:<13} strings: {old:8.1f}  features: {new:8.1f}  speedup: {old / new:.2f}x")
@@ -0,0 +1,58 @@
+"""LCS engine timings at 100 / 1k / 10k tokens vs. the original DP.
+
+    uv run python benchmarks/bench_lcs.py
+    uv run --with numba python benchmarks/bench_lcs.py   # include the compiled path
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import lcs
+
+SIZES = (100, 1_000, 10_000)
+DP_MAX_TOKENS = 1_000  # the O(m·n) Python loop takes minutes beyond this
+
+
+def make_pair(n: int, seed: int = 0) -> tuple[list[str], list[str]]:
+    """A reference and a candidate that keeps ~70% of it plus noise words."""
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(2_000)]
+    ref = [rng.choice(vocab) for _ in range(n)]
+    cand = [t if rng.random() < 0.7 else rng.choice(vocab) for t in ref]
+    return cand, ref
+
+
+def timed(fn, a: list, b: list, repeat: int = 3) -> tuple[float, int]:
+    best, result = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(a, b)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3, result
+
+
+if __name__ == "__main__":
+    engines = {"big-int": lcs._lcs_bigint}
+    if lcs.HAS_NUMBA:
+        lcs._lcs_numba(["a"], ["a"])  # compile outside the timings
+        engines["numba"] = lcs._lcs_numba
+    print("milliseconds per pair (best of 3)")
+    for n in SIZES:
+        a, b = make_pair(n)
+        line = f"  {n:>6} tokens"
+        expected = None
+        if n <= DP_MAX_TOKENS:
+            ms, expected = timed(lcs.lcs_length_dp, a, b, repeat=1)
+            line += f"  dp: {ms:9.2f}"
+        else:
+            line += f"  dp: {'skipped':>9}"
+        for name, fn in engines.items():
+            ms, result = timed(fn, a, b)
+            if expected is not None:
+                assert result == expected, name
+            expected = result
+            line += f"  {name}: {ms:8.2f}"
+        print(line + f"  (lcs={expected})")
@@ -0,0 +1,80 @@
+"""Near-duplicate dedupe on a synthetic 1M-row eval dump.
+
+    uv run python benchmarks/bench_minhash.py
+    uv run python benchmarks/bench_minhash.py --rows 200000 --metrics semantic rougeL
+
+100k distinct outputs are each repeated ~10 times, as runs over seeds would
+be. Half the repeats are verbatim and half have one word changed.
+Full-dump scoring time is extrapolated from a sample so the benchmark
+finishes in minutes. Dedupe pays off with the costly metrics (semantic,
+bertscore); the overlap metrics are about as fast as clustering itself.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bench_features import make_candidates
+from main import reference, score_pairs, tokenize
+from minhash import cluster_pairs, score_deduped
+
+METRICS = ("jaccard", "token_f1", "rouge1", "rouge2", "rougeL")
+SAMPLE = 20_000
+
+
+def make_dump(n_rows: int, repeats: int = 10, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    base = make_candidates(n_rows // repeats, seed)
+    vocab = tokenize(" ".join(base[:1_000]))
+    rows = []
+    for text in base:
+        for _ in range(repeats):
+            if rng.random() < 0.5:
+                rows.append(text)
+                continue
+            words = text.split()
+            if words:
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+            rows.append(" ".join(words))
+    rng.shuffle(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--metrics", nargs="+", default=METRICS)
+    args = parser.parse_args()
+    metrics = tuple(args.metrics)
+
+    rows = make_dump(args.rows)
+    refs = [reference]
+    n_distinct = len(set(rows))
+    print(f"{len(rows):,} rows, {n_distinct:,} distinct strings")
+
+    start = time.perf_counter()
+    clusters = cluster_pairs(rows, refs, threshold=args.threshold)
+    t_cluster = time.perf_counter() - start
+    print(f"  cluster: {t_cluster:7.1f} s  -> {clusters.n_clusters:,} representatives")
+
+    start = time.perf_counter()
+    columns = score_deduped(rows, refs, metrics=metrics, clusters=clusters)
+    t_reps = time.perf_counter() - start
+    print(f"  score representatives + fan out: {t_reps:7.1f} s")
+
+    # score_pairs already shares work between identical strings, so scale the
+    # sample's time by distinct strings rather than rows.
+    start = time.perf_counter()
+    sample = score_pairs(rows[:SAMPLE], refs, metrics=metrics)
+    t_full = (time.perf_counter() - start) * n_distinct / len(set(rows[:SAMPLE]))
+    print(f"  score every row (extrapolated from {SAMPLE:,}): {t_full:7.1f} s")
+    print(f"  speedup: {t_full / (t_cluster + t_reps):.1f}x")
+
+    approx = ~columns["exact"][:SAMPLE]
+    for name in metrics:
+        err = abs(columns[name][:SAMPLE] - sample[name])[approx]
+        print(f"  {name:<8} copied rows: mean |error| {err.mean():.4f}, max {err.max():.4f}")
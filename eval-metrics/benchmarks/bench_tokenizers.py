@@ -0,0 +1,71 @@
+"""Throughput of the tokenizer tiers, plus parity with the spaCy path.
+
+    uv run python benchmarks/bench_tokenizers.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bench_features import make_candidates
+from fast_tokenizer import Vocab, fast_token_ids, fast_tokenize, fast_tokenize_no_stop
+from main import doc_tokens_no_stop, get_nlp, tokenize
+
+N_TEXTS = 20_000
+
+
+def throughput(name: str, fn, texts: list[str]) -> float:
+    start = time.perf_counter()
+    n_tokens = sum(len(fn(t)) for t in texts)
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {name:<28} {len(texts) / elapsed:>10,.0f} texts/s"
+        f" {n_tokens / elapsed:>12,.0f} tokens/s"
+    )
+    return elapsed
+
+
+def zipf_texts(n: int, vocab_size: int = 50_000, seed: int = 0) -> list[str]:
+    """Texts whose words follow a Zipf law over a large vocabulary.
+
+    make_candidates reuses a few dozen words, which flatters any per-word
+    cache (spaCy's included); this corpus keeps rare words rare.
+    """
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    vocab = ["".join(rng.choice(letters, rng.integers(2, 10))) for _ in range(vocab_size)]
+    ranks = rng.zipf(1.1, size=(n, 25)) % vocab_size
+    return [" ".join(vocab[i] for i in row).capitalize() + "." for row in ranks]
+
+
+def compare(label: str, texts: list[str]) -> None:
+    vocab = Vocab()
+    print(f"{label}: {len(texts)} texts")
+    throughput("tokenize (ASCII regex)", tokenize, texts)
+    throughput("fast_tokenize", fast_tokenize, texts)
+    t_fast = throughput("fast_tokenize_no_stop", fast_tokenize_no_stop, texts)
+    throughput("fast_token_ids", lambda t: fast_token_ids(t, vocab=vocab), texts)
+
+    start = time.perf_counter()
+    spacy_tokens = [doc_tokens_no_stop(doc) for doc in get_nlp().pipe(texts, batch_size=256)]
+    t_spacy = time.perf_counter() - start
+    n_tokens = sum(map(len, spacy_tokens))
+    print(
+        f"  {'spaCy tokenize_no_stop':<28} {len(texts) / t_spacy:>10,.0f} texts/s"
+        f" {n_tokens / t_spacy:>12,.0f} tokens/s"
+    )
+    same = sum(fast_tokenize_no_stop(t) == s for t, s in zip(texts, spacy_tokens))
+    print(
+        f"  fast_tokenize_no_stop is {t_spacy / t_fast:.1f}x spaCy's speed, "
+        f"{same / len(texts):.2%} of texts identical\n"
+    )
+
+
+if __name__ == "__main__":
+    fast_tokenize_no_stop("warm up")  # load the stopword list outside the timing
+    get_nlp()
+    compare("eval-style candidates", make_candidates(N_TEXTS))
+    compare("Zipf vocabulary", zipf_texts(N_TEXTS))
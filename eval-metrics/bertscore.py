@@ -0,0 +1,198 @@
+"""BERTScore-style greedy token matching on static word vectors.
+
+`semantic` averages every word into one vector, so an answer that shares the
+reference's topic but not its facts can still score high. Here every
+candidate token is matched to its most similar reference token and vice
+versa:
+
+    precision = mean over candidate tokens of max cosine to any reference token
+    recall    = mean over reference tokens of max cosine to any candidate token
+    f1        = harmonic mean of the two
+
+with an optional IDF weight per token, fitted once over a corpus. Vectors are
+the same spaCy static vectors as `semantic` (or a `VectorStore` export), so
+it runs on CPU without a transformer. Pairs are sorted by length and scored in
+padded batches of (batch, n_cand, n_ref) matrix products.
+
+    scores = bertscore(candidates, references, idf=fit_idf(corpus_tokens))
+"""
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+
+from main import normalize_rows, parse
+
+
+@dataclass
+class TokenMatrix:
+    """Lowercase tokens that have a vector, and their unit vectors (one row each)."""
+
+    tokens: list[str]
+    vectors: np.ndarray
+
+
+def doc_token_matrix(doc, content_only: bool = False) -> TokenMatrix:
+    """Token vectors from a parsed Doc, skipping tokens without a vector."""
+    tokens = [t for t in doc if t.has_vector]
+    if content_only:
+        tokens = [t for t in tokens if not t.is_stop and not t.is_punct]
+    if not tokens:
+        return TokenMatrix([], np.zeros((0, doc.vocab.vectors_length), dtype=np.float32))
+    return TokenMatrix([t.lower_ for t in tokens], normalize_rows([t.vector for t in tokens]))
+
+
+def store_token_matrix(store, text: str, content_only: bool = False) -> TokenMatrix:
+    """Token vectors looked up in a `VectorStore` instead of a spaCy model."""
+    tokens = store.tokens(text, content_only)
+    rows = store.token_rows(tokens)
+    keep = rows >= 0
+    return TokenMatrix(
+        [t.lower() for t, k in zip(tokens, keep) if k],
+        normalize_rows(store.vectors[rows[keep]]).reshape(-1, store.dim),
+    )
+
+
+# --- IDF weights ---
+
+
+@dataclass
+class IDF:
+    """Smoothed inverse document frequencies: log((docs + 1) / (df + 1))."""
+
+    weights: dict[str, float]
+    default: float
+
+    def __call__(self, tokens: list[str]) -> np.ndarray:
+        get = self.weights.get
+        return np.array([get(t, self.default) for t in tokens], dtype=np.float32)
+
+
+def fit_idf(token_lists) -> IDF:
+    """IDF over a corpus of tokenized texts; unseen tokens get the maximum weight."""
+    df = Counter()
+    n_docs = 0
+    for tokens in token_lists:
+        df.update(set(tokens))
+        n_docs += 1
+    return IDF(
+        {t: math.log((n_docs + 1) / (n + 1)) for t, n in df.items()},
+        math.log(n_docs + 1),
+    )
+
+
+# --- Greedy matching ---
+
+
+def greedy_match(
+    cands: list[TokenMatrix],
+    refs: list[TokenMatrix],
+    idf: IDF | None = None,
+    batch_size: int = 64,
+) -> dict[str, np.ndarray]:
+    """Precision, recall, and F1 columns for cands[i] vs refs[i] (or refs[0]).
+
+    Two empty texts score 1.0; one empty text scores 0.0, like the overlap
+    metrics.
+    """
+    if len(refs) not in (1, len(cands)):
+        raise ValueError("refs must hold 1 reference or one per candidate")
+    if len(refs) == 1:
+        refs = refs * len(cands)
+    n = len(cands)
+    precision, recall = np.zeros(n), np.zeros(n)
+    if not n:
+        return {"precision": precision, "recall": recall, "f1": np.zeros(0)}
+    table = _TokenTable([*cands, *refs], idf)
+    c_idx, r_idx = np.arange(n), np.arange(n, 2 * n)
+    c_len, r_len = table.lengths[c_idx], table.lengths[r_idx]
+    both_empty = (c_len == 0) & (r_len == 0)
+    precision[both_empty] = recall[both_empty] = 1.0
+
+    # Similar-sized pairs share a batch, which keeps padding small.
+    todo = np.flatnonzero((c_len > 0) & (r_len > 0))
+    todo = todo[np.lexsort((r_len[todo], c_len[todo]))]
+    for start in range(0, len(todo), batch_size):
+        idx = todo[start : start + batch_size]
+        c_vec, c_w = table.padded(c_idx[idx])
+        r_vec, r_w = table.padded(r_idx[idx])
+        sim = c_vec @ r_vec.transpose(0, 2, 1)  # (batch, n_cand, n_ref) cosines
+        # Padding is a zero vector with weight 0; keep it from winning a max.
+        sim[np.broadcast_to(r_w[:, None, :] < 0, sim.shape)] = -2.0
+        best_for_cand = sim.max(axis=2)
+        sim[np.broadcast_to(c_w[:, :, None] < 0, sim.shape)] = -2.0
+        best_for_ref = sim.max(axis=1)
+        precision[idx] = _weighted_mean(best_for_cand, c_w)
+        recall[idx] = _weighted_mean(best_for_ref, r_w)
+
+    denom = precision + recall
+    f1 = np.divide(2 * precision * recall, denom, out=np.zeros(n), where=denom > 0)
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+
+class _TokenTable:
+    """Every distinct TokenMatrix stacked once, so batches are single gathers.
+
+    Row 0 is the padding slot: a zero vector whose weight is -1, which marks
+    it in the padded weight matrices.
+    """
+
+    def __init__(self, mats: list[TokenMatrix], idf: IDF | None):
+        slots: dict[int, int] = {}
+        unique = []
+        for m in mats:
+            if id(m) not in slots:
+                slots[id(m)] = len(unique)
+                unique.append(m)
+        lengths = np.array([len(m.tokens) for m in unique], dtype=np.int64)
+        starts = np.cumsum(lengths) - lengths + 1
+        dim = unique[0].vectors.shape[1]
+        self.vectors = np.concatenate(
+            [np.zeros((1, dim), dtype=np.float32), *(m.vectors for m in unique)]
+        )
+        tokens = [t for m in unique for t in m.tokens]
+        weights = np.ones(len(tokens), dtype=np.float32) if idf is None else idf(tokens)
+        self.weights = np.concatenate(([-1.0], weights)).astype(np.float32)
+        which = np.array([slots[id(m)] for m in mats], dtype=np.int64)
+        self.starts, self.lengths = starts[which], lengths[which]
+
+    def padded(self, idx: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(batch, width, dim) vectors and (batch, width) weights for mats[idx]."""
+        lengths = self.lengths[idx]
+        offsets = np.arange(lengths.max())
+        rows = np.where(
+            offsets < lengths[:, None], self.starts[idx][:, None] + offsets, 0
+        )
+        return self.vectors[rows], self.weights[rows]
+
+
+def _weighted_mean(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    weights = np.maximum(weights, 0)  # padding drops out
+    total = weights.sum(axis=1)
+    sums = (values * weights).sum(axis=1)
+    return np.divide(sums, total, out=np.zeros(len(total)), where=total > 0)
+
+
+def bertscore(
+    candidates: list[str],
+    references: list[str],
+    idf: IDF | None = None,
+    content_only: bool = False,
+    store=None,
+    batch_size: int = 64,
+) -> dict[str, np.ndarray]:
+    """Greedy-match scores for candidate i vs reference i (or one shared reference).
+
+    Token vectors come from the spaCy model, or from `store` (a VectorStore)
+    when given, and are computed once per unique text.
+    """
+    texts = list(dict.fromkeys([*candidates, *references]))
+    if store is not None:
+        mats = {t: store_token_matrix(store, t, content_only) for t in texts}
+    else:
+        mats = {t: doc_token_matrix(d, content_only) for t, d in parse(texts).items()}
+    return greedy_match(
+        [mats[c] for c in candidates], [mats[r] for r in references], idf, batch_size
+    )
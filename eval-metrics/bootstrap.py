@@ -0,0 +1,148 @@
+"""Bootstrap confidence intervals and paired significance for metric columns.
+
+A mean over a few hundred eval rows moves by several hundredths from noise
+alone; these helpers say whether a change is bigger than that.
+
+All resamples are drawn at once as a NumPy index matrix, turned into a
+(resamples x rows) count matrix with one `np.bincount`, and multiplied by the
+metric columns, so every column shares the same resamples and no Python loop
+runs per resample. Work is chunked to keep memory bounded on large inputs.
+
+    summarize(score_candidates(reference, candidates))   # mean + 95% CI per metric
+    compare(scores_old, scores_new)                      # paired diff, CI, p-value
+"""
+
+import numpy as np
+
+CHUNK_ELEMENTS = 1 << 22  # indices drawn per chunk (~32 MB as int64)
+
+
+def resample_means(
+    values, n_resamples: int = 10_000, seed: int | None = 0
+) -> np.ndarray:
+    """Means of `n_resamples` bootstrap resamples of the rows of `values`.
+
+    `values` is a column (n,) or a matrix (n, k); the result is (n_resamples,)
+    or (n_resamples, k), with row r of every column drawn from the same
+    resample.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        raise ValueError("cannot bootstrap an empty column")
+    rng = np.random.default_rng(seed)
+    out = np.empty((n_resamples, *values.shape[1:]))
+    step = max(1, CHUNK_ELEMENTS // n)
+    for start in range(0, n_resamples, step):
+        b = min(step, n_resamples - start)
+        idx = rng.integers(0, n, size=(b, n))
+        idx += np.arange(b)[:, None] * n  # resample r counts into row r
+        counts = np.bincount(idx.ravel(), minlength=b * n).reshape(b, n)
+        out[start : start + b] = counts @ values / n
+    return out
+
+
+def _interval(samples: np.ndarray, confidence: float) -> tuple[np.ndarray, np.ndarray]:
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(samples, [alpha, 1 - alpha], axis=0)
+    return low, high
+
+
+def bootstrap_ci(
+    values,
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int | None = 0,
+) -> tuple:
+    """(mean, low, high) percentile interval for the mean of each column."""
+    values = np.asarray(values, dtype=np.float64)
+    low, high = _interval(resample_means(values, n_resamples, seed), confidence)
+    return values.mean(axis=0), low, high
+
+
+def paired_bootstrap(
+    a,
+    b,
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int | None = 0,
+) -> dict:
+    """Mean of b - a over paired rows, its interval, and a two-sided p-value.
+
+    The p-value is the bootstrap probability that the difference has the
+    other sign (doubled, capped at 1).
+    """
+    diff = np.asarray(b, dtype=np.float64) - np.asarray(a, dtype=np.float64)
+    samples = resample_means(diff, n_resamples, seed)
+    low, high = _interval(samples, confidence)
+    below, above = (samples <= 0).mean(axis=0), (samples >= 0).mean(axis=0)
+    return {
+        "diff": diff.mean(axis=0),
+        "low": low,
+        "high": high,
+        "p_value": np.minimum(1.0, 2 * np.minimum(below, above)),
+    }
+
+
+# --- DataFrames from score_candidates ---
+
+
+def _metric_columns(df, columns) -> list[str]:
+    if columns is not None:
+        return list(columns)
+    return list(df.select_dtypes("number").columns)
+
+
+def summarize(
+    df,
+    columns=None,
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int | None = 0,
+):
+    """Mean and bootstrap interval per metric column of a scores DataFrame.
+
+    Rows with NaN in any chosen column (e.g. candidates without references)
+    are dropped. Returns a DataFrame indexed by metric with columns mean,
+    low, high, and n.
+    """
+    import pandas as pd
+
+    columns = _metric_columns(df, columns)
+    values = df[columns].dropna().to_numpy(dtype=np.float64)
+    mean, low, high = bootstrap_ci(values, n_resamples, confidence, seed)
+    return pd.DataFrame(
+        {"mean": mean, "low": low, "high": high, "n": len(values)}, index=columns
+    )
+
+
+def compare(
+    before,
+    after,
+    columns=None,
+    on: str | None = "candidate",
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int | None = 0,
+):
+    """Paired bootstrap of after - before for each metric column.
+
+    Rows are paired by the `on` column (rows present in only one frame are
+    dropped), or by position when on is None. Returns a DataFrame indexed by
+    metric with columns diff, low, high, p_value, and n.
+    """
+    import pandas as pd
+
+    columns = _metric_columns(before, columns)
+    if on is not None:
+        merged = before[[on, *columns]].merge(after[[on, *columns]], on=on)
+        a = merged[[f"{c}_x" for c in columns]].to_numpy(dtype=np.float64)
+        b = merged[[f"{c}_y" for c in columns]].to_numpy(dtype=np.float64)
+    else:
+        if len(before) != len(after):
+            raise ValueError("before and after must have the same number of rows")
+        a = before[columns].to_numpy(dtype=np.float64)
+        b = after[columns].to_numpy(dtype=np.float64)
+    keep = ~(np.isnan(a).any(axis=1) | np.isnan(b).any(axis=1))
+    result = paired_bootstrap(a[keep], b[keep], n_resamples, confidence, seed)
+    return pd.DataFrame({**result, "n": int(keep.sum())}, index=columns)
@@ -0,0 +1,173 @@
+"""Command-line scoring of eval logs, streamed in bounded-memory chunks.
+
+    uv run main.py score evals.jsonl -o scores.parquet
+    uv run main.py score evals.csv -o scores.csv --metrics rouge1 semantic --workers 8
+    uv run main.py corpus evals.jsonl --workers 8        # corpus-level scores only
+"""
+
+import argparse
+import json
+import sys
+from collections import deque
+
+import main
+from accumulators import CORPUS_METRICS
+from parallel import accumulate_shards, score_shards
+from streaming import ScoreWriter, read_records
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    metrics: tuple[str, ...] = main.SCORE_COLUMNS,
+    chunk_size: int = 10_000,
+    workers: int = 1,
+    no_stop: bool = False,
+    agg: str = "max",
+    id_col: str = "id",
+    candidate_col: str = "candidate",
+    reference_col: str = "reference",
+    verbose: bool = True,
+    vector_store: str | None = None,
+) -> int:
+    """Score every record in input_path and write the scores to output_path."""
+    chunks = read_records(input_path, chunk_size, id_col, candidate_col, reference_col)
+    ids = deque()
+
+    def shards():
+        for records in chunks:
+            ids.append(records.ids)
+            yield records.candidates, records.references
+
+    tok = main.tokenize_no_stop if no_stop else main.tokenize
+    scored = score_shards(
+        shards(),
+        tok=tok,
+        content_only=no_stop,
+        workers=workers,
+        metrics=metrics,
+        agg=agg,
+        vector_store=vector_store,
+    )
+    with ScoreWriter(output_path) as writer:
+        for columns in scored:
+            writer.write(ids.popleft(), columns)
+            if verbose:
+                print(f"scored {writer.rows} rows", file=sys.stderr)
+        return writer.rows
+
+
+def corpus_file(
+    input_path: str,
+    metrics: tuple[str, ...] = CORPUS_METRICS,
+    chunk_size: int = 10_000,
+    workers: int = 1,
+    no_stop: bool = False,
+    id_col: str = "id",
+    candidate_col: str = "candidate",
+    reference_col: str = "reference",
+) -> dict:
+    """Corpus-level scores for input_path, in constant memory."""
+    chunks = read_records(input_path, chunk_size, id_col, candidate_col, reference_col)
+
+    def shards():
+        for records in chunks:
+            if any(isinstance(r, list) for r in records.references):
+                raise ValueError("corpus scores take one reference per record")
+            yield records.candidates, records.references
+
+    acc = accumulate_shards(
+        shards(),
+        metrics=metrics,
+        tok=main.tokenize_no_stop if no_stop else main.tokenize,
+        content_only=no_stop,
+        workers=workers,
+    )
+    return {"pairs": acc.pairs, **acc.result()}
+
+
+def _add_input_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=1, help="0 = one per CPU")
+    parser.add_argument(
+        "--no-stop", action="store_true", help="drop stopwords and punctuation"
+    )
+    parser.add_argument("--id-col", default="id")
+    parser.add_argument("--candidate-col", default="candidate")
+    parser.add_argument("--reference-col", default="reference")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py", description="Score candidates against references."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    score = sub.add_parser("score", help="score a JSONL/CSV/Parquet file of records")
+    score.add_argument("input", help="records with id, candidate, reference fields")
+    score.add_argument("-o", "--output", required=True, help=".parquet or .csv output")
+    score.add_argument(
+        "--metrics",
+        nargs="+",
+        choices=sorted(main.METRICS),
+        default=list(main.SCORE_COLUMNS),
+    )
+    _add_input_options(score)
+    score.add_argument(
+        "--agg",
+        choices=main.AGGREGATES,
+        default="max",
+        help="how to combine scores when a record has a list of references",
+    )
+    score.add_argument(
+        "--vector-store",
+        default=None,
+        help="exported VectorStore directory to read vectors from instead of spaCy",
+    )
+    score.add_argument("-q", "--quiet", action="store_true")
+
+    corpus = sub.add_parser("corpus", help="print corpus-level scores as JSON")
+    corpus.add_argument("input", help="records with id, candidate, reference fields")
+    corpus.add_argument(
+        "--metrics", nargs="+", choices=CORPUS_METRICS, default=list(CORPUS_METRICS)
+    )
+    _add_input_options(corpus)
+    return parser
+
+
+def run(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "corpus":
+        try:
+            result = corpus_file(
+                args.input,
+                metrics=tuple(args.metrics),
+                chunk_size=args.chunk_size,
+                workers=args.workers or None,
+                no_stop=args.no_stop,
+                id_col=args.id_col,
+                candidate_col=args.candidate_col,
+                reference_col=args.reference_col,
+            )
+        except (ValueError, KeyError, FileNotFoundError) as exc:
+            parser.error(str(exc))
+        print(json.dumps(result, indent=2))
+        return
+    try:
+        rows = score_file(
+            args.input,
+            args.output,
+            metrics=tuple(args.metrics),
+            chunk_size=args.chunk_size,
+            workers=args.workers or None,
+            no_stop=args.no_stop,
+            agg=args.agg,
+            id_col=args.id_col,
+            candidate_col=args.candidate_col,
+            reference_col=args.reference_col,
+            verbose=not args.quiet,
+            vector_store=args.vector_store,
+        )
+    except (ValueError, KeyError, FileNotFoundError) as exc:
+        parser.error(str(exc))
+    print(f"wrote {rows} rows to {args.output}")
@@ -0,0 +1,94 @@
+"""Embedding cache for text vectors, keyed by model + content_only + text.
+
+Vectors are held in an in-memory LRU, and optionally in a SQLite file of
+float32 blobs so repeat scoring runs (the same golden references, re-scored
+candidates) skip the spaCy pass for every text already embedded.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+
+def embedding_key(text: str, model: str, content_only: bool) -> str:
+    """Stable content hash of one (model, content_only, text) embedding."""
+    payload = f"{model}\0{int(content_only)}\0{text}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Thread-safe key -> float32 vector store with LRU eviction in memory."""
+
+    def __init__(self, path: str | Path | None = None, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._db = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS vectors "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Cached vectors for whichever keys are present."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+            missing = [k for k in keys if k not in found]
+            if self._db is not None and missing:
+                # Stay under SQLite's bound-parameter limit.
+                for i in range(0, len(missing), 500):
+                    chunk = missing[i : i + 500]
+                    marks = ",".join("?" * len(chunk))
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM vectors WHERE key IN ({marks})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        self._remember(key, vector)
+                        found[key] = vector
+        return found
+
+    def put_many(self, items: dict[str, np.ndarray]) -> None:
+        with self._lock:
+            vectors = {k: np.asarray(v, dtype=np.float32) for k, v in items.items()}
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+            if self._db is not None and vectors:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO vectors (key, vector) VALUES (?, ?)",
+                    [(k, v.tobytes()) for k, v in vectors.items()],
+                )
+                self._db.commit()
+
+    def get(self, key: str) -> np.ndarray | None:
+        return self.get_many([key]).get(key)
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        self.put_many({key: vector})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,174 @@
+"""Fast Unicode-aware regex tokenizers that mirror spaCy's English tokenizer.
+
+`tokenize` in main.py is ASCII-only, and `tokenize_no_stop` runs the spaCy
+pipeline just to drop stopwords and punctuation. This tier gets the same
+tokens from one precompiled regex:
+
+  - `fast_tokenize`: lowercase tokens split the way spaCy splits them
+    (clitics like 's and n't, dotted abbreviations, decimal numbers, emails),
+    with punctuation dropped. Works for any script, not just ASCII.
+  - `fast_tokenize_no_stop`: the same, minus spaCy's English STOP_WORDS.
+    Matches `main.tokenize_no_stop` on ordinary prose.
+  - `Vocab` / `fast_token_ids`: integer ids from a shared vocabulary, so
+    n-gram and LCS code can hash and compare ints instead of strings.
+
+spaCy's English tokenizer exceptions that prose hits most are mirrored:
+titles, months, and states keep their period ("Mr.", "Jan.", "Calif."),
+"cannot"/"gonna"/"gotta" split in two, "o'clock" stays whole, and clock
+times split like spaCy ("5:30pm" whole, "10am" -> "10", "am").
+
+Known differences from spaCy: URLs and the rarer tokenizer exceptions
+("C++", "a&b", "c'mon", "y'all", "ma'am", "doin'") are split into their word
+characters, apostrophe-less contractions ("im", "dont") stay whole, and
+hyphenated ranges ("40k-60k") are split.
+"""
+
+import importlib.util
+import re
+import runpy
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+_UNITS = "km|m|dm|cm|mm|ha|nm|yd|in|ft|kg|g|mg|t|lb|oz|mph|hPa|Pa|mbar|mb|MB|kb|KB|gb|GB|tb|TB|T|G|M|K"
+
+# spaCy's English abbreviations that keep their period (case-sensitive, like spaCy).
+# Dotted ones ("N.Y.", "Ph.D.") are covered by the U.S. rule below.
+_ABBREVIATIONS = (
+    "Adm Bros co Co Corp Dr Gen Gov Inc Jr Ltd Md Messrs Mo Mont Mr Mrs Ms Prof Rep Rev "
+    "Sen St vs Mt Ak Ala Apr Ariz Ark Aug Calif Colo Conn Dec Del Feb Fla Ga Ia Id Ill Ind "
+    "Jan Jul Jun Kan Kans Ky La Mar Mass Mich Minn Miss Neb Nebr Nev Nov Oct Okla Ore Pa Sep "
+    "Sept Tenn Va Wash Wis"
+).split()
+
+# Alternatives are tried in order at each position; matching runs on the
+# original text because a few of spaCy's rules depend on case. After the three
+# split words, plain words go in one step so the rarer rules only see odd characters.
+_TOKEN_RE = re.compile(
+    rf"""
+    \b(?:[Cc]an(?=not\b)|[Gg]on(?=na\b)|[Gg]ot(?=ta\b))  # can|not, gon|na, got|ta
+    | [^\W\d_]+(?![\w.@'’‘])                       # plain word, nothing attached
+    | \A\s+ | (?<=\S\ )\s+ | (?<=\S)[^\S\ ]\s*     # whitespace beyond one space
+    | [\w.+-]+@[\w-]+(?:\.[\w-]+)+                # email
+    | @\w+                                         # @mention
+    | \b(?:{"|".join(re.escape(a) for a in _ABBREVIATIONS)})\.(?!(?![A-Z])\w)  # Mr., Jan.
+    | \b[Oo]['’]clock\b
+    | (?:[^\W\d_]\.){{2,}}                          # U.S., e.g.
+    | \w*[a-z0-9][A-Z]\.(?!\w) | \b[A-Z]\.(?!\w)    # MoM., A. (no split after one capital)
+    | \d+(?:[.,]\d+)*(?=(?:{_UNITS})\b(?![/-]))     # 10|km, 1.5|m
+    | \b(?:1[0-2]|[1-9])(?=(?:[ap]m|[ap]\.m\.)(?!\w))   # 10|am, 3|p.m.
+    | \d+(?:[.,/:]\d+)+\w*                          # 3.14, 1,000, 50/50, 5:30pm
+    | \w+(?=n['’‘]t\b)                              # do|n't, ca|n't
+    | n['’‘]t\b
+    | ['’‘](?:s|m|d|ll|re|ve)\b                      # 's, 'm, 'd, 'll, 're, 've
+    | \w+
+    | [^\w\s]                                       # punctuation and symbols
+    """,
+    re.VERBOSE,
+)
+
+
+def _load_stop_words() -> frozenset:
+    """spaCy's English STOP_WORDS, read without importing spaCy itself.
+
+    en/stop_words.py is plain data, so running it directly keeps the list in
+    sync with the installed spaCy while skipping its ~1 s package import.
+    """
+    spec = importlib.util.find_spec("spacy")
+    if spec is None or spec.origin is None:
+        raise ImportError("fast_tokenize_no_stop needs spaCy's stopword list")
+    path = Path(spec.origin).parent / "lang" / "en" / "stop_words.py"
+    return frozenset(runpy.run_path(str(path))["STOP_WORDS"])
+
+
+_stop_words: frozenset | None = None
+
+
+def stop_words() -> frozenset:
+    global _stop_words
+    if _stop_words is None:
+        _stop_words = _load_stop_words()
+    return _stop_words
+
+
+@lru_cache(maxsize=None)
+def _is_punct(char: str) -> bool:
+    return unicodedata.category(char).startswith("P")
+
+
+# Leading, doubled, or non-space whitespace becomes tokens of its own, so those
+# texts skip the per-chunk cache below.
+_ODD_SPACE_RE = re.compile(r"\A |  |[^\S ]")
+
+
+def _words(text: str) -> list[str]:
+    return [t.lower() for t in _TOKEN_RE.findall(text) if len(t) > 1 or not _is_punct(t)]
+
+
+@lru_cache(maxsize=1 << 17)
+def _chunk_tokens(chunk: str) -> tuple[str, ...]:
+    return tuple(_words(chunk))
+
+
+@lru_cache(maxsize=1 << 17)
+def _chunk_content(chunk: str) -> tuple[str, ...]:
+    stops = stop_words()
+    return tuple(t for t in _words(chunk) if t not in stops)
+
+
+def _tokens(text: str, chunk_fn) -> list[str]:
+    # Like spaCy's tokenizer, split on single spaces and cache each chunk, so
+    # repeated words cost one dict lookup instead of a regex pass.
+    if _ODD_SPACE_RE.search(text):
+        return list(chunk_fn.__wrapped__(text))
+    out = []
+    for chunk in text.split(" "):
+        out.extend(chunk_fn(chunk))
+    return out
+
+
+def fast_tokenize(text: str) -> list[str]:
+    """Lowercase spaCy-style tokens without punctuation."""
+    return _tokens(text, _chunk_tokens)
+
+
+def fast_tokenize_no_stop(text: str) -> list[str]:
+    """Lowercase content-word tokens (no stopwords or punctuation)."""
+    return _tokens(text, _chunk_content)
+
+
+# --- Integer token ids ---
+
+
+class Vocab:
+    """Shared token -> id mapping; ids are assigned in first-seen order."""
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def encode(self, tokens: list[str]) -> list[int]:
+        ids, strings = self.ids, self.strings
+        out = []
+        for token in tokens:
+            i = ids.get(token)
+            if i is None:
+                i = ids[token] = len(strings)
+                strings.append(token)
+            out.append(i)
+        return out
+
+    def decode(self, ids: list[int]) -> list[str]:
+        return [self.strings[i] for i in ids]
+
+
+shared_vocab = Vocab()
+
+
+def fast_token_ids(text: str, no_stop: bool = True, vocab: Vocab = shared_vocab) -> list[int]:
+    """Token ids for text; no_stop=True drops stopwords like tokenize_no_stop."""
+    tokens = fast_tokenize_no_stop(text) if no_stop else fast_tokenize(text)
+    return vocab.encode(tokens)
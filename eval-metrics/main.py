@@ -1,11 +1,76 @@
+from __future__ import annotations
+
+import os
 import re
+import threading
 from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
 
 import numpy as np
-import pandas as pd
-import spacy
 
-nlp = spacy.load("en_core_web_md")
+from embedding_cache import EmbeddingCache, embedding_key
+from lcs import lcs_indices, lcs_length
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from vector_store import VectorStore
+
+# --- spaCy model (loaded lazily) ---
+
+DEFAULT_MODEL = "en_core_web_md"
+
+# Only the tokenizer, lexeme flags (is_stop, is_punct), and static vectors are
+# used, so every trained pipe is excluded at load time.
+_UNUSED_PIPES = [
+    "tok2vec",
+    "tagger",
+    "parser",
+    "attribute_ruler",
+    "lemmatizer",
+    "ner",
+    "senter",
+]
+
+_model_name = os.environ.get("EVAL_METRICS_SPACY_MODEL", DEFAULT_MODEL)
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def set_model(name: str) -> None:
+    """Select the spaCy model (package name or path); loads on next use.
+
+    Re-selecting the current model keeps the already-loaded pipeline.
+    """
+    global _model_name, _nlp
+    with _nlp_lock:
+        if name != _model_name:
+            _model_name, _nlp = name, None
+
+
+def get_model_name() -> str:
+    return _model_name
+
+
+def get_nlp():
+    """The tokenizer-only spaCy pipeline, loaded on first call (thread-safe)."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+
+                _nlp = spacy.load(_model_name, exclude=_UNUSED_PIPES)
+    return _nlp
+
+
+def __getattr__(name: str):
+    # Keep `main.nlp` working without loading the model at import time.
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 _WORD_RE = re.compile(r"[a-z0-9']+")
 
@@ -20,7 +85,23 @@ def tokenize(text: str) -> list[str]:
 
 def tokenize_no_stop(text: str) -> list[str]:
     """Lowercase content-word tokens (no stopwords or punctuation)."""
-    return [t.lower_ for t in nlp(text) if not t.is_stop and not t.is_punct]
+    return doc_tokens_no_stop(get_nlp()(text))
+
+
+def doc_tokens_no_stop(doc) -> list[str]:
+    """`tokenize_no_stop` over an already-parsed Doc."""
+    return [t.lower_ for t in doc if not t.is_stop and not t.is_punct]
+
+
+# Tokenizers that can reuse a parsed Doc instead of running the pipeline again.
+_DOC_TOKENIZERS = {tokenize_no_stop: doc_tokens_no_stop}
+
+
+def parse(texts, batch_size: int = 256, n_process: int = 1) -> dict:
+    """Parse each unique text once with nlp.pipe. Returns {text: Doc}."""
+    unique = list(dict.fromkeys(texts))
+    docs = get_nlp().pipe(unique, batch_size=batch_size, n_process=n_process)
+    return dict(zip(unique, docs))
 
 
 # --- Term Overlap Metrics ---
@@ -63,50 +144,179 @@ def _f1(precision: float, recall: float) -> float:
 
 
 def rouge_n(candidate: str, reference: str, n: int, tok=tokenize) -> float:
-    c_tok, r_tok = tok(candidate), tok(reference)
+    return rouge_n_tokens(tok(candidate), tok(reference), n)
+
+
+def rouge_n_tokens(c_tok: list[str], r_tok: list[str], n: int) -> float:
     if not c_tok and not r_tok:
         return 1.0
     if not c_tok or not r_tok:
         return 0.0
     c_ngr, r_ngr = Counter(_ngrams(c_tok, n)), Counter(_ngrams(r_tok, n))
+    if not c_ngr or not r_ngr:
+        return 0.0
     overlap = sum((c_ngr & r_ngr).values())
     return _f1(overlap / sum(c_ngr.values()), overlap / sum(r_ngr.values()))
 
 
-def _lcs_length(a: list[str], b: list[str]) -> int:
-    m, n = len(a), len(b)
-    dp = [0] * (n + 1)
-    for i in range(1, m + 1):
-        prev = 0
-        for j in range(1, n + 1):
-            tmp = dp[j]
-            dp[j] = prev + 1 if a[i - 1] == b[j - 1] else max(dp[j], dp[j - 1])
-            prev = tmp
-    return dp[n]
+def rouge_l(candidate: str, reference: str, tok=tokenize) -> float:
+    return rouge_l_tokens(tok(candidate), tok(reference))
 
 
-def rouge_l(candidate: str, reference: str, tok=tokenize) -> float:
-    c_tok, r_tok = tok(candidate), tok(reference)
+def rouge_l_tokens(c_tok: list[str], r_tok: list[str]) -> float:
     if not c_tok and not r_tok:
         return 1.0
     if not c_tok or not r_tok:
         return 0.0
-    lcs = _lcs_length(c_tok, r_tok)
+    lcs = lcs_length(c_tok, r_tok)
     return _f1(lcs / len(c_tok), lcs / len(r_tok))
 
 
+_SENT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+# Periods that usually don't end a sentence: "U.S.", "e.g.", "Dr.", ...
+_ABBREV_RE = re.compile(
+    r"(?:\b(?:[A-Za-z]\.){2,}|\b(?:Mr|Mrs|Ms|Dr|Prof|St|Jr|Sr|vs|Inc|Ltd|No)\.)$"
+)
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split on sentence-final punctuation or newlines.
+
+    A period after a common abbreviation ("U.S. is", "Dr. Smith") doesn't
+    split, so an abbreviation that really ends a sentence joins it to the next.
+    """
+    sents, start = [], 0
+    for match in _SENT_RE.finditer(text):
+        if "\n" not in match.group() and _ABBREV_RE.search(text, start, match.start()):
+            continue
+        sents.append(text[start : match.start()])
+        start = match.end()
+    sents.append(text[start:])
+    return [s for s in sents if s.strip()]
+
+
+def rouge_lsum(candidate: str, reference: str, tok=tokenize) -> float:
+    """Summary-level ROUGE-L over sentences (union LCS, Lin 2004)."""
+    return rouge_lsum_tokens(
+        [tok(s) for s in split_sentences(candidate)],
+        [tok(s) for s in split_sentences(reference)],
+    )
+
+
+def rouge_lsum_tokens(c_sents: list[list[str]], r_sents: list[list[str]]) -> float:
+    c_sents, r_sents = [s for s in c_sents if s], [s for s in r_sents if s]
+    c_total, r_total = sum(map(len, c_sents)), sum(map(len, r_sents))
+    if not c_total and not r_total:
+        return 1.0
+    if not c_total or not r_total:
+        return 0.0
+    c_left = Counter(t for s in c_sents for t in s)
+    r_left = Counter(t for s in r_sents for t in s)
+    hits = 0
+    for r in r_sents:
+        union = set()
+        for c in c_sents:
+            union.update(lcs_indices(r, c))
+        for i in sorted(union):
+            token = r[i]
+            if c_left[token] > 0 and r_left[token] > 0:
+                hits += 1
+                c_left[token] -= 1
+                r_left[token] -= 1
+    return _f1(hits / c_total, hits / r_total)
+
+
+# --- Precomputed Features ---
+
+
+@dataclass
+class TextFeatures:
+    """Per-text features computed once and shared by every metric.
+
+    Only the features some requested metric needs are filled in: `vector`,
+    `doc`, and `token_vectors` stay None unless a metric declares "vectors",
+    "doc", or "token_vectors".
+    """
+
+    tokens: list[str]
+    token_set: frozenset
+    ngrams: dict[int, Counter]
+    text: str = ""
+    vector: np.ndarray | None = None
+    doc: object = None
+    token_vectors: object = None  # bertscore.TokenMatrix
+
+
+def text_features(tokens: list[str], max_n: int = 2) -> TextFeatures:
+    """Token set plus 1..max_n n-gram Counters for one tokenized text."""
+    return TextFeatures(
+        tokens=tokens,
+        token_set=frozenset(tokens),
+        ngrams={n: Counter(_ngrams(tokens, n)) for n in range(1, max_n + 1)},
+    )
+
+
+def _overlap(a: Counter, b: Counter) -> int:
+    """Clipped match count sum(min(a[k], b[k])), iterating the smaller side."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(min(v, b[k]) for k, v in a.items() if k in b)
+
+
+def jaccard_features(c: TextFeatures, r: TextFeatures) -> float:
+    a, b = c.token_set, r.token_set
+    if not a and not b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+
+def token_f1_features(c: TextFeatures, r: TextFeatures) -> float:
+    if not c.tokens and not r.tokens:
+        return 1.0
+    if not c.tokens or not r.tokens:
+        return 0.0
+    c_uni = c.ngrams.get(1) or Counter(c.tokens)
+    r_uni = r.ngrams.get(1) or Counter(r.tokens)
+    overlap = _overlap(c_uni, r_uni)
+    return _f1(overlap / len(c.tokens), overlap / len(r.tokens))
+
+
+def rouge_n_features(c: TextFeatures, r: TextFeatures, n: int) -> float:
+    if not c.tokens and not r.tokens:
+        return 1.0
+    if not c.tokens or not r.tokens:
+        return 0.0
+    c_ngr = c.ngrams.get(n) or Counter(_ngrams(c.tokens, n))
+    r_ngr = r.ngrams.get(n) or Counter(_ngrams(r.tokens, n))
+    if not c_ngr or not r_ngr:
+        return 0.0
+    overlap = _overlap(c_ngr, r_ngr)
+    return _f1(overlap / (len(c.tokens) - n + 1), overlap / (len(r.tokens) - n + 1))
+
+
+def rouge_l_features(c: TextFeatures, r: TextFeatures) -> float:
+    return rouge_l_tokens(c.tokens, r.tokens)
+
+
 # --- Semantic Similarity (spaCy word vectors) ---
 
 
 def text_vector(text: str, content_only: bool = False) -> np.ndarray:
     """Average word vector. If content_only, skip stopwords and punctuation."""
-    doc = nlp(text)
+    return doc_vector(get_nlp()(text), content_only)
+
+
+def doc_vector(doc, content_only: bool = False) -> np.ndarray:
+    """`text_vector` over an already-parsed Doc."""
     if content_only:
         tokens = [t for t in doc if t.has_vector and not t.is_stop and not t.is_punct]
     else:
         tokens = [t for t in doc if t.has_vector]
     if not tokens:
-        return np.zeros(nlp.vocab.vectors_length)
+        return np.zeros(doc.vocab.vectors_length)
     return np.mean([t.vector for t in tokens], axis=0)
 
 
@@ -117,36 +327,483 @@ def cosine_similarity(u: np.ndarray, v: np.ndarray) -> float:
     return float(np.dot(u, v) / denom)
 
 
+def normalize_rows(vectors, dim: int = 0) -> np.ndarray:
+    """Stack vectors into a float32 matrix of unit rows (zero rows stay zero).
+
+    An empty input becomes a (0, dim) matrix, unless it is already 2-D.
+    """
+    m = np.asarray(vectors, dtype=np.float32)
+    if m.size == 0 and m.ndim != 2:
+        m = m.reshape(0, dim)
+    m = np.atleast_2d(m)
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return np.divide(m, norms, out=np.zeros_like(m), where=norms > 0)
+
+
+def _normalize_pair(cands, refs) -> tuple[np.ndarray, np.ndarray]:
+    """normalize_rows for both sides; an empty side takes the other's width."""
+    c, r = normalize_rows(cands), normalize_rows(refs)
+    if not len(c):
+        c = c.reshape(0, r.shape[1])
+    elif not len(r):
+        r = r.reshape(0, c.shape[1])
+    return c, r
+
+
+def iter_similarity_chunks(cands, refs, chunk_size: int = 4096):
+    """Yield (row offset, chunk) blocks of the cosine similarity matrix.
+
+    Rows are candidates, columns references; only `chunk_size` rows are held
+    at a time, so N x M results larger than memory can be streamed to disk.
+    """
+    c, r = _normalize_pair(cands, refs)
+    for start in range(0, len(c), chunk_size):
+        yield start, c[start : start + chunk_size] @ r.T
+
+
+def similarity_matrix(cands, refs, chunk_size: int | None = None, out=None) -> np.ndarray:
+    """N x M cosine similarities between candidate and reference vectors.
+
+    Vectors are normalized once and compared with one matmul; a zero vector
+    scores 0.0 against everything, like `cosine_similarity`. With chunk_size,
+    rows are computed in blocks and written into `out` (e.g. an np.memmap).
+    """
+    if chunk_size is None and out is None:
+        c, r = _normalize_pair(cands, refs)
+        return c @ r.T
+    if out is None:
+        out = np.empty((len(cands), len(refs)), dtype=np.float32)
+    for start, block in iter_similarity_chunks(cands, refs, chunk_size or 4096):
+        out[start : start + len(block)] = block
+    return out
+
+
+def top_k(cands, refs, k: int = 5, chunk_size: int = 4096) -> tuple[np.ndarray, np.ndarray]:
+    """Best k references per candidate, as (indices, scores), highest first.
+
+    Works chunk by chunk, so the full N x M matrix is never materialized.
+    """
+    k = min(k, len(refs))
+    indices = np.empty((len(cands), k), dtype=np.int64)
+    scores = np.empty((len(cands), k), dtype=np.float32)
+    if k == 0:
+        return indices, scores
+    for start, block in iter_similarity_chunks(cands, refs, chunk_size):
+        idx = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top = np.take_along_axis(block, idx, axis=1)
+        order = np.argsort(-top, axis=1, kind="stable")
+        end = start + len(block)
+        indices[start:end] = np.take_along_axis(idx, order, axis=1)
+        scores[start:end] = np.take_along_axis(top, order, axis=1)
+    return indices, scores
+
+
+def _cached_vectors(
+    cache: EmbeddingCache | None, texts: list[str], content_only: bool
+) -> dict[str, np.ndarray]:
+    """{text: vector} for the texts already in the cache."""
+    if cache is None:
+        return {}
+    keys = {text: embedding_key(text, _model_name, content_only) for text in texts}
+    found = cache.get_many(list(keys.values()))
+    return {text: found[key] for text, key in keys.items() if key in found}
+
+
+def _store_vectors(
+    cache: EmbeddingCache | None, vectors: dict[str, np.ndarray], content_only: bool
+) -> None:
+    if cache is not None:
+        cache.put_many(
+            {embedding_key(t, _model_name, content_only): v for t, v in vectors.items()}
+        )
+
+
+# --- Metric Registry ---
+
+# Features a metric can declare. "tokens" and "ngrams" come from the scoring
+# tokenizer, "doc" is the parsed spaCy Doc, "vectors" the average word vector,
+# and "token_vectors" the per-token unit vectors used by greedy matching.
+FEATURES = ("tokens", "ngrams", "doc", "vectors", "token_vectors")
+
+
+@dataclass(frozen=True)
+class Metric:
+    """A scoring function plus the per-text features it needs.
+
+    `pair(c, r)` scores one candidate/reference pair of TextFeatures. An
+    optional `batch(cands, refs, memo)` scores a whole batch at once (refs
+    holds one entry or one per candidate); `memo` is shared by every metric
+    in the same call so related metrics can reuse work, and its "metrics"
+    entry lists them all.
+    """
+
+    name: str
+    pair: Callable[[TextFeatures, TextFeatures], float]
+    needs: frozenset = frozenset({"tokens"})
+    max_n: int = 0
+    batch: Callable | None = None
+
+
+METRICS: dict[str, Metric] = {}
+
+
+def register_metric(metric: Metric) -> Metric:
+    """Add a metric to the registry (replacing any with the same name)."""
+    unknown = set(metric.needs) - set(FEATURES)
+    if unknown:
+        raise ValueError(f"{metric.name}: unknown features {sorted(unknown)}")
+    METRICS[metric.name] = metric
+    return metric
+
+
+# N-gram order each batched overlap metric reads.
+_OVERLAP_ORDERS = {"jaccard": 1, "token_f1": 1, "rouge1": 1, "rouge2": 2}
+
+
+def _overlap_batch(name: str) -> Callable:
+    def batch(
+        cands: list[TextFeatures], refs: list[TextFeatures], memo: dict
+    ) -> np.ndarray:
+        if "overlap" not in memo:
+            from batch_overlap import overlap_scores
+
+            # Only the orders requested in this call: jaccard alone builds no bigrams.
+            names = {m.name for m in memo.get("metrics", ())} | {name}
+            ns = tuple(sorted({_OVERLAP_ORDERS[n] for n in names if n in _OVERLAP_ORDERS}))
+            memo["overlap"] = overlap_scores(
+                [c.tokens for c in cands], [r.tokens for r in refs], ns
+            )
+        return memo["overlap"][name]
+
+    return batch
+
+
+def semantic_features(c: TextFeatures, r: TextFeatures) -> float:
+    return cosine_similarity(c.vector, r.vector)
+
+
+def _semantic_batch(
+    cands: list[TextFeatures], refs: list[TextFeatures], memo: dict
+) -> np.ndarray:
+    c = normalize_rows([f.vector for f in cands])
+    r = normalize_rows([f.vector for f in refs])
+    return (c * r).sum(axis=1)
+
+
+def bertscore_metrics(idf=None, prefix: str = "bertscore") -> list[Metric]:
+    """Greedy token-matching precision, recall, and F1 (see bertscore.py).
+
+    The three metrics share one batched pass. Pass an `IDF` from
+    `bertscore.fit_idf` for weighted variants, under a different prefix:
+
+        for m in bertscore_metrics(fit_idf(corpus_tokens), "bertscore_idf"):
+            register_metric(m)
+    """
+
+    def batch(cands: list[TextFeatures], refs: list[TextFeatures], memo: dict) -> dict:
+        if prefix not in memo:
+            from bertscore import greedy_match
+
+            memo[prefix] = greedy_match(
+                [c.token_vectors for c in cands], [r.token_vectors for r in refs], idf
+            )
+        return memo[prefix]
+
+    def column(suffix: str, part: str) -> Metric:
+        return Metric(
+            f"{prefix}_{suffix}",
+            lambda c, r: batch([c], [r], {})[part][0],
+            frozenset({"token_vectors"}),
+            batch=lambda cands, refs, memo: batch(cands, refs, memo)[part],
+        )
+
+    return [column("p", "precision"), column("r", "recall"), column("f1", "f1")]
+
+
+_NGRAMS = frozenset({"tokens", "ngrams"})
+
+for _metric in (
+    Metric("jaccard", jaccard_features, _NGRAMS, 1, _overlap_batch("jaccard")),
+    Metric("token_f1", token_f1_features, _NGRAMS, 1, _overlap_batch("token_f1")),
+    Metric(
+        "rouge1", lambda c, r: rouge_n_features(c, r, 1), _NGRAMS, 1, _overlap_batch("rouge1")
+    ),
+    Metric(
+        "rouge2", lambda c, r: rouge_n_features(c, r, 2), _NGRAMS, 2, _overlap_batch("rouge2")
+    ),
+    Metric("rougeL", rouge_l_features),
+    Metric("semantic", semantic_features, frozenset({"vectors"}), batch=_semantic_batch),
+):
+    register_metric(_metric)
+for _metric in bertscore_metrics():
+    register_metric(_metric)
+
+SCORE_COLUMNS = ("jaccard", "token_f1", "rouge1", "rouge2", "rougeL", "semantic")
+
+
+def plan_metrics(metrics) -> tuple[list[Metric], frozenset, int]:
+    """Resolve metric names to (metrics, features needed, max n-gram order)."""
+    unknown = [m for m in metrics if m not in METRICS]
+    if unknown:
+        raise ValueError(f"unknown metrics: {unknown} (registered: {sorted(METRICS)})")
+    chosen = [METRICS[m] for m in metrics]
+    needs = frozenset().union(*(m.needs for m in chosen))
+    max_n = max((m.max_n for m in chosen), default=0)
+    return chosen, needs, max_n
+
+
+def needs_spacy(metrics, tok=tokenize, store: VectorStore | None = None) -> bool:
+    """Whether scoring these metrics with this tokenizer loads the spaCy model.
+
+    With a `store`, vectors come from it instead of the model.
+    """
+    _, needs, _ = plan_metrics(metrics)
+    wants_tokens = bool(needs & {"tokens", "ngrams"})
+    model_needs = {"doc"} if store is not None else {"doc", "vectors", "token_vectors"}
+    return bool(needs & model_needs) or (wants_tokens and tok in _DOC_TOKENIZERS)
+
+
 # --- Scoring ---
 
 
+def build_features(
+    texts: list[str],
+    needs: frozenset = frozenset({"tokens", "ngrams", "vectors"}),
+    max_n: int = 2,
+    tok=tokenize,
+    content_only: bool = False,
+    batch_size: int = 256,
+    n_process: int = 1,
+    cache: EmbeddingCache | None = None,
+    store: VectorStore | None = None,
+) -> dict[str, TextFeatures]:
+    """Compute the requested features once per unique text.
+
+    spaCy only runs for texts that need a Doc: for "doc" or "token_vectors",
+    for a Doc-aware tokenizer like `tokenize_no_stop`, or for vectors not
+    found in `cache`. With a `store` (a `VectorStore`), "vectors" and
+    "token_vectors" are read from its memory-mapped table instead, and
+    `cache` is not used.
+    """
+    texts = list(dict.fromkeys(texts))
+    wants_tokens = bool(needs & {"tokens", "ngrams"})
+    wants_vectors = "vectors" in needs
+    if "token_vectors" in needs:
+        from bertscore import doc_token_matrix, store_token_matrix
+    doc_tok = _DOC_TOKENIZERS.get(tok) if wants_tokens else None
+
+    vectors = {}
+    if wants_vectors and store is not None:
+        vectors = dict(zip(texts, store.text_vectors(texts, content_only)))
+    elif wants_vectors:
+        vectors = _cached_vectors(cache, texts, content_only)
+    doc_needs = {"doc"} if store is not None else {"doc", "token_vectors"}
+    if needs & doc_needs or doc_tok is not None:
+        to_parse = texts
+    elif wants_vectors:
+        to_parse = [t for t in texts if t not in vectors]
+    else:
+        to_parse = []
+    docs = parse(to_parse, batch_size, n_process) if to_parse else {}
+    if wants_vectors:
+        new = {t: doc_vector(d, content_only) for t, d in docs.items() if t not in vectors}
+        vectors.update(new)
+        _store_vectors(cache, new, content_only)
+
+    feats = {}
+    for text in texts:
+        if doc_tok is not None:
+            tokens = doc_tok(docs[text])
+        else:
+            tokens = tok(text) if wants_tokens else []
+        f = text_features(tokens, max_n if "ngrams" in needs else 0)
+        f.text = text
+        f.vector = vectors.get(text)
+        f.doc = docs.get(text) if "doc" in needs else None
+        if "token_vectors" in needs and store is not None:
+            f.token_vectors = store_token_matrix(store, text, content_only)
+        elif "token_vectors" in needs:
+            f.token_vectors = doc_token_matrix(docs[text], content_only)
+        feats[text] = f
+    return feats
+
+
+def score_features(
+    cands: list[TextFeatures], refs: list[TextFeatures], metrics: list[Metric]
+) -> dict[str, np.ndarray]:
+    """Score candidate i against refs[i] (or refs[0]) for each metric.
+
+    Metrics with a `batch` implementation score the whole list at once; the
+    rest fall back to a loop over `pair`.
+    """
+    if len(refs) not in (1, len(cands)):
+        raise ValueError("refs must hold 1 reference or one per candidate")
+    if not cands:
+        return {m.name: np.empty(0) for m in metrics}
+    memo: dict = {"metrics": metrics}
+    pairs = list(zip(cands, refs * len(cands) if len(refs) == 1 else refs))
+    columns = {}
+    for m in metrics:
+        if m.batch is not None:
+            column = m.batch(cands, refs, memo)
+        else:
+            column = [m.pair(c, r) for c, r in pairs]
+        columns[m.name] = np.asarray(column, dtype=np.float64)
+    return columns
+
+
 def score_candidates(
-    reference: str,
+    reference: str | list[str],
     candidates: dict[str, str],
     tok=tokenize,
     content_only: bool = False,
+    batch_size: int = 256,
+    n_process: int = 1,
+    cache: EmbeddingCache | None = None,
+    metrics=SCORE_COLUMNS,
+    agg="max",
+    store: VectorStore | None = None,
 ) -> pd.DataFrame:
-    ref_tokens = tok(reference)
-    ref_vec = text_vector(reference, content_only)
-
-    rows = []
-    for name, cand in candidates.items():
-        cand_tokens = tok(cand)
-        rows.append(
-            {
-                "candidate": name,
-                "jaccard": jaccard(cand_tokens, ref_tokens),
-                "token_f1": token_f1(cand_tokens, ref_tokens),
-                "rouge1": rouge_n(cand, reference, 1, tok),
-                "rouge2": rouge_n(cand, reference, 2, tok),
-                "rougeL": rouge_l(cand, reference, tok),
-                "semantic": cosine_similarity(
-                    text_vector(cand, content_only), ref_vec
-                ),
-            }
+    """Score each candidate against the reference.
+
+    Only the features the requested metrics declare are computed, once per
+    unique text: asking for ["rouge1"] never loads spaCy, and "semantic"
+    alone skips tokenization. Rows are sorted by "semantic" when it is
+    requested, and otherwise kept in input order.
+
+    `reference` may be a list of acceptable references; each metric is then
+    aggregated over them with `agg` (see `score_multi_ref`). With a `store`,
+    vectors come from that `VectorStore` (see `build_features`).
+    """
+    import pandas as pd
+
+    refs = [reference] if isinstance(reference, str) else list(reference)
+    chosen, needs, max_n = plan_metrics(metrics)
+    feats = build_features(
+        [*refs, *candidates.values()],
+        needs, max_n, tok, content_only, batch_size, n_process, cache, store,
+    )
+    cand_feats = [feats[c] for c in candidates.values()]
+    if isinstance(reference, str):
+        columns = score_features(cand_feats, [feats[reference]], chosen)
+    else:
+        ref_feats = [feats[r] for r in refs]
+        columns = _score_multi(cand_feats, [ref_feats] * len(cand_feats), chosen, agg)
+    df = pd.DataFrame({"candidate": list(candidates), **columns})
+    if "semantic" in columns:
+        df = df.sort_values("semantic", ascending=False)
+    return df
+
+
+def score_pairs(
+    candidates: list[str],
+    references: list,
+    tok=tokenize,
+    content_only: bool = False,
+    batch_size: int = 256,
+    cache: EmbeddingCache | None = None,
+    metrics=SCORE_COLUMNS,
+    agg="max",
+    store: VectorStore | None = None,
+) -> dict[str, np.ndarray]:
+    """Score candidate i against reference i (or all against one reference).
+
+    Returns a NumPy column per requested metric, in input order. A reference
+    may also be a list of acceptable references; see `score_multi_ref`.
+    With a `store`, vectors come from that `VectorStore`.
+    """
+    if any(isinstance(r, (list, tuple)) for r in references):
+        if len(references) == 1:
+            references = references * len(candidates)
+        refs = [[r] if isinstance(r, str) else list(r) for r in references]
+        return score_multi_ref(
+            candidates, refs, tok, content_only, batch_size, cache, metrics, agg, store
         )
+    chosen, needs, max_n = plan_metrics(metrics)
+    if not candidates:
+        return {m.name: np.empty(0) for m in chosen}
+    feats = build_features(
+        [*candidates, *references],
+        needs, max_n, tok, content_only, batch_size, 1, cache, store,
+    )
+    return score_features(
+        [feats[c] for c in candidates], [feats[r] for r in references], chosen
+    )
+
+
+# --- Multiple References ---
+
+AGGREGATES = ("max", "mean", "min")
+
+
+def aggregate(values: np.ndarray, counts: np.ndarray, how: str) -> np.ndarray:
+    """Reduce consecutive groups of `counts[i]` values; empty groups are NaN."""
+    if how not in AGGREGATES:
+        raise ValueError(f"aggregate must be one of {AGGREGATES}")
+    out = np.full(len(counts), np.nan)
+    has = counts > 0
+    if not has.any():
+        return out
+    starts = (np.cumsum(counts) - counts)[has]
+    if how == "max":
+        out[has] = np.maximum.reduceat(values, starts)
+    elif how == "min":
+        out[has] = np.minimum.reduceat(values, starts)
+    else:
+        out[has] = np.add.reduceat(values, starts) / counts[has]
+    return out
+
 
-    return pd.DataFrame(rows).sort_values("semantic", ascending=False)
+def score_multi_ref(
+    candidates: list[str],
+    references: list[list[str]],
+    tok=tokenize,
+    content_only: bool = False,
+    batch_size: int = 256,
+    cache: EmbeddingCache | None = None,
+    metrics=SCORE_COLUMNS,
+    agg="max",
+    store: VectorStore | None = None,
+) -> dict[str, np.ndarray]:
+    """Score candidate i against every reference in references[i].
+
+    Features are computed once per unique text, all (candidate, reference)
+    pairs are scored in one batched pass, and each metric is reduced per
+    candidate with `agg`: "max", "mean", "min", or a {metric: how} dict
+    (unlisted metrics use "max"). Candidates with no references get NaN.
+    """
+    if len(references) != len(candidates):
+        raise ValueError("references must hold one list per candidate")
+    chosen, needs, max_n = plan_metrics(metrics)
+    flat_refs = [r for refs in references for r in refs]
+    feats = build_features(
+        [*candidates, *flat_refs],
+        needs, max_n, tok, content_only, batch_size, 1, cache, store,
+    )
+    return _score_multi(
+        [feats[c] for c in candidates],
+        [[feats[r] for r in refs] for refs in references],
+        chosen,
+        agg,
+    )
+
+
+def _score_multi(
+    cands: list[TextFeatures],
+    refs: list[list[TextFeatures]],
+    metrics: list[Metric],
+    agg,
+) -> dict[str, np.ndarray]:
+    """Score every (candidate, reference) pair in one pass, then aggregate."""
+    hows = agg if isinstance(agg, dict) else {m.name: agg for m in metrics}
+    counts = np.array([len(r) for r in refs], dtype=np.int64)
+    flat_cands = [c for c, n in zip(cands, counts) for _ in range(n)]
+    flat_refs = [r for group in refs for r in group]
+    pair_scores = score_features(flat_cands, flat_refs, metrics)
+    return {
+        name: aggregate(values, counts, hows.get(name, "max"))
+        for name, values in pair_scores.items()
+    }
 
 
 # --- Apollo 11 Example ---
@@ -181,13 +838,26 @@ candidates = {
     ),
 }
 
-print("=== All tokens ===")
-df = score_candidates(reference, candidates)
-print(df.round(4).to_string(index=False))
 
-print()
-print("=== Stopwords removed ===")
-df_no_stop = score_candidates(
-    reference, candidates, tok=tokenize_no_stop, content_only=True
-)
-print(df_no_stop.round(4).to_string(index=False))
+def demo() -> None:
+    print("=== All tokens ===")
+    df = score_candidates(reference, candidates)
+    print(df.round(4).to_string(index=False))
+
+    print()
+    print("=== Stopwords removed ===")
+    df_no_stop = score_candidates(
+        reference, candidates, tok=tokenize_no_stop, content_only=True
+    )
+    print(df_no_stop.round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        from cli import run
+
+        run()
+    else:
+        demo()
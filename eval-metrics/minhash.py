@@ -0,0 +1,210 @@
+"""MinHash + LSH near-duplicate clustering, to score each near-duplicate once.
+
+Eval dumps repeat the same model output across runs and seeds with small
+variations. `cluster_pairs` groups (candidate, reference) pairs whose
+candidates are near-duplicates under the same reference, and `score_deduped`
+scores one representative per cluster and copies its scores to the rest:
+
+    columns = score_deduped(cands, refs, threshold=0.9)
+    columns["exact"]   # False where a score was copied from a near-duplicate
+
+Candidates are tokenized with `tokenize`, shingled into token n-grams, and
+MinHashed with NumPy universal hashes. LSH banding only compares pairs that
+share a band bucket, so clustering is O(N · bands) rather than O(N²).
+Clusters are stars, not connected components: a row joins a representative
+only when its own estimated Jaccard similarity to that representative reaches
+`threshold`, so a chain A~B~C never copies A's scores to a dissimilar C.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import chain, count
+
+import numpy as np
+
+from main import SCORE_COLUMNS, score_pairs, tokenize
+
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_EMPTY = np.iinfo(np.uint32).max
+CHUNK_ROWS = 50_000  # texts tokenized, or edges verified, at a time
+
+
+class MinHasher:
+    """Signatures of `num_perm` min-hashes over token n-gram shingles.
+
+    Token ids come from a vocabulary kept on the hasher, so signatures from
+    separate `signatures` calls are comparable.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle: int = 3, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle = shingle
+        self._a = rng.integers(0, 2**31, (num_perm, 1), dtype=np.uint32) * 2 + 1  # odd
+        self._b = rng.integers(0, 2**32, (num_perm, 1), dtype=np.uint32)
+        self._vocab: dict[str, int] = defaultdict(count(1).__next__)
+
+    def _shingle_keys(self, token_lists: list[list[str]]) -> tuple[np.ndarray, np.ndarray]:
+        """(one uint64 key per token-started shingle, shingles per text).
+
+        Every token starts a shingle of the next `shingle` tokens, padded at
+        the end of each text, so texts shorter than a shingle still hash.
+        """
+        # Ids start at 1 so padding (0) differs from every token.
+        ids = np.fromiter(
+            map(self._vocab.__getitem__, chain.from_iterable(token_lists)), dtype=np.uint64
+        )
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+        rows = np.repeat(np.arange(len(token_lists)), lengths)
+        pad = self.shingle - 1
+        ids_p = np.concatenate([ids, np.zeros(pad, dtype=np.uint64)])
+        rows_p = np.concatenate([rows, np.full(pad, -1)])
+        keys = np.zeros(len(ids), dtype=np.uint64)
+        for j in range(self.shingle):
+            same_text = rows_p[j : j + len(ids)] == rows
+            token = np.where(same_text, ids_p[j : j + len(ids)], 0)
+            keys = (keys ^ token) * _MIX
+        return keys, lengths
+
+    def signatures(self, token_lists: list[list[str]], chunk_size: int = 2_000) -> np.ndarray:
+        """(len(token_lists), num_perm) uint32 signatures; empty texts hash to all-max."""
+        out = np.full((len(token_lists), self.num_perm), _EMPTY, dtype=np.uint32)
+        for start in range(0, len(token_lists), chunk_size):
+            keys, counts = self._shingle_keys(token_lists[start : start + chunk_size])
+            if not len(keys):
+                continue
+            # The high 32 bits of the mixed keys, permuted by h(x) = (a·x + b) mod 2^32
+            # (a bijection for odd a). uint32 math in place halves memory traffic.
+            hashed = np.multiply(self._a, (keys >> 32).astype(np.uint32)[None, :])
+            hashed += self._b
+            has = counts > 0
+            starts = (np.cumsum(counts) - counts)[has]
+            rows = start + np.flatnonzero(has)
+            out[rows] = np.minimum.reduceat(hashed, starts, axis=1).T
+        return out
+
+
+def estimated_jaccard(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Fraction of equal min-hashes, row by row (an estimate of Jaccard)."""
+    return (a == b).mean(axis=-1)
+
+
+@dataclass
+class Clusters:
+    """Representative index per row, and whether the row matches it exactly."""
+
+    representative: np.ndarray  # int64; a representative points at itself
+    exact: np.ndarray  # bool; True for representatives and identical copies
+
+    @property
+    def n_clusters(self) -> int:
+        return len(np.unique(self.representative))
+
+
+def cluster_pairs(
+    candidates: list[str],
+    references: list,
+    threshold: float = 0.9,
+    num_perm: int = 128,
+    bands: int = 32,
+    shingle: int = 3,
+    tok=tokenize,
+    seed: int = 0,
+) -> Clusters:
+    """Cluster pairs whose candidates are near-duplicates under the same reference.
+
+    `references` holds one reference per candidate, or a single reference
+    shared by all. Rows are visited in order: a row joins the most similar
+    representative among its LSH bucket mates' representatives when that
+    similarity reaches `threshold`, and otherwise represents a new cluster.
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be a multiple of bands")
+    if len(references) not in (1, len(candidates)):
+        raise ValueError("references must hold 1 reference or one per candidate")
+    n = len(candidates)
+    if n == 0:
+        return Clusters(np.empty(0, dtype=np.int64), np.empty(0, dtype=bool))
+
+    # Only pairs under the same reference can share scores.
+    ref_ids = np.zeros(n, dtype=np.uint64)
+    if len(references) > 1:
+        ids: dict = {}
+        ref_ids = np.fromiter(
+            (ids.setdefault(repr(r), len(ids)) for r in references), np.uint64, count=n
+        )
+
+    # Identical candidates need no hashing: collapse them first.
+    first_seen: dict = {}
+    exact_rep = np.fromiter(
+        (first_seen.setdefault((c, r), i) for i, (c, r) in enumerate(zip(candidates, ref_ids))),
+        np.int64,
+        count=n,
+    )
+    uniq = np.flatnonzero(exact_rep == np.arange(n))
+    hasher = MinHasher(num_perm, shingle, seed)
+    sigs = np.empty((len(uniq), num_perm), dtype=np.uint32)
+    for start in range(0, len(uniq), CHUNK_ROWS):
+        rows = uniq[start : start + CHUNK_ROWS]
+        sigs[start : start + len(rows)] = hasher.signatures([tok(candidates[i]) for i in rows])
+
+    # LSH: rows sharing any band bucket (and reference) become candidate edges.
+    width = num_perm // bands
+    src, dst = [], []
+    for band in range(bands):
+        keys = ref_ids[uniq] * _MIX
+        for col in sigs[:, band * width : (band + 1) * width].T.astype(np.uint64):
+            keys = (keys ^ col) * _MIX
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        leader = first[inverse.ravel()]
+        mates = np.flatnonzero(leader != np.arange(len(uniq)))
+        src.append(mates)
+        dst.append(leader[mates])
+    # Bands often agree, so drop repeated edges. Each edge points from a row to
+    # an earlier bucket mate (its bucket's first row); sorting by source groups
+    # every row's earlier mates together.
+    edges = np.unique(np.concatenate(src) * len(uniq) + np.concatenate(dst))
+    src, dst = edges // len(uniq), edges % len(uniq)
+
+    # Leader clustering in row order. Earlier rows are settled, so a mate's
+    # representative is final, and a row only joins one it is itself similar to.
+    rep = np.arange(len(uniq))
+    rows, starts = np.unique(src, return_index=True)
+    bounds = np.append(starts, len(src))
+    for row, lo, hi in zip(rows.tolist(), bounds[:-1].tolist(), bounds[1:].tolist()):
+        leaders = np.unique(rep[dst[lo:hi]])
+        sims = estimated_jaccard(sigs[leaders], sigs[row])
+        best = int(np.argmax(sims))
+        if sims[best] >= threshold:
+            rep[row] = leaders[best]
+    rep_of_uniq = uniq[rep]
+    slot = np.searchsorted(uniq, exact_rep)
+    representative = rep_of_uniq[slot]
+    exact = representative == exact_rep
+    return Clusters(representative, exact)
+
+
+def score_deduped(
+    candidates: list[str],
+    references: list,
+    threshold: float = 0.9,
+    metrics=SCORE_COLUMNS,
+    clusters: Clusters | None = None,
+    **kwargs,
+) -> dict[str, np.ndarray]:
+    """`score_pairs` on cluster representatives, fanned back out to every row.
+
+    Adds an "exact" column: False where a row's scores were copied from a
+    near-duplicate rather than computed for (or for text identical to) it.
+    Other keyword arguments go to `score_pairs`.
+    """
+    if clusters is None:
+        clusters = cluster_pairs(candidates, references, threshold)
+    reps, slot = np.unique(clusters.representative, return_inverse=True)
+    rep_refs = references if len(references) == 1 else [references[i] for i in reps]
+    columns = score_pairs(
+        [candidates[i] for i in reps], rep_refs, metrics=metrics, **kwargs
+    )
+    out = {name: values[slot.ravel()] for name, values in columns.items()}
+    out["exact"] = clusters.exact
+    return out
@@ -0,0 +1,189 @@
+"""Multiprocess scoring for large candidate sets.
+
+Input pairs are cut into shards and scored by `main.score_pairs` in a process
+pool. Each worker loads the spaCy model once, in the pool initializer, and
+sends back NumPy metric columns instead of per-row dicts. Given a
+`vector_store` directory (see vector_store.py), workers memory-map it and read
+vectors from there instead, so vector metrics need no spaCy model at all. Shards are yielded
+in input order no matter which worker finishes first, and only a bounded
+number are in flight, so a 1M-row dump never sits in memory as Python rows.
+
+    columns = score_parallel(cands, refs, workers=8)      # {metric: np.ndarray}
+    table = to_arrow(columns)                              # optional pyarrow.Table
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+import main
+from accumulators import CORPUS_METRICS, CorpusAccumulator
+
+_worker: dict = {}
+
+
+def _init_worker(
+    model: str,
+    tok,
+    content_only: bool,
+    batch_size: int,
+    metrics: tuple[str, ...],
+    agg,
+    vector_store: str | Path | None = None,
+) -> None:
+    main.set_model(model)
+    store = None
+    if vector_store is not None:
+        from vector_store import VectorStore
+
+        store = VectorStore(vector_store)
+    if main.needs_spacy(metrics, tok, store):
+        main.get_nlp()
+    _worker.update(
+        tok=tok,
+        content_only=content_only,
+        batch_size=batch_size,
+        metrics=metrics,
+        agg=agg,
+        store=store,
+    )
+
+
+def _score_shard(cands: list[str], refs: list[str]) -> dict[str, np.ndarray]:
+    return main.score_pairs(
+        cands,
+        refs,
+        tok=_worker["tok"],
+        content_only=_worker["content_only"],
+        batch_size=_worker["batch_size"],
+        metrics=_worker["metrics"],
+        agg=_worker["agg"],
+        store=_worker["store"],
+    )
+
+
+def _shards(cands: list[str], refs: list[str], shard_size: int):
+    for start in range(0, len(cands), shard_size):
+        end = start + shard_size
+        yield cands[start:end], refs if len(refs) == 1 else refs[start:end]
+
+
+def score_shards(
+    shards: Iterable[tuple[list[str], list[str]]],
+    tok=main.tokenize,
+    content_only: bool = False,
+    workers: int | None = None,
+    batch_size: int = 256,
+    metrics: tuple[str, ...] = main.SCORE_COLUMNS,
+    agg="max",
+    vector_store: str | Path | None = None,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Score a stream of (cands, refs) shards in a pool, yielding in order.
+
+    Shards are pulled lazily and at most 2 x workers are in flight, so the
+    input can be an unbounded reader. workers=1 scores in this process.
+    References that are lists are aggregated with `agg` (see score_pairs).
+    With `vector_store`, an exported `VectorStore` directory, each worker
+    maps it and takes vectors from it instead of spaCy.
+    """
+    metrics = tuple(metrics)
+    init_args = (
+        main.get_model_name(), tok, content_only, batch_size, metrics, agg, vector_store
+    )
+    yield from _map_shards(_score_shard, shards, init_args, workers)
+
+
+def _map_shards(fn: Callable, shards: Iterable, init_args: tuple, workers: int | None):
+    """fn(*shard) for each shard, in order, with at most 2 x workers in flight."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(*init_args)
+        yield from (fn(*shard) for shard in shards)
+        return
+    shards = iter(shards)
+    pending = deque()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init_args) as pool:
+        for shard in shards:
+            pending.append(pool.submit(fn, *shard))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            result = pending.popleft().result()
+            shard = next(shards, None)
+            if shard is not None:
+                pending.append(pool.submit(fn, *shard))
+            yield result
+
+
+def _accumulate_shard(cands: list[str], refs: list[str]) -> CorpusAccumulator:
+    acc = CorpusAccumulator(_worker["metrics"], _worker["tok"], _worker["content_only"])
+    acc.update(cands, refs, _worker["batch_size"])
+    return acc
+
+
+def accumulate_shards(
+    shards: Iterable[tuple[list[str], list[str]]],
+    metrics: tuple[str, ...] = CORPUS_METRICS,
+    tok=main.tokenize,
+    content_only: bool = False,
+    workers: int | None = None,
+    batch_size: int = 256,
+) -> CorpusAccumulator:
+    """Corpus scores over a stream of (cands, refs) shards, map-reduce style.
+
+    Each worker turns a shard into a `CorpusAccumulator` and the partial sums
+    are merged here, so memory stays constant however long the stream is.
+    """
+    metrics = tuple(metrics)
+    init_args = (main.get_model_name(), tok, content_only, batch_size, metrics, "max")
+    total = CorpusAccumulator(metrics, tok, content_only)
+    for partial in _map_shards(_accumulate_shard, shards, init_args, workers):
+        total.merge(partial)
+    return total
+
+
+def iter_score_chunks(
+    cands: list[str],
+    refs: list[str],
+    shard_size: int = 2_000,
+    progress: Callable[[int, int], None] | None = None,
+    **kwargs,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Yield {metric: column} chunks for consecutive shards, in input order.
+
+    `refs` holds one reference per candidate, or a single reference shared by
+    all. `progress(done, total)` is called after each shard, in order. Other
+    keyword arguments (tok, content_only, workers, batch_size, metrics, agg,
+    vector_store) go to `score_shards`.
+    """
+    if len(refs) not in (1, len(cands)):
+        raise ValueError("refs must hold 1 reference or one per candidate")
+    done = 0
+    for chunk, (shard, _) in zip(
+        score_shards(_shards(cands, refs, shard_size), **kwargs),
+        _shards(cands, refs, shard_size),
+    ):
+        done += len(shard)
+        if progress is not None:
+            progress(done, len(cands))
+        yield chunk
+
+
+def score_parallel(cands: list[str], refs: list[str], **kwargs) -> dict[str, np.ndarray]:
+    """Score every pair with `iter_score_chunks` and concatenate the columns."""
+    metrics = tuple(kwargs.get("metrics", main.SCORE_COLUMNS))
+    chunks = list(iter_score_chunks(cands, refs, **kwargs))
+    if not chunks:
+        return {name: np.empty(0) for name in metrics}
+    return {name: np.concatenate([c[name] for c in chunks]) for name in metrics}
+
+
+def to_arrow(columns: dict[str, np.ndarray]):
+    """Wrap metric columns in a pyarrow.Table without copying."""
+    import pyarrow as pa
+
+    return pa.table(columns)
@@ -0,0 +1,141 @@
+"""Chunked readers and writers for scoring eval logs that don't fit in memory.
+
+Readers yield `Records` chunks of at most `chunk_size` rows from JSONL, CSV,
+or Parquet; writers append score columns to Parquet or CSV one chunk at a
+time. Formats are picked from the file suffix.
+"""
+
+import json
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+READ_FORMATS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+WRITE_FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+
+
+@dataclass
+class Records:
+    ids: list
+    candidates: list[str]
+    references: list  # a string, or a list of acceptable references, per row
+
+
+def _format(path: Path, formats: dict[str, str]) -> str:
+    try:
+        return formats[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported format: {path.name} (use {', '.join(formats)})")
+
+
+def read_records(
+    path: str | Path,
+    chunk_size: int = 10_000,
+    id_col: str = "id",
+    candidate_col: str = "candidate",
+    reference_col: str = "reference",
+) -> Iterator[Records]:
+    """Stream (id, candidate, reference) chunks. Missing ids become row numbers."""
+    path = Path(path)
+    readers = {"jsonl": _read_jsonl, "csv": _read_csv, "parquet": _read_parquet}
+    reader = readers[_format(path, READ_FORMATS)]
+    if not path.exists():
+        raise FileNotFoundError(f"No such file: {path}")
+    return _records(reader(path, chunk_size), id_col, candidate_col, reference_col)
+
+
+def _records(
+    chunks: Iterator[dict[str, list]], id_col: str, candidate_col: str, reference_col: str
+) -> Iterator[Records]:
+    offset = 0
+    for chunk in chunks:
+        n = len(chunk[candidate_col])
+        ids = chunk.get(id_col) or [None] * n
+        # Missing ids (no column in this chunk, null, or an empty CSV cell) become
+        # the row's position in the whole file.
+        ids = [offset + i if v is None or v == "" else v for i, v in enumerate(ids)]
+        offset += n
+        yield Records(
+            ids=ids,
+            candidates=[c or "" for c in chunk[candidate_col]],
+            references=[r if r is not None else "" for r in chunk[reference_col]],
+        )
+
+
+def _read_jsonl(path: Path, chunk_size: int) -> Iterator[dict[str, list]]:
+    with path.open(encoding="utf-8") as f:
+        lines = (line for line in f if line.strip())
+        while batch := list(islice(lines, chunk_size)):
+            records = [json.loads(line) for line in batch]
+            keys = dict.fromkeys(k for r in records for k in r)
+            yield {k: [r.get(k) for r in records] for k in keys}
+
+
+def _read_csv(path: Path, chunk_size: int) -> Iterator[dict[str, list]]:
+    import pandas as pd
+
+    for df in pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+        yield {col: df[col].tolist() for col in df.columns}
+
+
+def _read_parquet(path: Path, chunk_size: int) -> Iterator[dict[str, list]]:
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.to_pydict()
+
+
+class ScoreWriter:
+    """Append id + metric columns to a Parquet or CSV file chunk by chunk.
+
+    Ids are written as strings, since one file's ids can mix types (row numbers
+    for rows without one); metric columns keep the types of the first chunk.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.format = _format(self.path, WRITE_FORMATS)
+        self._writer = None
+        self._schema = None
+        self.rows = 0
+
+    def write(self, ids: list, columns: dict[str, np.ndarray]) -> None:
+        import pyarrow as pa
+
+        ids = pa.array([None if i is None else str(i) for i in ids], pa.string())
+        table = pa.table({"id": ids, **columns})
+        if self._writer is None:
+            self._schema = table.schema
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.format == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                import pyarrow.csv as pcsv
+
+                self._writer = pcsv.CSVWriter(self.path, self._schema)
+        self._writer.write_table(table.cast(self._schema))
+        self.rows += len(ids)
+
+    def close(self) -> int:
+        """Finish the file and return the number of rows written."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        return self.rows
+
+    def __enter__(self) -> "ScoreWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
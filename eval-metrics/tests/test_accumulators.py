@@ -0,0 +1,78 @@
+"""Corpus accumulators: chunked + merged sums equal one pass, macro equals score_pairs."""
+
+import random
+
+import pytest
+
+from accumulators import CorpusAccumulator, JaccardAccumulator, RougeNAccumulator
+from main import score_pairs
+
+METRICS = ("jaccard", "token_f1", "rouge1", "rouge2", "rougeL")
+WORDS = "the a cat dog sat ran on under mat rug quickly".split()
+
+
+@pytest.fixture
+def corpus():
+    rng = random.Random(0)
+
+    def text():
+        return " ".join(rng.choices(WORDS, k=rng.randint(0, 9)))
+
+    cands = [text() for _ in range(40)]
+    refs = [text() for _ in range(40)]
+    return cands, refs
+
+
+def one_pass(cands, refs):
+    acc = CorpusAccumulator(METRICS, tok=str.split)
+    acc.update(cands, refs)
+    return acc
+
+
+def assert_results_close(got, expected):
+    assert got.keys() == expected.keys()
+    for name in expected:
+        assert got[name] == pytest.approx(expected[name]), name
+
+
+def test_chunked_and_merged_equal_one_pass(corpus):
+    cands, refs = corpus
+    expected = one_pass(cands, refs).result()
+
+    chunked = CorpusAccumulator(METRICS, tok=str.split)
+    for start in range(0, len(cands), 7):
+        chunked.update(cands[start : start + 7], refs[start : start + 7], batch_size=3)
+    assert_results_close(chunked.result(), expected)
+
+    shards = [one_pass(cands[:13], refs[:13]), one_pass(cands[13:], refs[13:])]
+    merged = shards[0].merge(shards[1])
+    assert merged.pairs == len(cands)
+    assert_results_close(merged.result(), expected)
+
+
+def test_pairwise_updates_equal_batched(corpus):
+    cands, refs = corpus
+    acc = CorpusAccumulator(METRICS, tok=str.split)
+    for c, r in zip(cands, refs):
+        acc.update_pair(c, r)
+    assert_results_close(acc.result(), one_pass(cands, refs).result())
+
+
+def test_macro_equals_score_pairs_mean(corpus):
+    cands, refs = corpus
+    result = one_pass(cands, refs).result()
+    scores = score_pairs(cands, refs, tok=str.split, metrics=METRICS)
+    assert result["jaccard"]["macro"] == pytest.approx(scores["jaccard"].mean())
+    for name in ("token_f1", "rouge1", "rouge2", "rougeL"):
+        assert result[name]["macro_f1"] == pytest.approx(scores[name].mean()), name
+
+
+def test_merge_rejects_mismatches():
+    with pytest.raises(ValueError):
+        RougeNAccumulator(n=1).merge(RougeNAccumulator(n=2))
+    with pytest.raises(ValueError):
+        RougeNAccumulator(n=1).merge(JaccardAccumulator())
+    with pytest.raises(ValueError):
+        CorpusAccumulator(("rouge1",), tok=str.split).merge(
+            CorpusAccumulator(("rouge1", "rougeL"), tok=str.split)
+        )
@@ -0,0 +1,86 @@
+"""`overlap_scores` must equal the scalar metrics in main.py exactly."""
+
+import random
+
+import pytest
+
+from batch_overlap import overlap_scores
+from main import jaccard, rouge_n_tokens, token_f1
+
+EDGE = [
+    [],
+    ["a"],
+    ["a", "a"],
+    ["a", "b"],
+    ["b", "a", "b", "a"],
+    ["a", "a", "a", "b", "b"],
+    ["c", "d", "e"],
+]
+
+
+def random_texts(rng: random.Random, count: int, vocab: int, max_len: int) -> list[list[str]]:
+    words = [f"w{i}" for i in range(vocab)]
+    return [rng.choices(words, k=rng.randint(0, max_len)) for _ in range(count)]
+
+
+def scalar_scores(cands, refs, ns) -> dict[str, list[float]]:
+    refs = refs * len(cands) if len(refs) == 1 else refs
+    pairs = list(zip(cands, refs))
+    scores = {
+        "jaccard": [jaccard(c, r) for c, r in pairs],
+        "token_f1": [token_f1(c, r) for c, r in pairs],
+    }
+    for n in ns:
+        scores[f"rouge{n}"] = [rouge_n_tokens(c, r, n) for c, r in pairs]
+    return scores
+
+
+def assert_identical(cands, refs, ns):
+    batch = overlap_scores(cands, refs, ns)
+    expected = scalar_scores(cands, refs, ns)
+    assert set(batch) == set(expected)
+    for name, values in expected.items():
+        assert batch[name].tolist() == values, name
+
+
+@pytest.mark.parametrize("ref", EDGE)
+def test_edge_inputs_one_reference(ref):
+    assert_identical(EDGE, [ref], (1, 2, 3))
+
+
+def test_edge_inputs_many_to_many():
+    pairs = [(c, r) for c in EDGE for r in EDGE]
+    assert_identical([c for c, _ in pairs], [r for _, r in pairs], (1, 2, 3))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_one_reference(seed):
+    rng = random.Random(seed)
+    cands = random_texts(rng, 200, vocab=30, max_len=25)
+    ref = random_texts(rng, 1, vocab=30, max_len=25)
+    assert_identical(cands, ref, (1, 2, 4))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_many_to_many(seed):
+    rng = random.Random(seed)
+    cands = random_texts(rng, 200, vocab=12, max_len=15)
+    refs = random_texts(rng, 200, vocab=12, max_len=15)
+    assert_identical(cands, refs, (1, 2, 3))
+
+
+def test_single_pair_is_many_to_many():
+    assert_identical([["a", "b", "c"]], [["b", "c", "d"]], (1, 2))
+
+
+def test_wide_vocabulary_ngram_keys():
+    """vocab_size**n overflows int64 keys, so n-grams are indexed as rows."""
+    rng = random.Random(0)
+    cands = random_texts(rng, 300, vocab=8_000, max_len=40)
+    refs = [c[:20] + r for c, r in zip(cands, random_texts(rng, 300, vocab=8_000, max_len=20))]
+    assert_identical(cands, refs, (1, 6))
+
+
+def test_reference_count_mismatch():
+    with pytest.raises(ValueError):
+        overlap_scores([["a"], ["b"], ["c"]], [["a"], ["b"]])
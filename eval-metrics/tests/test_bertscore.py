@@ -0,0 +1,70 @@
+"""Batched greedy matching equals a plain max-cosine loop over each pair."""
+
+import numpy as np
+import pytest
+
+from bertscore import TokenMatrix, fit_idf, greedy_match
+from main import normalize_rows
+
+VOCAB = [f"t{i}" for i in range(12)]
+
+
+def token_matrix(rng, length: int) -> TokenMatrix:
+    tokens = list(rng.choice(VOCAB, size=length))
+    # Non-negative components keep every cosine (and so every mean) positive.
+    vectors = normalize_rows(np.abs(rng.normal(size=(length, 6)))).reshape(length, 6)
+    return TokenMatrix(tokens, vectors)
+
+
+def naive(c: TokenMatrix, r: TokenMatrix, idf=None) -> tuple[float, float]:
+    def weights(m):
+        return idf(m.tokens) if idf else np.ones(len(m.tokens))
+
+    sim = [[float(np.dot(u, v)) for v in r.vectors] for u in c.vectors]
+    best_c = [max(row) for row in sim]
+    best_r = [max(col) for col in zip(*sim)]
+    wc, wr = weights(c), weights(r)
+    return float(np.dot(best_c, wc) / wc.sum()), float(np.dot(best_r, wr) / wr.sum())
+
+
+@pytest.fixture
+def pairs():
+    rng = np.random.default_rng(0)
+    cands = [token_matrix(rng, n) for n in (1, 3, 5, 8, 2, 8, 4)]
+    refs = [token_matrix(rng, n) for n in (2, 3, 1, 8, 6, 4, 9)]
+    return cands, refs
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("batch_size", [1, 3, 64])
+def test_matches_naive_loop(pairs, weighted, batch_size):
+    cands, refs = pairs
+    idf = fit_idf(m.tokens for m in cands + refs) if weighted else None
+    out = greedy_match(cands, refs, idf=idf, batch_size=batch_size)
+    for i, (c, r) in enumerate(zip(cands, refs)):
+        p, rec = naive(c, r, idf)
+        assert out["precision"][i] == pytest.approx(p, abs=1e-5)
+        assert out["recall"][i] == pytest.approx(rec, abs=1e-5)
+        assert out["f1"][i] == pytest.approx(2 * p * rec / (p + rec), abs=1e-5)
+
+
+def test_single_reference_is_broadcast(pairs):
+    cands, refs = pairs
+    one = greedy_match(cands, refs[:1])
+    each = greedy_match(cands, refs[:1] * len(cands))
+    for name in ("precision", "recall", "f1"):
+        np.testing.assert_allclose(one[name], each[name])
+
+
+def test_empty_texts(pairs):
+    cands, refs = pairs
+    empty = TokenMatrix([], np.zeros((0, 6), dtype=np.float32))
+    out = greedy_match([empty, cands[0], empty], [refs[0], empty, empty])
+    np.testing.assert_array_equal(out["precision"], [0.0, 0.0, 1.0])
+    np.testing.assert_array_equal(out["recall"], [0.0, 0.0, 1.0])
+    np.testing.assert_array_equal(out["f1"], [0.0, 0.0, 1.0])
+
+
+def test_no_pairs():
+    out = greedy_match([], [])
+    assert all(len(column) == 0 for column in out.values())
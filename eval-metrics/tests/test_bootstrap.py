@@ -0,0 +1,57 @@
+"""Bootstrap resampling equals a slow per-resample reference with the same seed."""
+
+import numpy as np
+import pytest
+
+import bootstrap
+from bootstrap import bootstrap_ci, paired_bootstrap, resample_means
+
+
+def slow_means(values, n_resamples, seed):
+    """One resample at a time: draw n row indices and average those rows."""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    idx = np.random.default_rng(seed).integers(0, n, size=(n_resamples, n))
+    return np.array([values[rows].mean(axis=0) for rows in idx])
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(1).random((25, 3))
+
+
+@pytest.mark.parametrize("chunk_elements", [bootstrap.CHUNK_ELEMENTS, 100, 1])
+def test_matches_slow_reference(monkeypatch, values, chunk_elements):
+    """Chunked draws consume the generator like one (n_resamples, n) draw."""
+    monkeypatch.setattr(bootstrap, "CHUNK_ELEMENTS", chunk_elements)
+    np.testing.assert_allclose(
+        resample_means(values, 200, seed=3), slow_means(values, 200, 3)
+    )
+    np.testing.assert_allclose(
+        resample_means(values[:, 0], 200, seed=3), slow_means(values[:, 0], 200, 3)
+    )
+
+
+def test_ci_contains_point_estimate(values):
+    mean, low, high = bootstrap_ci(values, n_resamples=2000, seed=0)
+    np.testing.assert_allclose(mean, values.mean(axis=0))
+    assert (low < mean).all() and (mean < high).all()
+    expected = np.quantile(slow_means(values, 2000, 0), [0.025, 0.975], axis=0)
+    np.testing.assert_allclose([low, high], expected)
+    # Same seed, same interval.
+    np.testing.assert_array_equal(bootstrap_ci(values, n_resamples=2000, seed=0)[1], low)
+
+
+def test_paired_bootstrap(values):
+    a, b = values[:, 0], values[:, 0] + 0.5
+    result = paired_bootstrap(a, b, n_resamples=1000)
+    assert result["diff"] == pytest.approx(0.5)
+    assert result["p_value"] == 0.0
+    noise = np.where(np.arange(len(a)) % 2, 0.1, -0.1)
+    same = paired_bootstrap(a, a + noise, n_resamples=1000)
+    assert same["low"] < 0 < same["high"] and same["p_value"] > 0.05
+
+
+def test_empty_column_raises():
+    with pytest.raises(ValueError):
+        resample_means([])
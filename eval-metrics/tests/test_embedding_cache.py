@@ -0,0 +1,59 @@
+"""EmbeddingCache: hits and misses, model keys, LRU eviction, and the SQLite file."""
+
+import numpy as np
+
+import main
+from embedding_cache import EmbeddingCache, embedding_key
+
+
+def vec(*values):
+    return np.array(values, dtype=np.float32)
+
+
+def test_hit_and_miss():
+    cache = EmbeddingCache()
+    assert cache.get("a") is None
+    cache.put("a", [1.0, 2.0])
+    np.testing.assert_array_equal(cache.get("a"), vec(1, 2))
+    assert cache.get("a").dtype == np.float32
+    assert cache.get_many(["a", "b"]).keys() == {"a"}
+
+
+def test_model_change_misses(monkeypatch):
+    """Keys include the model name, so switching models never reuses vectors."""
+    assert embedding_key("t", "m1", False) != embedding_key("t", "m2", False)
+    assert embedding_key("t", "m1", False) != embedding_key("t", "m1", True)
+    cache = EmbeddingCache()
+    monkeypatch.setattr(main, "_model_name", "m1")
+    cache.put(embedding_key("hello", "m1", False), vec(1, 0))
+    assert main._cached_vectors(cache, ["hello"], False).keys() == {"hello"}
+    monkeypatch.setattr(main, "_model_name", "m2")
+    assert main._cached_vectors(cache, ["hello"], False) == {}
+
+
+def test_lru_eviction():
+    cache = EmbeddingCache(maxsize=2)
+    cache.put("a", vec(1))
+    cache.put("b", vec(2))
+    cache.get("a")  # a is now the most recently used
+    cache.put("c", vec(3))
+    assert len(cache) == 2
+    assert cache.get_many(["a", "b", "c"]).keys() == {"a", "c"}
+
+
+def test_persists_across_reopen(tmp_path):
+    path = tmp_path / "sub" / "vectors.sqlite"
+    cache = EmbeddingCache(path, maxsize=1)
+    cache.put_many({"a": vec(1, 2), "b": vec(3, 4)})
+    # Evicted from memory, still on disk.
+    assert len(cache) == 1
+    np.testing.assert_array_equal(cache.get("a"), vec(1, 2))
+    cache.close()
+
+    reopened = EmbeddingCache(path)
+    assert len(reopened) == 0
+    found = reopened.get_many(["a", "b", "missing"])
+    assert found.keys() == {"a", "b"}
+    np.testing.assert_array_equal(found["b"], vec(3, 4))
+    assert len(reopened) == 2
+    reopened.close()
@@ -0,0 +1,101 @@
+"""Parity of the regex tokenizer tier with spaCy's English tokenizer.
+
+spacy.blank("en") has the same tokenizer rules and stopword/punctuation
+flags as en_core_web_md, so these tests don't need the model download.
+"""
+
+import pytest
+
+from fast_tokenizer import (
+    Vocab,
+    fast_token_ids,
+    fast_tokenize,
+    fast_tokenize_no_stop,
+    stop_words,
+)
+from main import candidates, reference, rouge_l_tokens, rouge_n_tokens
+
+spacy = pytest.importorskip("spacy")
+
+PROSE = [
+    reference,
+    *candidates.values(),
+    "Don't worry, we can't lose; I'm sure it's the team's best quarter.",
+    "We won't ship until QA signs off, and they'd rather wait.",
+    "The U.S. market grew 20% MoM. Revenue hit $1,000 on day 3.14.",
+    "Our 10km route saves 1.5kg of CO2, roughly 50/50 split by region.",
+    "Café owners in Zürich prefer naïve pricing — “simple” beats ‘clever’.",
+    "It’s what we’ve built: a tool you’ll love, isn’t it?",
+    "Email founders@example.com or ping @support (we reply fast)!!!",
+    "Line one.\nLine two.\n\nLine four  with two spaces.",
+    "Revenue is $12K/month, up from 40k in a 10-day test.",
+    "Plan A. Plan B? Both failed... so we pivoted to SaaS.",
+    "Числа и слова: привет, мир. 東京は大きい。",
+    "Mr. Smith met Dr. Jones in Jan. and Feb., then Mrs.Smith at St. Louis Inc.",
+    "We cannot wait, we're gonna win and you gotta see it. Cannot! Gonna?",
+    "Standup is at 9 o'clock, demos at 5:30pm, 10am, 3 p.m., or 11:45.",
+]
+
+# Tokenizer exceptions the regex doesn't mirror; see the module docstring.
+KNOWN_DIVERGENCES = [
+    "Visit https://example.com/pricing today.",
+    "We love C++ and a&b testing.",
+    "im sure we dont need it",
+    "c'mon y'all, ma'am, we're doin' fine",
+    "Salaries run 40k-60k.",
+]
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    return spacy.blank("en")
+
+
+def spacy_no_stop(nlp, text: str) -> list[str]:
+    return [t.lower_ for t in nlp(text) if not t.is_stop and not t.is_punct]
+
+
+@pytest.mark.parametrize("text", PROSE)
+def test_no_stop_matches_spacy(nlp, text):
+    assert fast_tokenize_no_stop(text) == spacy_no_stop(nlp, text)
+
+
+@pytest.mark.parametrize("text", PROSE)
+def test_tokens_match_spacy(nlp, text):
+    expected = [t.lower_ for t in nlp(text) if not t.is_punct]
+    assert fast_tokenize(text) == expected
+
+
+@pytest.mark.parametrize("text", KNOWN_DIVERGENCES)
+def test_known_divergences(nlp, text):
+    """Documented differences; if spaCy or the regex changes, update the docstring."""
+    expected = [t.lower_ for t in nlp(text) if not t.is_punct]
+    assert fast_tokenize(text) != expected
+
+
+def test_stop_words_match_spacy():
+    from spacy.lang.en.stop_words import STOP_WORDS
+
+    assert stop_words() == frozenset(STOP_WORDS)
+
+
+def test_unicode_words_are_kept():
+    assert fast_tokenize("naïve café, Zürich") == ["naïve", "café", "zürich"]
+
+
+def test_vocab_ids_are_shared_and_reversible():
+    vocab = Vocab()
+    a = fast_token_ids("the Moon landing", no_stop=False, vocab=vocab)
+    b = fast_token_ids("landing on the Moon", no_stop=False, vocab=vocab)
+    assert a == [0, 1, 2]
+    assert b == [2, 3, 0, 1]
+    assert vocab.decode(b) == ["landing", "on", "the", "moon"]
+
+
+def test_ids_score_like_tokens():
+    vocab = Vocab()
+    for cand in candidates.values():
+        c_tok, r_tok = fast_tokenize(cand), fast_tokenize(reference)
+        c_ids, r_ids = vocab.encode(c_tok), vocab.encode(r_tok)
+        assert rouge_l_tokens(c_ids, r_ids) == rouge_l_tokens(c_tok, r_tok)
+        assert rouge_n_tokens(c_ids, r_ids, 2) == rouge_n_tokens(c_tok, r_tok, 2)
@@ -0,0 +1,67 @@
+"""Per-text features built once and reused give the same scores as the pairwise path."""
+
+import random
+
+import pytest
+
+from main import (
+    METRICS,
+    build_features,
+    jaccard,
+    jaccard_features,
+    plan_metrics,
+    rouge_n_features,
+    rouge_n_tokens,
+    score_features,
+    token_f1,
+    token_f1_features,
+)
+
+OVERLAP = ("jaccard", "token_f1", "rouge1", "rouge2")
+
+
+def _texts(seed: int, n: int = 60) -> list[str]:
+    rng = random.Random(seed)
+    words = "the a moon lunar crew earth land return safe goal".split()
+    return [" ".join(rng.choices(words, k=rng.randint(0, 12))) for _ in range(n)]
+
+
+@pytest.fixture(scope="module")
+def feats():
+    texts = [*_texts(0), "", "moon", "moon moon moon"]
+    _, needs, max_n = plan_metrics(OVERLAP)
+    return texts, build_features(texts, needs, max_n, tok=str.split)
+
+
+def test_ngrams_built_once_per_text(feats):
+    texts, by_text = feats
+    assert len(by_text) == len(set(texts))
+    for text, f in by_text.items():
+        assert set(f.ngrams) == {1, 2}
+        assert sum(f.ngrams[1].values()) == len(text.split())
+
+
+def test_feature_scores_match_pairwise(feats):
+    texts, by_text = feats
+    rng = random.Random(1)
+    for _ in range(500):
+        a, b = rng.choice(texts), rng.choice(texts)
+        c, r = by_text[a], by_text[b]
+        a_tok, b_tok = a.split(), b.split()
+        assert jaccard_features(c, r) == jaccard(a_tok, b_tok)
+        assert token_f1_features(c, r) == pytest.approx(token_f1(a_tok, b_tok), abs=1e-12)
+        for n in (1, 2):
+            assert rouge_n_features(c, r, n) == pytest.approx(
+                rouge_n_tokens(a_tok, b_tok, n), abs=1e-12
+            )
+
+
+def test_batched_matches_reused_features(feats):
+    texts, by_text = feats
+    cands = [by_text[t] for t in texts]
+    refs = [by_text[t] for t in reversed(texts)]
+    metrics = [METRICS[name] for name in OVERLAP]
+    columns = score_features(cands, refs, metrics)
+    for m in metrics:
+        expected = [m.pair(c, r) for c, r in zip(cands, refs)]
+        assert columns[m.name].tolist() == pytest.approx(expected, abs=1e-12)
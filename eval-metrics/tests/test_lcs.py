@@ -0,0 +1,61 @@
+"""`lcs_length` must equal the reference dynamic program on every path."""
+
+import random
+
+import pytest
+
+import lcs
+from lcs import lcs_length, lcs_length_dp
+
+# Around each 64-bit word boundary, where the packed masks and carries change.
+LENGTHS = [0, 1, 2, 63, 64, 65, 127, 128, 129, 191, 192, 193]
+
+
+def sequences(rng: random.Random, length: int, vocab: int) -> list[str]:
+    return [f"w{rng.randrange(vocab)}" for _ in range(length)]
+
+
+def pairs(seed: int):
+    rng = random.Random(seed)
+    for m in LENGTHS:
+        for n in (0, 1, 7, m, 70, 200):
+            for vocab in (2, 20):
+                yield sequences(rng, m, vocab), sequences(rng, n, vocab)
+
+
+@pytest.fixture(params=["bigint", "numba"])
+def path(request, monkeypatch):
+    """Force one implementation: the big-int loop, or numba for any length."""
+    if request.param == "numba":
+        pytest.importorskip("numba")
+        monkeypatch.setattr(lcs, "HAS_NUMBA", True)
+        monkeypatch.setattr(lcs, "NUMBA_MIN_TOKENS", 0)
+    else:
+        monkeypatch.setattr(lcs, "HAS_NUMBA", False)
+    return request.param
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_matches_dp(path, seed):
+    for a, b in pairs(seed):
+        assert lcs_length(a, b) == lcs_length_dp(a, b), (path, len(a), len(b))
+
+
+def test_identical_and_disjoint(path):
+    a = [f"w{i}" for i in range(130)]
+    assert lcs_length(a, a) == 130
+    assert lcs_length(a, [f"x{i}" for i in range(130)]) == 0
+    assert lcs_length(a, a[::-1]) == 1
+
+
+@pytest.mark.parametrize("has_numba", [False, True])
+def test_numba_switch(monkeypatch, has_numba):
+    """Either side of NUMBA_MIN_TOKENS, with numba present or absent."""
+    if has_numba:
+        pytest.importorskip("numba")
+    monkeypatch.setattr(lcs, "HAS_NUMBA", has_numba)
+    rng = random.Random(0)
+    b = sequences(rng, 40, 8)
+    for m in (lcs.NUMBA_MIN_TOKENS - 1, lcs.NUMBA_MIN_TOKENS, lcs.NUMBA_MIN_TOKENS + 1):
+        a = sequences(rng, m, 8)
+        assert lcs_length(a, b) == lcs_length(b, a) == lcs_length_dp(a, b)
@@ -0,0 +1,57 @@
+"""Near-duplicate clusters only copy scores between rows similar to their representative."""
+
+import random
+
+import numpy as np
+
+import minhash
+from minhash import MinHasher, cluster_pairs, estimated_jaccard, score_deduped
+
+WORDS = [f"w{i}" for i in range(40)]
+
+
+def test_chain_is_not_merged_transitively():
+    """A~B and B~C, but A and C are dissimilar: C must not copy A's scores."""
+    a, b, c = (" ".join(WORDS[i : i + 10]) for i in (0, 3, 6))
+    sig = MinHasher(256, shingle=1).signatures([s.split() for s in (a, b, c)])
+    assert estimated_jaccard(sig[0], sig[1]) >= 0.4
+    assert estimated_jaccard(sig[1], sig[2]) >= 0.4
+    assert estimated_jaccard(sig[0], sig[2]) < 0.4
+
+    clusters = cluster_pairs([a, b, c], ["ref"], 0.4, 256, 64, shingle=1, tok=str.split)
+    assert clusters.representative.tolist() == [0, 0, 2]
+    assert clusters.exact.tolist() == [True, False, True]
+
+
+def test_members_are_similar_to_their_representative():
+    rng = random.Random(0)
+    bases = [rng.choices(WORDS, k=20) for _ in range(30)]
+    texts = []
+    for _ in range(600):
+        tokens = list(rng.choice(bases))
+        for _ in range(rng.randint(0, 6)):
+            tokens[rng.randrange(len(tokens))] = rng.choice(WORDS)
+        texts.append(" ".join(tokens))
+    threshold = 0.6
+    clusters = cluster_pairs(texts, ["ref"], threshold, 128, 32, shingle=1, tok=str.split)
+    sigs = MinHasher(128, shingle=1).signatures([t.split() for t in texts])
+    rep = clusters.representative
+    assert (rep <= np.arange(len(texts))).all()
+    assert (rep[rep] == rep).all()  # representatives represent themselves
+    assert (estimated_jaccard(sigs, sigs[rep]) >= threshold).all()
+    assert clusters.n_clusters < len(texts)
+
+
+def test_score_deduped_copies_only_within_clusters(monkeypatch):
+    a, b, c = (" ".join(WORDS[i : i + 10]) for i in (0, 3, 6))
+    clusters = cluster_pairs([a, b, c], ["ref"], 0.4, 256, 64, shingle=1, tok=str.split)
+    calls = []
+
+    def fake_score_pairs(cands, refs, metrics, **kwargs):
+        calls.append(cands)
+        return {"n": np.arange(len(cands), dtype=float)}
+
+    monkeypatch.setattr(minhash, "score_pairs", fake_score_pairs)
+    columns = score_deduped([a, b, c], ["ref"], metrics=("n",), clusters=clusters)
+    assert calls == [[a, c]]
+    assert columns["n"].tolist() == [0.0, 0.0, 1.0]
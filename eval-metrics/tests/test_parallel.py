@@ -0,0 +1,28 @@
+"""Sharded scoring: in-process path and model selection."""
+
+import numpy as np
+
+import main
+import parallel
+
+
+def test_in_process_scoring_keeps_loaded_pipeline(monkeypatch):
+    """workers=1 re-selects the current model, which must not drop the pipeline."""
+    loaded = object()
+    monkeypatch.setattr(main, "_nlp", loaded)
+    cands, refs = ["a cat sat", "dogs run"], ["the cat sat", "dogs ran"]
+    out = parallel.score_parallel(
+        cands, refs, tok=str.split, workers=1, metrics=("token_f1",)
+    )
+    assert main._nlp is loaded
+    direct = main.score_pairs(cands, refs, tok=str.split, metrics=("token_f1",))
+    np.testing.assert_allclose(out["token_f1"], direct["token_f1"])
+
+
+def test_set_model_switch_drops_pipeline(monkeypatch):
+    monkeypatch.setattr(main, "_nlp", object())
+    monkeypatch.setattr(main, "_model_name", "en_core_web_md")
+    main.set_model("en_core_web_md")
+    assert main._nlp is not None
+    main.set_model("en_core_web_lg")
+    assert main._nlp is None and main.get_model_name() == "en_core_web_lg"
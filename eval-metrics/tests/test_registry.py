@@ -0,0 +1,46 @@
+"""Feature planning: each metric declares the features and n-gram orders it reads."""
+
+import pytest
+
+from main import plan_metrics, score_pairs
+
+
+@pytest.mark.parametrize(
+    "metrics, max_n",
+    [
+        (("jaccard",), 1),
+        (("token_f1",), 1),
+        (("rouge1",), 1),
+        (("rouge2",), 2),
+        (("jaccard", "rouge2"), 2),
+        (("rougeL",), 0),
+        (("semantic",), 0),
+    ],
+)
+def test_plan_max_n(metrics, max_n):
+    assert plan_metrics(metrics)[2] == max_n
+
+
+def test_overlap_metrics_need_ngrams():
+    _, needs, _ = plan_metrics(("jaccard", "token_f1", "rouge1", "rouge2"))
+    assert needs == {"tokens", "ngrams"}
+
+
+def test_overlap_batch_builds_only_requested_orders(monkeypatch):
+    import batch_overlap
+
+    seen = []
+    real = batch_overlap.count_matrix
+
+    def count_matrix(ids, rows, n_rows, vocab_size, n):
+        seen.append(n)
+        return real(ids, rows, n_rows, vocab_size, n)
+
+    monkeypatch.setattr(batch_overlap, "count_matrix", count_matrix)
+    cands, refs = ["a b c d", "b c"], ["a b c", "c d"]
+    score_pairs(cands, refs, tok=str.split, metrics=("jaccard",))
+    assert set(seen) == {1}
+    seen.clear()
+    columns = score_pairs(cands, refs, tok=str.split, metrics=("jaccard", "rouge2"))
+    assert set(seen) == {1, 2}
+    assert set(columns) == {"jaccard", "rouge2"}
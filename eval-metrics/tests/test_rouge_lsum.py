@@ -0,0 +1,68 @@
+"""Summary-level ROUGE-L: sentence splitting, lcs_indices, and the union LCS."""
+
+import pytest
+
+from lcs import lcs_indices, lcs_length_dp
+from main import rouge_l_tokens, rouge_lsum, rouge_lsum_tokens, split_sentences
+
+# Lin (2004), section 3.2: r = w1..w5 against a two-sentence candidate.
+R = ["w1", "w2", "w3", "w4", "w5"]
+C1 = ["w1", "w2", "w6", "w7", "w8"]
+C2 = ["w1", "w3", "w8", "w9", "w5"]
+
+
+def test_lcs_indices_lin_example():
+    assert lcs_indices(R, C1) == [0, 1]
+    assert lcs_indices(R, C2) == [0, 2, 4]
+
+
+def test_lcs_indices_is_a_common_subsequence():
+    a, b = "a b c b d a b".split(), "b d c a b a".split()
+    idx = lcs_indices(a, b)
+    assert idx == sorted(idx) and len(idx) == lcs_length_dp(a, b)
+    it = iter(b)
+    assert all(a[i] in it for i in idx)
+
+
+def test_lcs_indices_empty():
+    assert lcs_indices([], R) == lcs_indices(R, []) == []
+
+
+def test_union_lcs_lin_example():
+    # Union LCS is w1 w2 w3 w5: recall 4/5, precision 4/10.
+    p, r = 4 / 10, 4 / 5
+    assert rouge_lsum_tokens([C1, C2], [R]) == pytest.approx(2 * p * r / (p + r))
+
+
+def test_union_counts_each_token_once():
+    """A reference token matched in two candidate sentences is one hit."""
+    assert rouge_lsum_tokens([["a", "b"], ["a", "b"]], [["a", "b"]]) == pytest.approx(2 / 3)
+
+
+def test_empty_sides():
+    assert rouge_lsum("", "", tok=str.split) == 1.0
+    assert rouge_lsum("", "a b.", tok=str.split) == 0.0
+    assert rouge_lsum("a b.", "", tok=str.split) == 0.0
+    assert rouge_lsum_tokens([[]], [[], []]) == 1.0
+
+
+def test_one_sentence_equals_rouge_l():
+    c, r = "the cat sat on the mat", "a cat was on the mat"
+    assert rouge_lsum(c, r, tok=str.split) == pytest.approx(
+        rouge_l_tokens(c.split(), r.split())
+    )
+
+
+@pytest.mark.parametrize(
+    "text, sents",
+    [
+        ("One. Two! Three? Four", ["One.", "Two!", "Three?", "Four"]),
+        ("a\n\nb", ["a", "b"]),
+        ("The U.S. is large. So is Canada.", ["The U.S. is large.", "So is Canada."]),
+        ("Ask Dr. Lee, e.g. today. Then go.", ["Ask Dr. Lee, e.g. today.", "Then go."]),
+        ("Born in the U.S.\nMoved away.", ["Born in the U.S.", "Moved away."]),
+        ("", []),
+    ],
+)
+def test_split_sentences(text, sents):
+    assert split_sentences(text) == sents
@@ -0,0 +1,76 @@
+"""Batched cosine similarity: similarity_matrix, chunking, out=, and top_k."""
+
+import numpy as np
+import pytest
+
+from main import cosine_similarity, similarity_matrix, top_k
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    cands = rng.normal(size=(7, 5)).astype(np.float32)
+    refs = rng.normal(size=(4, 5)).astype(np.float32)
+    refs[2] = 0.0  # a zero vector scores 0.0 against everything
+    return cands, refs
+
+
+def naive(cands, refs):
+    return np.array([[cosine_similarity(c, r) for r in refs] for c in cands])
+
+
+def test_matches_naive_cosine(vectors):
+    cands, refs = vectors
+    np.testing.assert_allclose(similarity_matrix(cands, refs), naive(cands, refs), atol=1e-6)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 100])
+def test_chunked_matches_unchunked(vectors, chunk_size):
+    cands, refs = vectors
+    np.testing.assert_allclose(
+        similarity_matrix(cands, refs, chunk_size=chunk_size),
+        similarity_matrix(cands, refs),
+        atol=1e-6,
+    )
+
+
+def test_writes_into_out(vectors, tmp_path):
+    cands, refs = vectors
+    out = np.lib.format.open_memmap(
+        tmp_path / "sims.npy", mode="w+", dtype=np.float32, shape=(len(cands), len(refs))
+    )
+    result = similarity_matrix(cands, refs, chunk_size=2, out=out)
+    assert result is out
+    np.testing.assert_allclose(np.load(tmp_path / "sims.npy"), naive(cands, refs), atol=1e-6)
+
+
+@pytest.mark.parametrize("chunk_size", [2, 100])
+def test_top_k_matches_sorted_matrix(vectors, chunk_size):
+    cands, refs = vectors
+    full = naive(cands, refs)
+    indices, scores = top_k(cands, refs, k=2, chunk_size=chunk_size)
+    expected = np.argsort(-full, axis=1, kind="stable")[:, :2]
+    np.testing.assert_array_equal(indices, expected)
+    np.testing.assert_allclose(scores, np.take_along_axis(full, expected, axis=1), atol=1e-6)
+
+
+def test_top_k_caps_k_at_reference_count(vectors):
+    cands, refs = vectors
+    indices, scores = top_k(cands, refs, k=10)
+    assert indices.shape == scores.shape == (len(cands), len(refs))
+
+
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_empty_inputs(vectors, chunk_size):
+    cands, refs = vectors
+    assert similarity_matrix(cands, [], chunk_size=chunk_size).shape == (7, 0)
+    assert similarity_matrix([], refs, chunk_size=chunk_size).shape == (0, 4)
+    assert similarity_matrix([], [], chunk_size=chunk_size).shape == (0, 0)
+
+
+def test_top_k_empty_inputs(vectors):
+    cands, refs = vectors
+    indices, scores = top_k(cands, [], k=2)
+    assert indices.shape == scores.shape == (7, 0)
+    indices, scores = top_k([], refs, k=2)
+    assert indices.shape == scores.shape == (0, 2)
@@ -0,0 +1,57 @@
+"""Chunked reading and writing of scored eval logs."""
+
+import json
+
+import numpy as np
+import pytest
+
+from streaming import ScoreWriter, read_records
+
+pa = pytest.importorskip("pyarrow")
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+
+
+def read_ids(path, chunk_size):
+    return [i for records in read_records(path, chunk_size) for i in records.ids]
+
+
+def test_missing_ids_are_row_numbers(tmp_path):
+    """Ids present in some chunks and not others: fill-ins are file row numbers."""
+    path = tmp_path / "log.jsonl"
+    rows = [{"candidate": f"c{i}", "reference": "r"} for i in range(7)]
+    for i in (2, 3, 5):
+        rows[i]["id"] = f"x{i}"
+    write_jsonl(path, rows)
+    # Chunks of 2: [0 1] has no id column, [2 3] has ids, [4 5] has one, [6] none.
+    assert read_ids(path, 2) == [0, 1, "x2", "x3", 4, "x5", 6]
+
+
+def test_csv_empty_ids_are_row_numbers(tmp_path):
+    path = tmp_path / "log.csv"
+    path.write_text("id,candidate,reference\na,c,r\n,c,r\nb,c,r\n", encoding="utf-8")
+    assert read_ids(path, 2) == ["a", 1, "b"]
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".csv"])
+def test_writer_accepts_mixed_id_types(tmp_path, suffix):
+    path = tmp_path / f"scores{suffix}"
+    with ScoreWriter(path) as writer:
+        writer.write([0, 1], {"rouge1": np.array([0.5, 1.0])})
+        writer.write(["x2", None], {"rouge1": np.array([0.25, 0.0])})
+        writer.write([4], {"rouge1": np.array([1], dtype=np.int64)})
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+    else:
+        import pyarrow.csv as pcsv
+
+        table = pcsv.read_csv(
+            path, convert_options=pcsv.ConvertOptions(column_types={"id": pa.string()})
+        )
+    ids = [i or None for i in table.column("id").to_pylist()]  # CSV writes null as ""
+    assert ids == ["0", "1", "x2", None, "4"]
+    assert table.column("rouge1").to_pylist() == [0.5, 1.0, 0.25, 0.0, 1.0]
@@ -0,0 +1,77 @@
+"""Scoring with a `VectorStore` reads its vectors and never loads spaCy."""
+
+import json
+
+import numpy as np
+import pytest
+
+import main
+import parallel
+from bertscore import store_token_matrix
+from vector_store import VectorStore, hash_token
+
+WORDS = ["the", "rocket", "launched", "moon", "landing", "crew", "orbit", "."]
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    """A tiny exported store, written by hand so no spaCy model is needed."""
+    rng = np.random.default_rng(0)
+    hashes = np.array([hash_token(w) for w in WORDS], dtype=np.uint64)
+    order = np.argsort(hashes)
+    np.save(tmp_path / "vectors.npy", rng.normal(size=(len(WORDS), 8)).astype(np.float16))
+    np.save(tmp_path / "keys.npy", hashes[order])
+    np.save(tmp_path / "rows.npy", np.arange(len(WORDS), dtype=np.int32)[order])
+    meta = {"model": "test", "dtype": "float16", "dim": 8, "stop_words": ["the"]}
+    (tmp_path / "meta.json").write_text(json.dumps(meta))
+    return tmp_path
+
+
+@pytest.fixture
+def no_spacy(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("spaCy was loaded")
+
+    monkeypatch.setattr(main, "get_nlp", fail)
+
+
+CANDS = ["the rocket launched", "crew in orbit .", "unknown words only", ""]
+REFS = ["the moon landing", "the crew launched", "the rocket", "the orbit"]
+
+
+def test_score_pairs_reads_store_vectors(store_dir, no_spacy):
+    store = VectorStore(store_dir)
+    columns = main.score_pairs(
+        CANDS, REFS, metrics=("semantic", "rouge1"), content_only=True, store=store
+    )
+    c = store.text_vectors(CANDS, content_only=True)
+    r = store.text_vectors(REFS, content_only=True)
+    expected = [main.cosine_similarity(u, v) for u, v in zip(c, r)]
+    np.testing.assert_allclose(columns["semantic"], expected, rtol=1e-6)
+    assert columns["semantic"][2] == 0.0  # no known tokens -> zero vector
+
+
+def test_bertscore_reads_store_token_vectors(store_dir, no_spacy):
+    store = VectorStore(store_dir)
+    feats = main.build_features(CANDS, frozenset({"token_vectors"}), store=store)
+    for text in CANDS:
+        expected = store_token_matrix(store, text)
+        np.testing.assert_array_equal(feats[text].token_vectors.vectors, expected.vectors)
+
+
+def test_needs_spacy_with_store(store_dir):
+    store = VectorStore(store_dir)
+    assert main.needs_spacy(("semantic",))
+    assert not main.needs_spacy(("semantic", "bertscore_f1"), store=store)
+    assert main.needs_spacy(("semantic", "rouge1"), main.tokenize_no_stop, store)
+
+
+def test_score_shards_passes_store_path(store_dir, no_spacy):
+    shards = [(CANDS[:2], REFS[:2]), (CANDS[2:], REFS[2:])]
+    chunks = list(
+        parallel.score_shards(shards, metrics=("semantic",), workers=1, vector_store=store_dir)
+    )
+    direct = main.score_pairs(CANDS, REFS, metrics=("semantic",), store=VectorStore(store_dir))
+    np.testing.assert_array_equal(
+        np.concatenate([c["semantic"] for c in chunks]), direct["semantic"]
+    )
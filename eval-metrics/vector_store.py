@@ -0,0 +1,149 @@
+"""Memory-mapped static word vectors, so semantic similarity runs without spaCy.
+
+`export_vectors` dumps a spaCy model's vector table to a directory:
+
+    vectors.npy   (n_rows, dim) float16/float32 matrix
+    keys.npy      sorted uint64 hashes of every token string with a vector
+    rows.npy      int32 row in vectors.npy for each key
+    meta.json     model name, dtype, dim, and the stopword list
+
+`VectorStore` opens it with np.load(mmap_mode="r"): every worker process maps
+the same files, so the OS page cache holds one shared copy instead of one
+spaCy model per process. Lookups hash the tokens, binary-search the sorted
+keys, and average each text's vectors from one fancy-index gather.
+
+Tokens come from a regex approximation of spaCy's English tokenizer (words,
+dotted abbreviations, clitics like 's, and punctuation marks), so averages can
+differ slightly from `main.text_vector` on contractions and other exceptions.
+
+    uv run python vector_store.py export vectors/ --dtype float16
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"(?:[^\W\d_]\.){2,}|\w+|'\w+|[^\w\s]")
+
+
+def hash_token(token: str) -> int:
+    """Stable 64-bit hash of a token string (same across processes and runs)."""
+    return int.from_bytes(
+        hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def tokenize_for_vectors(text: str) -> list[str]:
+    """Case-preserving tokens, split like spaCy splits words and punctuation."""
+    return _TOKEN_RE.findall(text)
+
+
+def is_punct(token: str) -> bool:
+    """spaCy's lexical is_punct: every character is Unicode punctuation."""
+    return all(unicodedata.category(ch).startswith("P") for ch in token)
+
+
+def export_vectors(out_dir: str | Path, model: str | None = None, dtype: str = "float16") -> Path:
+    """Write a model's vectors, hash index, and stopwords to out_dir."""
+    import main
+
+    if model is not None:
+        main.set_model(model)
+    nlp = main.get_nlp()
+    vectors, strings = nlp.vocab.vectors, nlp.vocab.strings
+
+    hashes, rows = [], []
+    for key, row in vectors.key2row.items():
+        if key in strings:
+            hashes.append(hash_token(strings[key]))
+            rows.append(row)
+    hashes = np.array(hashes, dtype=np.uint64)
+    order = np.argsort(hashes)
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    np.save(out / "vectors.npy", np.asarray(vectors.data).astype(dtype))
+    np.save(out / "keys.npy", hashes[order])
+    np.save(out / "rows.npy", np.array(rows, dtype=np.int32)[order])
+    meta = {
+        "model": main.get_model_name(),
+        "dtype": dtype,
+        "dim": int(vectors.shape[1]),
+        "stop_words": sorted(nlp.Defaults.stop_words),
+    }
+    (out / "meta.json").write_text(json.dumps(meta))
+    return out
+
+
+class VectorStore:
+    """Read-only, memory-mapped view of an exported vector table."""
+
+    def __init__(self, path: str | Path):
+        path = Path(path)
+        self.vectors = np.load(path / "vectors.npy", mmap_mode="r")
+        self.keys = np.load(path / "keys.npy", mmap_mode="r")
+        self.rows = np.load(path / "rows.npy", mmap_mode="r")
+        meta = json.loads((path / "meta.json").read_text())
+        self.model = meta["model"]
+        self.dim = meta["dim"]
+        self.stop_words = frozenset(meta["stop_words"])
+
+    def _is_content(self, token: str) -> bool:
+        return token.lower() not in self.stop_words and not is_punct(token)
+
+    def token_rows(self, tokens: list[str]) -> np.ndarray:
+        """Vector row per token, or -1 where the token has no vector."""
+        if not tokens:
+            return np.empty(0, dtype=np.int64)
+        hashes = np.fromiter(map(hash_token, tokens), dtype=np.uint64, count=len(tokens))
+        pos = np.searchsorted(self.keys, hashes)
+        pos[pos == len(self.keys)] = 0
+        found = self.keys[pos] == hashes
+        return np.where(found, self.rows[pos], -1)
+
+    def tokens(self, text: str, content_only: bool = False) -> list[str]:
+        """Tokens used for lookups; content_only drops stopwords and punctuation."""
+        tokens = tokenize_for_vectors(text)
+        if content_only:
+            tokens = [t for t in tokens if self._is_content(t)]
+        return tokens
+
+    def text_vector(self, text: str, content_only: bool = False) -> np.ndarray:
+        """Average word vector, like `main.text_vector`, as float32."""
+        return self.text_vectors([text], content_only)[0]
+
+    def text_vectors(self, texts: list[str], content_only: bool = False) -> np.ndarray:
+        """(len(texts), dim) float32 matrix of average vectors.
+
+        Rows for every token of every text are gathered in one fancy index and
+        averaged per text with np.add.reduceat; texts with no known tokens get
+        a zero vector.
+        """
+        token_rows = [self.token_rows(self.tokens(t, content_only)) for t in texts]
+        token_rows = [r[r >= 0] for r in token_rows]
+        counts = np.array([len(r) for r in token_rows], dtype=np.int64)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if not counts.sum():
+            return out
+        gathered = self.vectors[np.concatenate(token_rows)].astype(np.float32)
+        has = counts > 0
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[has]
+        out[has] = np.add.reduceat(gathered, starts, axis=0) / counts[has, None]
+        return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export spaCy vectors for VectorStore.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="dump a model's vectors to a directory")
+    export.add_argument("out_dir", type=Path)
+    export.add_argument("--model", default=None, help="spaCy model (default: main's)")
+    export.add_argument("--dtype", choices=["float16", "float32"], default="float16")
+    args = parser.parse_args()
+    path = export_vectors(args.out_dir, args.model, args.dtype)
+    print(f"wrote {path}")
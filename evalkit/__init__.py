@@ -0,0 +1,56 @@
+"""Shared LLM eval framework for the chatbots in this repo.
+
+The A/B runner lives in `evalkit.ab` (run it with `python -m evalkit.ab`).
+"""
+
+from .cache import ResponseCache, cache_key
+from .datasets import Dataset, load_dataset
+from .engine import Bot, CallStats, CaseResult, EvalEngine, Usage, report
+from .gate import GATE_METRICS, JudgeGate, evaluate_gate, fit_gate, metric_features
+from .judge import (
+    JUDGE_MODEL,
+    JUDGE_SYSTEM_GOLDEN,
+    JUDGE_SYSTEM_PAIRWISE,
+    JUDGE_SYSTEM_RUBRIC,
+    JUDGE_SYSTEM_RUBRIC_BATCH,
+    golden_messages,
+    pairwise_messages,
+    parse_rating,
+    parse_ratings,
+    parse_winner,
+    rubric_batch_messages,
+    rubric_messages,
+)
+from .stats import bootstrap_ci, paired_bootstrap
+
+__all__ = [
+    "Bot",
+    "CallStats",
+    "CaseResult",
+    "Dataset",
+    "EvalEngine",
+    "GATE_METRICS",
+    "JUDGE_MODEL",
+    "JUDGE_SYSTEM_GOLDEN",
+    "JUDGE_SYSTEM_PAIRWISE",
+    "JUDGE_SYSTEM_RUBRIC",
+    "JUDGE_SYSTEM_RUBRIC_BATCH",
+    "JudgeGate",
+    "ResponseCache",
+    "Usage",
+    "bootstrap_ci",
+    "cache_key",
+    "evaluate_gate",
+    "fit_gate",
+    "golden_messages",
+    "load_dataset",
+    "metric_features",
+    "paired_bootstrap",
+    "pairwise_messages",
+    "parse_rating",
+    "parse_ratings",
+    "parse_winner",
+    "report",
+    "rubric_batch_messages",
+    "rubric_messages",
+]
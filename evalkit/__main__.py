@@ -0,0 +1,90 @@
+"""Run eval datasets against any app module from the command line.
+
+    python -m evalkit path/to/app.py path/to/golden.yaml [more datasets ...]
+
+Fit a metric gate from judged golden cases, then run with it:
+
+    python -m evalkit app.py golden.yaml --history history.jsonl --calibrate gate.json
+    python -m evalkit app.py golden.yaml --gate gate.json
+"""
+
+import argparse
+import importlib.util
+import sys
+from pathlib import Path
+
+from .datasets import load_dataset
+from .engine import Bot, EvalEngine, report
+from .gate import GATE_METRICS, JudgeGate, evaluate_gate, fit_gate, read_history
+from .judge import JUDGE_MODEL
+
+
+def load_app(path: Path):
+    """Import an app.py by path so its sibling imports still resolve."""
+    sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="evalkit", description=__doc__)
+    parser.add_argument("app", type=Path, help="app module exposing MODEL and build_initial_messages")
+    parser.add_argument("datasets", type=Path, nargs="+", help="YAML/JSONL dataset files")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--cache", type=Path, default=None, help="SQLite response cache path")
+    parser.add_argument("--judge-model", default=JUDGE_MODEL)
+    parser.add_argument("--gate", type=Path, default=None, help="skip the judge with this metric gate")
+    parser.add_argument("--history", type=Path, default=None, help="append judged golden cases here (JSONL)")
+    parser.add_argument("--calibrate", type=Path, default=None, help="fit a gate on --history, write it here")
+    parser.add_argument("--gate-metrics", nargs="+", default=list(GATE_METRICS))
+    parser.add_argument("--judge-batch", type=int, default=None, help="rubric cases per judge call")
+    parser.add_argument("--judge-batch-tokens", type=int, default=8_000, help="prompt budget per batch")
+    args = parser.parse_args()
+    if args.calibrate and not args.history:
+        parser.error("--calibrate needs --history")
+
+    engine = EvalEngine(
+        Bot.from_module(load_app(args.app.resolve())),
+        judge_model=args.judge_model,
+        max_workers=args.workers,
+        cache_path=args.cache,
+        gate=JudgeGate.load(args.gate) if args.gate else None,
+        history_path=args.history,
+        gate_metrics=args.gate_metrics,
+        judge_batch=args.judge_batch,
+        judge_batch_tokens=args.judge_batch_tokens,
+    )
+    failed = 0
+    thresholds = []
+    for path in args.datasets:
+        dataset = load_dataset(path)
+        results = engine.run(dataset)
+        print(f"{dataset.name} ({dataset.kind})")
+        print("\n".join(report(dataset, results)))
+        failed += sum(not r.passed for r in results)
+        if dataset.kind == "golden":
+            thresholds.append(dataset.threshold)
+    print(f"usage: {engine.usage}")
+    if args.calibrate:
+        calibrate(args.history, args.calibrate, args.gate_metrics, min(thresholds or [6]))
+    return 1 if failed else 0
+
+
+def calibrate(history_path: Path, out: Path, metrics: list[str], threshold: int) -> None:
+    """Fit a gate on the judged history, save it, and print its LOO savings."""
+    history = read_history(history_path)
+    gate = fit_gate(history, metrics)
+    gate.save(out)
+    stats = evaluate_gate(history, threshold, metrics)
+    print(
+        f"gate: {out} from {stats['cases']} judged cases, margin {gate.margin:.2f}; "
+        f"leave-one-out at threshold {threshold}: skips {stats['savings']:.0%} of judge "
+        f"calls, pass/fail agrees on {stats['agreement']:.0%} of skipped cases "
+        f"({stats['overall_agreement']:.0%} overall)"
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Pairwise A/B comparison of two bot configurations over eval cases.
+
+Both arms generate concurrently through one engine, so its response cache
+is shared: with a `--cache` file, an arm whose model and prompt haven't
+changed since an earlier run is served from the cache and only the changed
+arm calls the LLM. Each case is then judged twice, with the responses in
+both orders, and the two verdicts are averaged so the judge's position bias
+cancels out.
+
+    python -m evalkit.ab Q7A-chatbot/app.py Q7A-chatbot/evals/datasets/golden.yaml \
+        --b-system-prompt new_prompt.txt --cache .cache/pitchscan.sqlite
+    python -m evalkit.ab app.py golden.yaml rubric.yaml --b-model vertex_ai/gemini-2.0-flash
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from .datasets import load_dataset
+from .engine import Bot, CallStats, EvalEngine
+from .judge import JUDGE_MODEL, pairwise_messages, parse_winner
+from .stats import bootstrap_ci, paired_bootstrap
+
+# B's score for a verdict, by which position B held.
+_B_SCORE = {
+    "b_second": {"1": 0.0, "2": 1.0, "tie": 0.5},
+    "b_first": {"1": 1.0, "2": 0.0, "tie": 0.5},
+}
+
+
+_VERDICTS = {
+    1.0: "B",
+    0.75: "B (one order tied)",
+    0.5: "tie",
+    0.25: "A (one order tied)",
+    0.0: "A",
+}
+
+
+@dataclass
+class PairResult:
+    name: str
+    input: str
+    response_a: str
+    response_b: str
+    score: float  # B's result: 1 win, 0.5 tie, 0 loss (both orders averaged)
+    consistent: bool  # both orders gave the same verdict
+    stats_a: CallStats
+    stats_b: CallStats
+
+
+def run_ab(
+    engine: EvalEngine, bot_a: Bot, bot_b: Bot, cases: list[dict]
+) -> list[PairResult]:
+    """Generate both arms concurrently, then judge each case in both orders.
+
+    Cases with a "reference" pass it to the judge. Identical responses are a
+    tie without a judge call.
+    """
+    jobs = [(bot, case["input"]) for case in cases for bot in (bot_a, bot_b)]
+    generated = engine.map(lambda job: engine.generate(job[1], job[0]), jobs)
+    arms = list(zip(generated[::2], generated[1::2]))
+
+    judge_jobs = []
+    for i, (case, ((a, _), (b, _))) in enumerate(zip(cases, arms)):
+        if a != b:
+            prompt, reference = case["input"], case.get("reference")
+            judge_jobs.append((i, "b_second", pairwise_messages(prompt, a, b, reference)))
+            judge_jobs.append((i, "b_first", pairwise_messages(prompt, b, a, reference)))
+    verdicts = engine.map(
+        lambda job: engine.complete(engine.judge_model, job[2], parse_winner), judge_jobs
+    )
+    scores: dict[int, list[float]] = {}
+    for (i, order, _), verdict in zip(judge_jobs, verdicts):
+        scores.setdefault(i, []).append(_B_SCORE[order][verdict])
+
+    results = []
+    for i, (case, ((a, stats_a), (b, stats_b))) in enumerate(zip(cases, arms)):
+        pair = scores.get(i, [0.5, 0.5])
+        results.append(
+            PairResult(
+                case["name"],
+                case["input"],
+                a,
+                b,
+                sum(pair) / 2,
+                pair[0] == pair[1],
+                stats_a,
+                stats_b,
+            )
+        )
+    return results
+
+
+def ab_report(results: list[PairResult]) -> list[str]:
+    """Per-case verdicts plus B's win rate, order consistency, and cost deltas."""
+    lines = [f"  {r.name}: {_VERDICTS[r.score]}" for r in results]
+    if not results:
+        return lines
+    n = len(results)
+    wins = sum(r.score > 0.5 for r in results)
+    losses = sum(r.score < 0.5 for r in results)
+    rate, low, high = bootstrap_ci([r.score for r in results])
+    lines.append(f"  B wins {wins}, ties {n - wins - losses}, A wins {losses} of {n}")
+    lines.append(f"  B win rate: {rate:.2f} (95% CI {low:.2f}-{high:.2f}; 0.5 = even)")
+    consistent = sum(r.consistent for r in results)
+    lines.append(f"  judge agreed with itself across orders on {consistent}/{n} cases")
+    for label, field in (
+        ("latency", "latency"),
+        ("prompt tokens", "prompt_tokens"),
+        ("completion tokens", "completion_tokens"),
+    ):
+        a = [getattr(r.stats_a, field) for r in results]
+        b = [getattr(r.stats_b, field) for r in results]
+        delta = paired_bootstrap(a, b)
+        unit = " s" if field == "latency" else ""
+        lines.append(
+            f"  {label} B - A: {delta['diff']:+.2f}{unit} per case "
+            f"(95% CI {delta['low']:+.2f} to {delta['high']:+.2f}; "
+            f"A averages {sum(a) / n:.2f}{unit})"
+        )
+    cached_a = sum(r.stats_a.cached for r in results)
+    cached_b = sum(r.stats_b.cached for r in results)
+    lines.append(f"  responses from cache: A {cached_a}/{n}, B {cached_b}/{n}")
+    return lines
+
+
+def main() -> int:
+    from .__main__ import load_app
+
+    parser = argparse.ArgumentParser(prog="evalkit.ab", description=__doc__)
+    parser.add_argument("app", type=Path, help="arm A: app module exposing MODEL and build_initial_messages")
+    parser.add_argument("datasets", type=Path, nargs="+", help="YAML/JSONL dataset files")
+    parser.add_argument("--b-app", type=Path, default=None, help="arm B: another app module (default: app)")
+    parser.add_argument("--b-model", default=None, help="arm B: override MODEL")
+    parser.add_argument("--b-system-prompt", type=Path, default=None, help="arm B: system prompt file")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--cache", type=Path, default=None, help="SQLite response cache path")
+    parser.add_argument("--judge-model", default=JUDGE_MODEL)
+    args = parser.parse_args()
+    if not (args.b_app or args.b_model or args.b_system_prompt):
+        parser.error("arm B needs at least one of --b-app, --b-model, --b-system-prompt")
+
+    bot_a = Bot.from_module(load_app(args.app.resolve()))
+    bot_b = Bot.from_module(load_app(args.b_app.resolve())) if args.b_app else bot_a
+    system_prompt = None
+    if args.b_system_prompt:
+        system_prompt = args.b_system_prompt.read_text(encoding="utf-8")
+    bot_b = bot_b.with_overrides(model=args.b_model, system_prompt=system_prompt)
+
+    engine = EvalEngine(
+        bot_a,
+        judge_model=args.judge_model,
+        max_workers=args.workers,
+        cache_path=args.cache,
+    )
+    cases = []
+    for path in args.datasets:
+        dataset = load_dataset(path)
+        for case in dataset.cases:
+            cases.append({**case, "name": f"{dataset.name}/{case['name']}"})
+    results = run_ab(engine, bot_a, bot_b, cases)
+    print(f"A: {bot_a.model}  B: {bot_b.model}")
+    print("\n".join(ab_report(results)))
+    print(f"usage: {engine.usage}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Response cache for LLM calls, keyed by model + messages.
+
+Entries live in memory, or in a SQLite file when a path is given so repeat
+eval runs skip every call whose prompt has not changed. Each entry can carry
+the original call's stats (latency, token counts) so reports built from
+cached responses still have them.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+
+def cache_key(model: str, messages: list[dict]) -> str:
+    """Stable content hash of one completion request."""
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe key -> completion text store."""
+
+    def __init__(self, path: str | Path | None = None):
+        self._lock = threading.Lock()
+        self._memory: dict[str, str] = {}
+        self._stats: dict[str, dict] = {}
+        self._db = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, content TEXT NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS call_stats "
+                "(key TEXT PRIMARY KEY, stats TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._memory[key] = row[0]
+            return row[0]
+
+    def get_stats(self, key: str) -> dict | None:
+        """Stats stored with the entry, if any."""
+        with self._lock:
+            if key in self._stats:
+                return self._stats[key]
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT stats FROM call_stats WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._stats[key] = json.loads(row[0])
+            return self._stats[key]
+
+    def put(self, key: str, content: str, stats: dict | None = None) -> None:
+        with self._lock:
+            self._memory[key] = content
+            if stats is not None:
+                self._stats[key] = stats
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, content) VALUES (?, ?)",
+                    (key, content),
+                )
+                if stats is not None:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO call_stats (key, stats) VALUES (?, ?)",
+                        (key, json.dumps(stats)),
+                    )
+                self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,105 @@
+"""Load eval cases from YAML or JSONL dataset files.
+
+A dataset is one suite of cases plus the settings needed to score them:
+
+    kind: golden | rubric | rules
+    threshold: 6            # minimum judge rating (golden, rubric)
+    rubric: [...]           # list of rubric criteria (rubric)
+    check: contains | regex # how to score a response (rules)
+    pattern: "..."          # suite-wide regex (rules, check=regex)
+    ignore_case: false      # (rules)
+    cases:
+      - name: ...
+        input: ...
+        reference: ...      # golden
+        expected: ...       # rules, check=contains
+
+JSONL files hold one case per line; suite settings go in an optional first
+line of the form {"_meta": {"kind": "golden", ...}}.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+KINDS = ("golden", "rubric", "rules")
+CHECKS = ("contains", "regex")
+
+
+@dataclass
+class Dataset:
+    name: str
+    kind: str
+    cases: list[dict] = field(default_factory=list)
+    description: str = ""
+    threshold: int = 6
+    rubric: str | None = None
+    check: str = "contains"
+    pattern: str | None = None
+    ignore_case: bool = False
+
+
+def load_dataset(path: str | Path) -> Dataset:
+    """Read a YAML or JSONL dataset file and validate it."""
+    path = Path(path)
+    if path.suffix in (".yaml", ".yml"):
+        import yaml
+
+        raw = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    elif path.suffix == ".jsonl":
+        raw = _read_jsonl(path)
+    else:
+        raise ValueError(f"Unsupported dataset format: {path.name}")
+
+    rubric = raw.get("rubric")
+    if rubric is not None and not isinstance(rubric, str):
+        rubric = json.dumps(rubric)
+
+    dataset = Dataset(
+        name=raw.get("name", path.stem),
+        kind=raw.get("kind", ""),
+        cases=list(raw.get("cases", [])),
+        description=raw.get("description", ""),
+        threshold=int(raw.get("threshold", 6)),
+        rubric=rubric,
+        check=raw.get("check", "contains"),
+        pattern=raw.get("pattern"),
+        ignore_case=bool(raw.get("ignore_case", False)),
+    )
+    _validate(dataset, path)
+    return dataset
+
+
+def _read_jsonl(path: Path) -> dict:
+    raw: dict = {"cases": []}
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "_meta" in record:
+                raw.update(record["_meta"])
+            else:
+                raw["cases"].append(record)
+    return raw
+
+
+def _validate(dataset: Dataset, path: Path) -> None:
+    if dataset.kind not in KINDS:
+        raise ValueError(f"{path.name}: kind must be one of {KINDS}")
+    if dataset.kind == "rubric" and dataset.rubric is None:
+        raise ValueError(f"{path.name}: rubric datasets need a 'rubric'")
+    if dataset.kind == "rules" and dataset.check not in CHECKS:
+        raise ValueError(f"{path.name}: check must be one of {CHECKS}")
+
+    required = {"golden": ("reference",), "rubric": (), "rules": ()}[dataset.kind]
+    if dataset.kind == "rules" and dataset.check == "contains":
+        required = ("expected",)
+    if dataset.kind == "rules" and dataset.check == "regex" and not dataset.pattern:
+        required = ("pattern",)
+
+    for i, case in enumerate(dataset.cases):
+        missing = [k for k in ("name", "input", *required) if k not in case]
+        if missing:
+            raise ValueError(f"{path.name}: case {i} is missing {missing}")
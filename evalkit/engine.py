@@ -0,0 +1,457 @@
+"""Concurrent eval engine: bot generation, judging, caching, retries, and cost.
+
+Any app module exposing `MODEL` and `build_initial_messages()` can be wrapped
+in a `Bot` and run against YAML/JSONL datasets (see `datasets.py`).
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable
+
+import litellm
+from litellm import completion
+
+from .cache import ResponseCache, cache_key
+from .datasets import Dataset
+from .gate import GATE_METRICS, JudgeGate, append_history, metric_features
+from .judge import (
+    JUDGE_MODEL,
+    golden_messages,
+    parse_rating,
+    parse_ratings,
+    rubric_batch_messages,
+    rubric_batches,
+    rubric_messages,
+)
+from .stats import bootstrap_ci
+
+RETRYABLE_ERRORS = (
+    litellm.RateLimitError,
+    litellm.APIConnectionError,
+    litellm.Timeout,
+    litellm.ServiceUnavailableError,
+    litellm.InternalServerError,
+)
+
+# What judge reply parsers raise on a malformed reply.
+PARSE_ERRORS = (ValueError, KeyError, TypeError)
+
+
+# --- Bot (the system under test) ---
+
+
+@dataclass
+class Bot:
+    model: str
+    build_messages: Callable[[], list[dict]]
+    pre_check: Callable[[str], str | None] | None = None
+    post_check: Callable[[str, str], str] | None = None
+
+    @classmethod
+    def from_module(cls, module) -> "Bot":
+        """Wrap an app module, picking up its guardrails by naming convention.
+
+        Uses `safety_check(text)` and `looks_like_pitch(text)` + `REDIRECT_MSG`
+        as pre-generation checks and `post_generation_check(text, response)`
+        as the post-generation backstop when the module defines them.
+        """
+        checks = []
+        if hasattr(module, "safety_check"):
+            checks.append(module.safety_check)
+        if hasattr(module, "looks_like_pitch") and hasattr(module, "REDIRECT_MSG"):
+            looks_like, redirect = module.looks_like_pitch, module.REDIRECT_MSG
+            checks.append(lambda text: None if looks_like(text) else redirect)
+
+        def pre_check(text: str) -> str | None:
+            for check in checks:
+                result = check(text)
+                if result:
+                    return result
+            return None
+
+        return cls(
+            model=module.MODEL,
+            build_messages=module.build_initial_messages,
+            pre_check=pre_check if checks else None,
+            post_check=getattr(module, "post_generation_check", None),
+        )
+
+    def with_overrides(
+        self, model: str | None = None, system_prompt: str | None = None
+    ) -> "Bot":
+        """A copy with another model and/or system prompt (e.g. an A/B arm)."""
+        bot = replace(self, model=model or self.model)
+        if system_prompt is not None:
+            build = self.build_messages
+
+            def build_messages() -> list[dict]:
+                messages = build()
+                if messages and messages[0]["role"] == "system":
+                    return [{"role": "system", "content": system_prompt}, *messages[1:]]
+                return [{"role": "system", "content": system_prompt}, *messages]
+
+            bot.build_messages = build_messages
+        return bot
+
+
+# --- Results ---
+
+
+@dataclass
+class Usage:
+    calls: int = 0
+    cache_hits: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    judge_skips: int = 0
+    batch_fallbacks: int = 0
+
+    def __str__(self) -> str:
+        text = (
+            f"{self.calls} calls ({self.cache_hits} cached, {self.retries} retries), "
+            f"{self.prompt_tokens} prompt + {self.completion_tokens} completion "
+            f"tokens, ${self.cost:.4f}"
+        )
+        if self.judge_skips:
+            text += f", {self.judge_skips} judge calls skipped by the metric gate"
+        if self.batch_fallbacks:
+            text += f", {self.batch_fallbacks} judge batches re-judged one by one"
+        return text
+
+
+@dataclass
+class CallStats:
+    """One completion's latency and tokens (from the original call when cached)."""
+
+    latency: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached: bool = False
+
+
+@dataclass
+class CaseResult:
+    name: str
+    input: str
+    response: str
+    passed: bool
+    rating: int | None = None
+    gated: bool = False  # rating predicted from metrics, judge not called
+    features: dict | None = None
+
+
+# --- Engine ---
+
+
+class EvalEngine:
+    """Runs datasets against a bot with a thread pool, cache, and retries.
+
+    With a `gate` (see `gate.py`), golden cases skip the judge when cheap
+    metrics confidently predict pass or fail. With a `history_path`, judged
+    golden cases and their metric features are appended there for fitting
+    a gate. `EVALKIT_GATE` and `EVALKIT_HISTORY` set either from the
+    environment.
+
+    With `judge_batch` > 1 (or `EVALKIT_JUDGE_BATCH`), rubric cases are
+    judged up to that many per call, within `judge_batch_tokens` of
+    estimated prompt, so the rubric is sent once per batch.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        judge_model: str = JUDGE_MODEL,
+        max_workers: int = 8,
+        cache_path: str | Path | None = None,
+        retries: int = 3,
+        backoff: float = 1.0,
+        gate: JudgeGate | None = None,
+        history_path: str | Path | None = None,
+        gate_metrics=GATE_METRICS,
+        judge_batch: int | None = None,
+        judge_batch_tokens: int = 8_000,
+    ):
+        self.bot = bot
+        self.judge_model = judge_model
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        if os.environ.get("EVALKIT_NO_CACHE"):
+            cache_path = None
+        self.cache = ResponseCache(cache_path)
+        if gate is None and os.environ.get("EVALKIT_GATE"):
+            gate = JudgeGate.load(os.environ["EVALKIT_GATE"])
+        self.gate = gate
+        self.history_path = history_path or os.environ.get("EVALKIT_HISTORY")
+        self.gate_metrics = tuple(gate.metrics if gate is not None else gate_metrics)
+        if judge_batch is None:
+            judge_batch = int(os.environ.get("EVALKIT_JUDGE_BATCH", 1))
+        self.judge_batch = judge_batch
+        self.judge_batch_tokens = judge_batch_tokens
+        self.usage = Usage()
+        self._lock = threading.Lock()
+
+    # --- LLM calls ---
+
+    def complete(
+        self, model: str, messages: list[dict], parse: Callable[[str], Any] | None = None
+    ) -> Any:
+        """Cached, retried completion. Returns the message text, or `parse(text)`."""
+        return self.complete_with_stats(model, messages, parse)[0]
+
+    def complete_with_stats(
+        self, model: str, messages: list[dict], parse: Callable[[str], Any] | None = None
+    ) -> tuple[Any, CallStats]:
+        """`complete`, plus the call's latency and token counts.
+
+        A reply that `parse` rejects raises and is not cached, so a rerun asks
+        again instead of replaying the failure. A cached reply it rejects (from
+        a run without `parse`) is fetched afresh.
+        """
+        key = cache_key(model, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            try:
+                value = cached if parse is None else parse(cached)
+            except PARSE_ERRORS:
+                pass
+            else:
+                with self._lock:
+                    self.usage.cache_hits += 1
+                stats = CallStats(**(self.cache.get_stats(key) or {}), cached=True)
+                return value, stats
+
+        for attempt in range(self.retries + 1):
+            try:
+                start = time.perf_counter()
+                response = completion(model=model, messages=messages)
+                latency = time.perf_counter() - start
+                break
+            except RETRYABLE_ERRORS:
+                if attempt == self.retries:
+                    raise
+                with self._lock:
+                    self.usage.retries += 1
+                time.sleep(self.backoff * 2**attempt)
+
+        content = ""
+        if response.choices:
+            content = response.choices[0].message.content or ""
+        stats = self._record(response, latency)
+        value = content if parse is None else parse(content)
+        self.cache.put(
+            key,
+            content,
+            {
+                "latency": stats.latency,
+                "prompt_tokens": stats.prompt_tokens,
+                "completion_tokens": stats.completion_tokens,
+            },
+        )
+        return value, stats
+
+    def _record(self, response, latency: float) -> CallStats:
+        usage = getattr(response, "usage", None)
+        try:
+            cost = litellm.completion_cost(completion_response=response)
+        except Exception:
+            cost = 0.0
+        stats = CallStats(latency)
+        if usage is not None:
+            stats.prompt_tokens = usage.prompt_tokens or 0
+            stats.completion_tokens = usage.completion_tokens or 0
+        with self._lock:
+            self.usage.calls += 1
+            self.usage.cost += cost or 0.0
+            self.usage.prompt_tokens += stats.prompt_tokens
+            self.usage.completion_tokens += stats.completion_tokens
+        return stats
+
+    def get_review(self, text: str) -> str:
+        """Send text to the bot (with its guardrails) and return its response."""
+        return self.generate(text)[0]
+
+    def generate(self, text: str, bot: Bot | None = None) -> tuple[str, CallStats]:
+        """`get_review` for `bot` (default: the engine's), plus call stats.
+
+        A pre-check answer makes no LLM call and reports zero stats.
+        """
+        bot = bot or self.bot
+        if bot.pre_check is not None:
+            early = bot.pre_check(text or "")
+            if early:
+                return early, CallStats()
+        messages = bot.build_messages()
+        messages.append({"role": "user", "content": text or "(empty)"})
+        raw, stats = self.complete_with_stats(bot.model, messages)
+        if bot.post_check is not None:
+            return bot.post_check(text, raw), stats
+        return raw, stats
+
+    def judge_with_golden(self, prompt: str, reference: str, response: str) -> int:
+        """Judge a response against a golden reference. Returns rating 1-10."""
+        messages = golden_messages(prompt, reference, response)
+        return self.complete(self.judge_model, messages, parse_rating)
+
+    def judge_with_rubric(self, prompt: str, response: str, rubric: str) -> int:
+        """Judge a response against a rubric. Returns rating 1-10."""
+        messages = rubric_messages(prompt, response, rubric)
+        return self.complete(self.judge_model, messages, parse_rating)
+
+    def judge_rubric_batch(self, items: list[tuple[str, str]], rubric: str) -> list[int]:
+        """Judge several (prompt, response) items in one call. Returns ratings 1-10.
+
+        If the judge's array doesn't rate every item exactly once, each item
+        is re-judged with `judge_with_rubric`.
+        """
+        if len(items) > 1:
+            messages = rubric_batch_messages(items, rubric)
+            try:
+                return self.complete(
+                    self.judge_model, messages, lambda text: parse_ratings(text, len(items))
+                )
+            except PARSE_ERRORS:
+                with self._lock:
+                    self.usage.batch_fallbacks += 1
+        return [self.judge_with_rubric(p, r, rubric) for p, r in items]
+
+    # --- Datasets ---
+
+    def map(self, fn: Callable, items: list) -> list:
+        """Apply fn to items concurrently, preserving input order."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(fn, items))
+
+    def run(self, dataset: Dataset) -> list[CaseResult]:
+        """Score every case in the dataset concurrently."""
+        scorers = {
+            "golden": self._score_golden,
+            "rubric": self._score_rubric,
+            "rules": self._score_rules,
+        }
+        if dataset.kind == "rubric" and self.judge_batch > 1:
+            return self._run_rubric_batched(dataset)
+        score = scorers[dataset.kind]
+        results = self.map(lambda case: score(dataset, case), dataset.cases)
+        if self.history_path and dataset.kind == "golden":
+            records = [
+                {
+                    "dataset": dataset.name,
+                    "case": r.name,
+                    "features": r.features,
+                    "rating": r.rating,
+                }
+                for r in results
+                if not r.gated
+            ]
+            append_history(self.history_path, records)
+        return results
+
+    def _score_golden(self, dataset: Dataset, case: dict) -> CaseResult:
+        response = self.get_review(case["input"])
+        features = None
+        if self.gate is not None or self.history_path:
+            features = metric_features(case["reference"], response, self.gate_metrics)
+        if self.gate is not None:
+            decision = self.gate.decide(features, dataset.threshold)
+            if decision is not None:
+                with self._lock:
+                    self.usage.judge_skips += 1
+                rating, passed = decision
+                return CaseResult(
+                    case["name"],
+                    case["input"],
+                    response,
+                    passed,
+                    rating,
+                    gated=True,
+                    features=features,
+                )
+        rating = self.judge_with_golden(case["input"], case["reference"], response)
+        return CaseResult(
+            case["name"],
+            case["input"],
+            response,
+            rating >= dataset.threshold,
+            rating,
+            features=features,
+        )
+
+    def _score_rubric(self, dataset: Dataset, case: dict) -> CaseResult:
+        response = self.get_review(case["input"])
+        rating = self.judge_with_rubric(case["input"], response, dataset.rubric)
+        return CaseResult(
+            case["name"], case["input"], response, rating >= dataset.threshold, rating
+        )
+
+    def _run_rubric_batched(self, dataset: Dataset) -> list[CaseResult]:
+        """Generate every response, then judge them in packed batches."""
+        inputs = [case["input"] for case in dataset.cases]
+        items = list(zip(inputs, self.map(self.get_review, inputs)))
+        batches = rubric_batches(
+            items, dataset.rubric, self.judge_batch, self.judge_batch_tokens
+        )
+        rated = self.map(
+            lambda batch: self.judge_rubric_batch(
+                [items[i] for i in batch], dataset.rubric
+            ),
+            batches,
+        )
+        ratings = {}
+        for batch, batch_ratings in zip(batches, rated):
+            ratings.update(zip(batch, batch_ratings))
+        return [
+            CaseResult(
+                case["name"],
+                prompt,
+                response,
+                ratings[i] >= dataset.threshold,
+                ratings[i],
+            )
+            for i, (case, (prompt, response)) in enumerate(zip(dataset.cases, items))
+        ]
+
+    def _score_rules(self, dataset: Dataset, case: dict) -> CaseResult:
+        response = self.get_review(case["input"])
+        if dataset.check == "regex":
+            flags = re.IGNORECASE if dataset.ignore_case else 0
+            pattern = case.get("pattern", dataset.pattern)
+            passed = bool(re.search(pattern, response, flags))
+        elif dataset.ignore_case:
+            passed = case["expected"].lower() in response.lower()
+        else:
+            passed = case["expected"] in response
+        return CaseResult(case["name"], case["input"], response, passed)
+
+
+def report(dataset: Dataset, results: list[CaseResult]) -> list[str]:
+    """Per-case lines plus a summary line, in the evals' print format."""
+    if dataset.kind == "rules":
+        lines = [f"  {r.name}: {'PASS' if r.passed else 'FAIL'}" for r in results]
+        passed = sum(r.passed for r in results)
+        lines.append(f"  passed: {passed}/{len(results)}")
+        return lines
+    lines = [
+        f"  {r.name}: {r.rating}/10" + (" (metric-gated)" if r.gated else "")
+        for r in results
+    ]
+    # Gated ratings are predictions, not judge scores: keep them out of the CI.
+    judged = [r.rating for r in results if not r.gated]
+    if judged:
+        average, low, high = bootstrap_ci(judged)
+        lines.append(f"  average: {average:.1f}/10 (95% CI {low:.1f}-{high:.1f})")
+    gated = [r for r in results if r.gated]
+    if gated:
+        passed = sum(r.passed for r in gated)
+        lines.append(
+            f"  judge skipped: {len(gated)}/{len(results)} cases "
+            f"({passed} predicted pass, not in the average)"
+        )
+    return lines
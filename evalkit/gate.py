@@ -0,0 +1,232 @@
+"""Metric-gated judging: skip the LLM judge when cheap metrics already agree.
+
+Golden cases compare a response to a reference, so overlap and similarity
+metrics from `eval-metrics/main.py` predict much of the judge's rating. A
+`JudgeGate` is a linear fit of historical judge ratings on those metrics plus
+a margin taken from leave-one-out errors. At eval time the judge is skipped
+when the predicted rating clears the pass threshold by more than the margin,
+or misses it by more than the margin:
+
+    gate = fit_gate(history)              # records with "features" and "rating"
+    gate.decide(features, threshold=6)    # (rating, passed), or None -> call the judge
+
+The metrics need NumPy (and spaCy for "semantic"), which the chatbot projects
+don't ship; run gated evals with them added, e.g. `uv run --with numpy ...`.
+"""
+
+import importlib.util
+import json
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+GATE_METRICS = ("rougeL", "semantic", "token_f1")
+EVAL_METRICS_DIR = Path(__file__).resolve().parent.parent / "eval-metrics"
+
+# --- Metric features ---
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def _eval_metrics():
+    """Import eval-metrics/main.py by path, as `main`, the name its siblings import.
+
+    The directory is appended to sys.path so those sibling imports (`lcs`,
+    `bertscore`, ...) resolve without shadowing modules already importable
+    under the same names.
+    """
+    global _scorer
+    with _scorer_lock:
+        if _scorer is None:
+            path = EVAL_METRICS_DIR / "main.py"
+            loaded = sys.modules.get("main")
+            if loaded is not None:
+                if Path(getattr(loaded, "__file__", None) or "").resolve() != path:
+                    raise ImportError(
+                        f"another `main` module ({loaded.__file__}) is imported; "
+                        "eval-metrics needs that name"
+                    )
+                _scorer = loaded
+            else:
+                if str(EVAL_METRICS_DIR) not in sys.path:
+                    sys.path.append(str(EVAL_METRICS_DIR))
+                spec = importlib.util.spec_from_file_location("main", path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules["main"] = module
+                try:
+                    spec.loader.exec_module(module)
+                except BaseException:
+                    del sys.modules["main"]
+                    raise
+                _scorer = module
+    return _scorer
+
+
+def metric_features(
+    reference: str, response: str, metrics=GATE_METRICS
+) -> dict[str, float]:
+    """Cheap metric scores of a response against its golden reference."""
+    columns = _eval_metrics().score_pairs([response], [reference], metrics=metrics)
+    return {name: float(columns[name][0]) for name in metrics}
+
+
+# --- Fitting ---
+
+
+def _solve(a: list[list[float]], b: list[float]) -> list[float]:
+    """Solve the small linear system a·x = b by Gaussian elimination."""
+    n = len(b)
+    rows = [row[:] + [v] for row, v in zip(a, b)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(n):
+            if r != col and rows[col][col]:
+                factor = rows[r][col] / rows[col][col]
+                rows[r] = [x - factor * y for x, y in zip(rows[r], rows[col])]
+    return [rows[i][n] / rows[i][i] if rows[i][i] else 0.0 for i in range(n)]
+
+
+def _least_squares(
+    xs: list[list[float]], ys: list[float], ridge: float = 1e-3
+) -> list[float]:
+    """Weights (bias first) of a ridge-regularized linear fit of ys on xs."""
+    xs = [[1.0, *x] for x in xs]
+    k = len(xs[0])
+    gram = [[sum(x[i] * x[j] for x in xs) for j in range(k)] for i in range(k)]
+    for i in range(1, k):
+        gram[i][i] += ridge
+    return _solve(gram, [sum(x[i] * y for x, y in zip(xs, ys)) for i in range(k)])
+
+
+def _predict(weights: list[float], x: list[float]) -> float:
+    raw = weights[0] + sum(w * v for w, v in zip(weights[1:], x))
+    return min(10.0, max(1.0, raw))
+
+
+def _verdict(rating: int, margin: float, threshold: int) -> bool | None:
+    """Pass/fail of a rounded predicted rating, or None if the margin could flip it.
+
+    The margin test runs on the rounded rating, the one a gated case reports,
+    so the verdict always agrees with the rating shown.
+    """
+    if rating - margin >= threshold:
+        return True
+    if rating + margin < threshold:
+        return False
+    return None
+
+
+def _quantile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, round(q * (len(values) - 1)))]
+
+
+@dataclass
+class JudgeGate:
+    """Linear rating predictor over metric features, with a skip margin."""
+
+    metrics: tuple[str, ...]
+    weights: list[float]  # bias first, then one weight per metric
+    margin: float
+    n_history: int = 0
+
+    def predict(self, features: dict[str, float]) -> float:
+        """Predicted judge rating, clipped to 1-10."""
+        return _predict(self.weights, [features[m] for m in self.metrics])
+
+    def decide(self, features: dict[str, float], threshold: int) -> tuple[int, bool] | None:
+        """(rating, passed) when the prediction is confidently pass or fail, else None."""
+        rating = round(self.predict(features))
+        passed = _verdict(rating, self.margin, threshold)
+        return None if passed is None else (rating, passed)
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(asdict(self), indent=2) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "JudgeGate":
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(**{**raw, "metrics": tuple(raw["metrics"])})
+
+
+def _xy(history: list[dict], metrics) -> tuple[list[list[float]], list[float]]:
+    xs = [[record["features"][m] for m in metrics] for record in history]
+    return xs, [float(record["rating"]) for record in history]
+
+
+def _loo_predictions(xs: list[list[float]], ys: list[float]) -> list[float]:
+    """Each rating predicted by a fit on every other record."""
+    return [
+        _predict(_least_squares(xs[:i] + xs[i + 1 :], ys[:i] + ys[i + 1 :]), x)
+        for i, x in enumerate(xs)
+    ]
+
+
+def fit_gate(
+    history: list[dict], metrics=GATE_METRICS, coverage: float = 0.9
+) -> JudgeGate:
+    """Fit a gate on records with "features" (metric -> score) and "rating".
+
+    The margin is the `coverage` quantile of the absolute leave-one-out
+    errors, so a skipped case's rating is within the margin of the judge's
+    about `coverage` of the time.
+    """
+    metrics = tuple(metrics)
+    if len(history) < len(metrics) + 2:
+        raise ValueError(f"need at least {len(metrics) + 2} judged cases to fit a gate")
+    xs, ys = _xy(history, metrics)
+    errors = [abs(p - y) for p, y in zip(_loo_predictions(xs, ys), ys)]
+    margin = _quantile(errors, coverage)
+    return JudgeGate(metrics, _least_squares(xs, ys), margin, len(history))
+
+
+def evaluate_gate(
+    history: list[dict], threshold: int, metrics=GATE_METRICS, coverage: float = 0.9
+) -> dict:
+    """Leave-one-out judge-call savings and pass/fail agreement of a gate.
+
+    Each record is gated by a gate fitted without it (its margin from the
+    full history). "savings" is the fraction of judge calls skipped,
+    "agreement" the fraction of skipped cases whose pass/fail matches the
+    judge, and "overall_agreement" the same over every case, counting judged
+    cases as agreeing.
+    """
+    gate = fit_gate(history, metrics, coverage)
+    xs, ys = _xy(history, gate.metrics)
+    skipped = agreed = 0
+    for rating, judged in zip(_loo_predictions(xs, ys), ys):
+        passed = _verdict(round(rating), gate.margin, threshold)
+        if passed is not None:
+            skipped += 1
+            agreed += passed == (judged >= threshold)
+    n = len(history)
+    return {
+        "cases": n,
+        "skipped": skipped,
+        "savings": skipped / n,
+        "agreement": agreed / skipped if skipped else 1.0,
+        "overall_agreement": (n - skipped + agreed) / n,
+    }
+
+
+# --- History ---
+
+
+def read_history(path: str | Path) -> list[dict]:
+    """Judged golden cases appended by earlier runs (JSONL), oldest first."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(path: str | Path, records: list[dict]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
@@ -0,0 +1,218 @@
+"""Model-as-a-Judge prompts and rating parsing shared by every bot's evals."""
+
+import json
+
+JUDGE_MODEL = "vertex_ai/gemini-2.0-flash"
+
+JUDGE_SYSTEM_GOLDEN = """\
+You are an expert evaluator. Given a user prompt, a reference response, and a \
+generated response, please rate the overall quality of the generated response \
+on a scale of 1 to 10 based on how well it compares to the reference response. \
+Consider factors such as accuracy, completeness, coherence, and helpfulness \
+when comparing to the reference. The reference response represents a \
+high-quality answer that you should use as a benchmark. Start your response \
+with a valid JSON object. The JSON object should contain a single key "rating" \
+and the value should be an integer between 1 and 10.
+
+Example response:
+{
+  "rating": 7
+}"""
+
+JUDGE_SYSTEM_RUBRIC = """\
+You are an expert evaluator. Given a user prompt, a generated response, and a \
+list of quality rubrics, please rate the overall quality of the response on a \
+scale of 1 to 10 based on how well it satisfies the rubrics. Consider all \
+rubrics holistically when determining your score. A response that violates \
+multiple rubrics should receive a lower score, while a response that satisfies \
+all rubrics should receive a higher score. Start your response with a valid \
+JSON object. The JSON object should contain a single key "rating" and the \
+value should be an integer between 1 and 10.
+
+Example response:
+{
+  "rating": 7
+}"""
+
+
+JUDGE_SYSTEM_RUBRIC_BATCH = """\
+You are an expert evaluator. Given a list of rubrics and several numbered \
+items, each a user prompt with a generated response, please rate the overall \
+quality of each response on a scale of 1 to 10 based on how well it satisfies \
+the rubrics. Judge every item on its own merits, independently of the other \
+items. Consider all rubrics holistically when determining each score. A \
+response that violates multiple rubrics should receive a lower score, while \
+a response that satisfies all rubrics should receive a higher score. Start \
+your response with a valid JSON array holding one object per item, in item \
+order. Each object should contain the keys "id" (the item number) and \
+"rating" (an integer between 1 and 10).
+
+Example response for two items:
+[
+  {"id": 1, "rating": 7},
+  {"id": 2, "rating": 4}
+]"""
+
+
+JUDGE_SYSTEM_PAIRWISE = """\
+You are an expert evaluator. Given a user prompt, optionally a reference \
+response, and two generated responses labeled 1 and 2, decide which response \
+is better overall. Consider factors such as accuracy, completeness, \
+coherence, and helpfulness; when a reference is given, use it as a benchmark \
+of a high-quality answer. Do not let the order of the responses or their \
+length influence your decision. Start your response with a valid JSON object. \
+The JSON object should contain a single key "winner" and the value should be \
+"1", "2", or "tie".
+
+Example response:
+{
+  "winner": "2"
+}"""
+
+
+def golden_messages(prompt: str, reference: str, response: str) -> list[dict]:
+    """Build the judge conversation for a golden-reference comparison."""
+    user_msg = (
+        "Given the following prompt, reference response, and generated "
+        "response, please rate the overall quality of the generated response "
+        "on a scale of 1 to 10 based on how well it compares to the reference."
+        f"\n\n<prompt>\n{prompt}\n</prompt>"
+        f"\n\n<reference_response>\n{reference}\n</reference_response>"
+        f"\n\n<generated_response>\n{response}\n</generated_response>"
+    )
+    return [
+        {"role": "system", "content": JUDGE_SYSTEM_GOLDEN},
+        {"role": "user", "content": user_msg},
+    ]
+
+
+def rubric_messages(prompt: str, response: str, rubric: str) -> list[dict]:
+    """Build the judge conversation for a rubric-based rating."""
+    user_msg = (
+        "Given the following prompt, response, and rubrics, please rate the "
+        "overall quality of the response on a scale of 1 to 10 based on how "
+        "well it satisfies the rubrics."
+        f"\n\n<prompt>\n{prompt}\n</prompt>"
+        f"\n\n<response>\n{response}\n</response>"
+        f"\n\n<rubrics>\n{rubric}\n</rubrics>"
+    )
+    return [
+        {"role": "system", "content": JUDGE_SYSTEM_RUBRIC},
+        {"role": "user", "content": user_msg},
+    ]
+
+
+def rubric_batch_item(index: int, prompt: str, response: str) -> str:
+    """One numbered item of a batched rubric request."""
+    return (
+        f'<item id="{index}">'
+        f"\n<prompt>\n{prompt}\n</prompt>"
+        f"\n<response>\n{response}\n</response>"
+        "\n</item>"
+    )
+
+
+def rubric_batch_messages(items: list[tuple[str, str]], rubric: str) -> list[dict]:
+    """Build one judge conversation rating several (prompt, response) items."""
+    body = "\n\n".join(
+        rubric_batch_item(i, prompt, response)
+        for i, (prompt, response) in enumerate(items, 1)
+    )
+    user_msg = (
+        f"Given the following rubrics and {len(items)} items, please rate the "
+        "overall quality of each item's response on a scale of 1 to 10 based "
+        "on how well it satisfies the rubrics."
+        f"\n\n<rubrics>\n{rubric}\n</rubrics>"
+        f"\n\n{body}"
+    )
+    return [
+        {"role": "system", "content": JUDGE_SYSTEM_RUBRIC_BATCH},
+        {"role": "user", "content": user_msg},
+    ]
+
+
+def pairwise_messages(
+    prompt: str, response_1: str, response_2: str, reference: str | None = None
+) -> list[dict]:
+    """Build the judge conversation comparing two responses to one prompt."""
+    user_msg = (
+        "Given the following prompt and two generated responses, decide which "
+        "response is better overall."
+        f"\n\n<prompt>\n{prompt}\n</prompt>"
+    )
+    if reference is not None:
+        user_msg += f"\n\n<reference_response>\n{reference}\n</reference_response>"
+    user_msg += (
+        f"\n\n<response_1>\n{response_1}\n</response_1>"
+        f"\n\n<response_2>\n{response_2}\n</response_2>"
+    )
+    return [
+        {"role": "system", "content": JUDGE_SYSTEM_PAIRWISE},
+        {"role": "user", "content": user_msg},
+    ]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English)."""
+    return len(text) // 4 + 1
+
+
+def rubric_batches(
+    items: list[tuple[str, str]], rubric: str, max_items: int, max_tokens: int
+) -> list[list[int]]:
+    """Split item indices into consecutive batches under both limits.
+
+    The system prompt and rubric are counted once per batch. An item too
+    large for the budget on its own still gets a batch of one.
+    """
+    overhead = estimate_tokens(JUDGE_SYSTEM_RUBRIC_BATCH) + estimate_tokens(rubric) + 50
+    batches: list[list[int]] = []
+    used = overhead
+    for i, (prompt, response) in enumerate(items):
+        size = estimate_tokens(rubric_batch_item(i + 1, prompt, response))
+        if batches and len(batches[-1]) < max_items and used + size <= max_tokens:
+            batches[-1].append(i)
+            used += size
+        else:
+            batches.append([i])
+            used = overhead + size
+    return batches
+
+
+def parse_rating(text: str) -> int:
+    """Extract the integer rating from the judge's JSON response."""
+    start = text.index("{")
+    end = text.index("}", start) + 1
+    return int(json.loads(text[start:end])["rating"])
+
+
+def parse_ratings(text: str, n: int) -> list[int]:
+    """Extract n ratings, in item order, from the judge's JSON array.
+
+    Raises ValueError unless the array rates items 1..n exactly once each
+    with integers from 1 to 10.
+    """
+    start = text.index("[")
+    end = text.rindex("]") + 1
+    entries = json.loads(text[start:end])
+    if not isinstance(entries, list) or len(entries) != n:
+        raise ValueError(f"expected {n} ratings")
+    ratings = {}
+    for entry in entries:
+        item, rating = int(entry["id"]), entry["rating"]
+        if not isinstance(rating, int) or not 1 <= rating <= 10:
+            raise ValueError(f"invalid rating for item {item}: {rating!r}")
+        ratings[item] = rating
+    if sorted(ratings) != list(range(1, n + 1)):
+        raise ValueError(f"expected ratings for items 1..{n}")
+    return [ratings[i] for i in range(1, n + 1)]
+
+
+def parse_winner(text: str) -> str:
+    """Extract "1", "2", or "tie" from the judge's pairwise JSON response."""
+    start = text.index("{")
+    end = text.index("}", start) + 1
+    winner = str(json.loads(text[start:end])["winner"]).strip().lower()
+    if winner not in ("1", "2", "tie"):
+        raise ValueError(f"invalid winner: {winner!r}")
+    return winner
@@ -0,0 +1,62 @@
+"""Bootstrap intervals for judge ratings.
+
+Eval suites have a handful of cases, so an average rating alone can't show
+whether a 0.2 change is noise. These are plain-Python percentile bootstraps
+(the chatbot projects don't ship NumPy; eval-metrics/bootstrap.py is the
+vectorized version for large metric columns).
+"""
+
+import random
+
+
+def _percentiles(samples: list[float], confidence: float) -> tuple[float, float]:
+    samples = sorted(samples)
+    alpha = (1 - confidence) / 2
+    last = len(samples) - 1
+    return samples[round(alpha * last)], samples[round((1 - alpha) * last)]
+
+
+def _resampled_means(
+    values: list[float], n_resamples: int, seed: int | None
+) -> list[float]:
+    rng = random.Random(seed)
+    n = len(values)
+    return [sum(rng.choices(values, k=n)) / n for _ in range(n_resamples)]
+
+
+def bootstrap_ci(
+    values: list[float],
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int | None = 0,
+) -> tuple[float, float, float]:
+    """(mean, low, high) percentile interval for the mean of values."""
+    if not values:
+        raise ValueError("cannot bootstrap an empty list")
+    samples = _resampled_means(list(values), n_resamples, seed)
+    return (sum(values) / len(values), *_percentiles(samples, confidence))
+
+
+def paired_bootstrap(
+    a: list[float],
+    b: list[float],
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int | None = 0,
+) -> dict:
+    """Mean of b - a over paired cases, its interval, and a two-sided p-value."""
+    if len(a) != len(b):
+        raise ValueError("paired samples must have the same length")
+    if not a:
+        raise ValueError("cannot bootstrap an empty list")
+    diffs = [y - x for x, y in zip(a, b)]
+    samples = _resampled_means(diffs, n_resamples, seed)
+    low, high = _percentiles(samples, confidence)
+    below = sum(s <= 0 for s in samples) / n_resamples
+    above = sum(s >= 0 for s in samples) / n_resamples
+    return {
+        "diff": sum(diffs) / len(diffs),
+        "low": low,
+        "high": high,
+        "p_value": min(1.0, 2 * min(below, above)),
+    }
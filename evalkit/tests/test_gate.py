@@ -0,0 +1,44 @@
+"""Gated pass/fail must agree with the rating a gated case reports."""
+
+import pytest
+
+from evalkit.gate import JudgeGate, evaluate_gate
+
+
+def gate_predicting(rating: float, margin: float) -> JudgeGate:
+    """A gate whose prediction is `rating` for any features."""
+    return JudgeGate(("rougeL",), [rating, 0.0], margin)
+
+
+@pytest.mark.parametrize(
+    "predicted, margin, expected",
+    [
+        (5.6, 0.3, None),  # rounds to 6, within the margin of threshold 6: ask the judge
+        (5.4, 0.3, (5, False)),
+        (6.4, 0.3, None),  # a rating of 6 only passes with no margin
+        (6.6, 0.3, (7, True)),
+        (5.9, 0.6, None),
+        (7.0, 0.6, (7, True)),
+        (4.2, 0.6, (4, False)),
+    ],
+)
+def test_decide_rounds_before_the_margin_test(predicted, margin, expected):
+    assert gate_predicting(predicted, margin).decide({"rougeL": 0.0}, threshold=6) == expected
+
+
+def test_decision_never_contradicts_shown_rating():
+    threshold = 6
+    for tenths in range(10, 101):
+        for margin in (0.0, 0.2, 0.49, 0.5, 1.0):
+            decision = gate_predicting(tenths / 10, margin).decide({"rougeL": 0.0}, threshold)
+            if decision is not None:
+                rating, passed = decision
+                assert passed == (rating >= threshold), (tenths, margin)
+
+
+def test_evaluate_gate_scores_the_reported_verdict():
+    """Judge ratings just under the threshold, predicted just under it too."""
+    history = [{"features": {"rougeL": x / 10}, "rating": 5 + x / 10} for x in range(10)]
+    result = evaluate_gate(history, threshold=6, metrics=("rougeL",))
+    assert result["skipped"] > 0
+    assert result["agreement"] == 1.0
@@ -2,7 +2,8 @@ import uuid
 
 import uvicorn
 from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Gauge, Histogram, generate_latest
 from pydantic import BaseModel
 
 # TODO: Import the completion function from litellm
@@ -51,6 +52,16 @@ def generate_response(messages: list[dict]) -> str:
 sessions: dict[str, list[dict]] = {}
 
 
+# --- Metrics ---
+
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+REQUEST_SECONDS = Histogram(
+    "chat_request_seconds", "Time in the /chat handler", buckets=SLOW_BUCKETS
+)
+LLM_SECONDS = Histogram("chat_llm_seconds", "Time in the LLM call", buckets=SLOW_BUCKETS)
+Gauge("chat_sessions", "Sessions held in memory").set_function(lambda: len(sessions))
+
+
 # --- FastAPI App ---
 
 app = FastAPI()
@@ -72,6 +83,7 @@ def index():
 
 
 @app.post("/chat", response_model=ChatResponse)
+@REQUEST_SECONDS.time()
 def chat(request: ChatRequest):
     # Get or create session
     session_id = request.session_id or str(uuid.uuid4())
@@ -83,7 +95,8 @@ def chat(request: ChatRequest):
     sessions[session_id].append({"role": "user", "content": request.message})
 
     # Generate response
-    response_text = generate_response(sessions[session_id])
+    with LLM_SECONDS.time():
+        response_text = generate_response(sessions[session_id])
 
     # Add assistant response to conversation history
     sessions[session_id].append({"role": "assistant", "content": response_text})
@@ -91,6 +104,11 @@ def chat(request: ChatRequest):
     return ChatResponse(response=response_text, session_id=session_id)
 
 
+@app.get("/metrics")
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.post("/clear")
 def clear(session_id: str | None = None):
     if session_id and session_id in sessions:
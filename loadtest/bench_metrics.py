@@ -0,0 +1,93 @@
+"""Time the Prometheus instrumentation a chatbot's /chat adds per request.
+
+Loads the app module and times the metric updates one request makes
+(`record_chat`, `record_usage`, and the handler's `time.perf_counter` calls)
+in a tight loop, so the overhead isn't lost in LLM or HTTP noise:
+
+    uv run --project Q7A-chatbot python loadtest/bench_metrics.py Q7A-chatbot
+    uv run --project strunk-white-chat python loadtest/bench_metrics.py strunk-white-chat --max-us 10
+
+Exits non-zero when the LLM-path overhead exceeds --max-us. Apps that trace
+their stages also report what the spans cost, without an exporter attached.
+"""
+
+import argparse
+import importlib.util
+import inspect
+import os
+import sys
+import time
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+
+def load_app(app_dir: Path):
+    # Offline: use litellm's bundled cost map instead of fetching it at import.
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    sys.path.insert(0, str(app_dir))
+    spec = importlib.util.spec_from_file_location("app", app_dir / "app.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def per_call_us(fn, number: int) -> float:
+    """Best-of-5 microseconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("app", type=Path, help="app directory (with app.py)")
+    parser.add_argument("--number", type=int, default=100_000, help="calls per timing")
+    parser.add_argument("--max-us", type=float, default=None, help="fail above this overhead")
+    args = parser.parse_args()
+
+    app = load_app(args.app.resolve())
+    guarded = "guardrail" in inspect.signature(app.record_chat).parameters
+    if guarded:
+        llm_path = lambda: app.record_chat(1.2, 2e-5, 3e-5, llm=1.1)  # noqa: E731
+        short_path = lambda: app.record_chat(2e-4, 2e-5, 3e-5, short_circuit="redirect")  # noqa: E731
+    else:
+        llm_path = lambda: app.record_chat(1.2, 3e-5, 1.1)  # noqa: E731
+        short_path = None
+    response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=1200, completion_tokens=300))
+
+    # Every timestamp in chat() and respond(), short-circuit branches included: an upper bound.
+    sources = [
+        inspect.getsource(fn) for fn in (app.chat, getattr(app, "respond", None)) if fn is not None
+    ]
+    stamps = sum(source.count("time.perf_counter()") for source in sources)
+    stage_count = sum(source.count("stages.stage(") for source in sources)
+    stamps += 1 + 2 * stage_count if stage_count else 0  # Stages: one to start, two per stage
+    rows = [
+        ("record_chat (LLM path)", per_call_us(llm_path, args.number)),
+        ("record_usage", per_call_us(lambda: app.record_usage(response), args.number)),
+        (f"time.perf_counter x{stamps}", stamps * per_call_us(time.perf_counter, args.number)),
+    ]
+    llm_total = sum(us for _, us in rows)
+    for label, us in rows:
+        print(f"{label:<28} {us:6.2f} us")
+    print(f"{'per LLM request':<28} {llm_total:6.2f} us")
+    if short_path is not None:
+        short_total = per_call_us(short_path, args.number) + 3 * per_call_us(
+            time.perf_counter, args.number
+        )
+        print(f"{'per short-circuited request':<28} {short_total:6.2f} us")
+    if hasattr(app, "tracer"):
+        # Spans are a separate cost from the metrics: the root span plus one per stage.
+        def span():
+            with app.tracer.start_as_current_span("bench"):
+                pass
+
+        spans = 1 + stage_count
+        print(f"{f'tracing, {spans} spans':<28} {spans * per_call_us(span, args.number // 10):6.2f} us")
+    if args.max_us is not None and llm_total > args.max_us:
+        print(f"over budget: {llm_total:.2f} us > {args.max_us:g} us")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
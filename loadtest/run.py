@@ -0,0 +1,227 @@
+"""Drive a chatbot's /chat at increasing request rates against the stub LLM.
+
+Starts `stub_llm.py` and the app (uvicorn, pointed at the stub through
+LLM_MODEL / OPENAI_API_BASE), then sends open-loop traffic: each step fires
+requests on a fixed schedule at the given rate whether or not earlier ones
+have finished, the way real users would. Reports throughput, latency
+percentiles, and error rates per step:
+
+    uv run --project Q7A-chatbot python loadtest/run.py Q7A-chatbot --rps 2 5 10 20 40
+    uv run --project strunk-white-chat python loadtest/run.py strunk-white-chat \
+        --stub-args "--ttft 0.8 --error-429 0.02" --duration 30 --json results.json
+    uv run --project Q7A-chatbot python loadtest/run.py --url http://127.0.0.1:8000 --rps 5 10
+
+Request bodies are the inputs of the app's `evals/datasets/golden.yaml`. App
+responses starting with "Something went wrong" (the apps' wrapper for a
+failed LLM call) count as errors even though /chat returns 200.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shlex
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import httpx
+import yaml
+
+LOADTEST_DIR = Path(__file__).resolve().parent
+APP_ERROR_PREFIX = "Something went wrong"
+
+
+@dataclass
+class StepResult:
+    rps: float
+    sent: int = 0
+    ok: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    throughput: float = 0.0  # successful responses per second
+    p50: float | None = None
+    p95: float | None = None
+    p99: float | None = None
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors.values()) / self.sent if self.sent else 0.0
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile of an ascending list (None when empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, round(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def _send(client: httpx.AsyncClient, url: str, message: str, timeout: float):
+    """(latency, error kind or None) for one /chat request."""
+    start = time.perf_counter()
+    try:
+        response = await client.post(f"{url}/chat", json={"message": message}, timeout=timeout)
+    except httpx.TimeoutException:
+        return time.perf_counter() - start, "timeout"
+    except httpx.HTTPError:
+        return time.perf_counter() - start, "connection"
+    latency = time.perf_counter() - start
+    if response.status_code != 200:
+        return latency, f"http_{response.status_code}"
+    if response.json().get("response", "").startswith(APP_ERROR_PREFIX):
+        return latency, "llm_error"
+    return latency, None
+
+
+async def run_step(
+    url: str,
+    messages: list[str],
+    rps: float,
+    duration: float,
+    timeout: float,
+    poisson: bool = False,
+    seed: int = 0,
+) -> StepResult:
+    """Send `rps` requests per second for `duration` seconds; wait for all to finish."""
+    rng = random.Random(seed)
+    n = max(1, round(rps * duration))
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(limits=limits) as client:
+        start = time.perf_counter()
+        tasks, at = [], 0.0
+        for i in range(n):
+            delay = start + at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            message = messages[i % len(messages)]
+            tasks.append(asyncio.create_task(_send(client, url, message, timeout)))
+            at += rng.expovariate(rps) if poisson else 1 / rps
+        outcomes = await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    step = StepResult(rps=rps, sent=n)
+    latencies = sorted(latency for latency, error in outcomes if error is None)
+    for _, error in outcomes:
+        if error is not None:
+            step.errors[error] = step.errors.get(error, 0) + 1
+    step.ok = len(latencies)
+    step.throughput = step.ok / elapsed
+    step.p50, step.p95, step.p99 = (percentile(latencies, q) for q in (50, 95, 99))
+    return step
+
+
+# --- Processes ---
+
+
+def _wait_until_up(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def start_stub(port: int, stub_args: str) -> subprocess.Popen:
+    cmd = [sys.executable, str(LOADTEST_DIR / "stub_llm.py"), "--port", str(port)]
+    process = subprocess.Popen(cmd + shlex.split(stub_args))
+    _wait_until_up(f"http://127.0.0.1:{port}/health")
+    return process
+
+
+def start_app(app_dir: Path, port: int, stub_port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "LLM_MODEL": "openai/stub",
+        "OPENAI_API_BASE": f"http://127.0.0.1:{stub_port}/v1",
+        "OPENAI_API_KEY": "stub",
+        # Offline: use litellm's bundled cost map instead of fetching it at import.
+        "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+    }
+    cmd = [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"]
+    process = subprocess.Popen(cmd, cwd=app_dir, env=env)
+    _wait_until_up(f"http://127.0.0.1:{port}/")
+    return process
+
+
+def load_messages(path: Path) -> list[str]:
+    cases = (yaml.safe_load(path.read_text(encoding="utf-8")) or {}).get("cases", [])
+    return [case["input"] for case in cases]
+
+
+def format_table(steps: list[StepResult]) -> list[str]:
+    def ms(value: float | None) -> str:
+        return "-" if value is None else f"{value * 1000:.0f}"
+
+    lines = [
+        f"{'rps':>6} {'sent':>6} {'ok':>6} {'err%':>6} {'thru/s':>7} "
+        f"{'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}  errors"
+    ]
+    for s in steps:
+        errors = ", ".join(f"{k} {v}" for k, v in sorted(s.errors.items())) or "-"
+        lines.append(
+            f"{s.rps:>6g} {s.sent:>6} {s.ok:>6} {s.error_rate:>6.1%} {s.throughput:>7.1f} "
+            f"{ms(s.p50):>7} {ms(s.p95):>7} {ms(s.p99):>7}  {errors}"
+        )
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("app", type=Path, nargs="?", help="app directory to start (with app.py)")
+    parser.add_argument("--url", default=None, help="test an already-running app instead")
+    parser.add_argument("--rps", type=float, nargs="+", default=[1, 2, 5, 10, 20])
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per step")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout")
+    parser.add_argument("--poisson", action="store_true", help="Poisson arrivals, not evenly spaced")
+    parser.add_argument("--dataset", type=Path, default=None, help="YAML whose case inputs are sent")
+    parser.add_argument("--stub-args", default="", help='stub_llm.py options, e.g. "--ttft 0.3"')
+    parser.add_argument("--stop-error-rate", type=float, default=0.5, help="stop after a worse step")
+    parser.add_argument("--app-port", type=int, default=8000)
+    parser.add_argument("--stub-port", type=int, default=8900)
+    parser.add_argument("--json", type=Path, default=None, help="also write results here")
+    args = parser.parse_args()
+    if (args.app is None) == (args.url is None):
+        parser.error("give an app directory or --url")
+
+    dataset = args.dataset
+    if dataset is None:
+        if args.app is None:
+            parser.error("--url needs --dataset")
+        dataset = args.app / "evals" / "datasets" / "golden.yaml"
+    messages = load_messages(dataset)
+
+    processes = []
+    try:
+        url = args.url
+        if url is None:
+            processes.append(start_stub(args.stub_port, args.stub_args))
+            processes.append(start_app(args.app.resolve(), args.app_port, args.stub_port))
+            url = f"http://127.0.0.1:{args.app_port}"
+        steps = []
+        for i, rps in enumerate(args.rps):
+            step = asyncio.run(
+                run_step(url, messages, rps, args.duration, args.timeout, args.poisson, seed=i)
+            )
+            steps.append(step)
+            print(format_table(steps)[-1] if i else "\n".join(format_table(steps)), flush=True)
+            if step.error_rate > args.stop_error_rate:
+                print(f"stopping: error rate above {args.stop_error_rate:.0%}")
+                break
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            process.wait(timeout=10)
+
+    if args.json:
+        args.json.write_text(json.dumps([asdict(s) for s in steps], indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""Local OpenAI-compatible stub LLM for offline load and latency benchmarks.
+
+Speaks the `/v1/chat/completions` API that litellm's `openai/` provider uses,
+streaming or not, and answers with canned or template responses after a
+simulated delay. Point an app at it with:
+
+    LLM_MODEL=openai/stub OPENAI_API_BASE=http://127.0.0.1:8900/v1 OPENAI_API_KEY=stub
+
+Run it from a chatbot's environment (FastAPI and uvicorn are already there):
+
+    uv run --project Q7A-chatbot python loadtest/stub_llm.py --ttft 0.4 --tokens-per-second 80
+    uv run --project Q7A-chatbot python loadtest/stub_llm.py \
+        --responses Q7A-chatbot/evals/datasets/golden.yaml --error-429 0.02 --error-5xx 0.01
+
+Timing per request: time to first token ~ lognormal(median=--ttft,
+sigma=--ttft-sigma), then one token per 1/--tokens-per-second. Errors are
+injected before any delay, as a rate limiter or overloaded backend would.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+FILLER = (
+    "This is a stub response used for load testing. It has no meaning, but its "
+    "length and pacing follow the configured token rate so latency and "
+    "throughput numbers resemble a real model."
+).split()
+
+
+@dataclass
+class StubConfig:
+    ttft: float = 0.5  # median seconds to first token
+    ttft_sigma: float = 0.3  # lognormal sigma; 0 for a fixed delay
+    tokens_per_second: float = 60.0
+    output_tokens: int = 200  # template response length
+    error_429: float = 0.0  # fraction of requests rejected with 429
+    error_5xx: float = 0.0  # fraction failed with 500/503
+    chunk_tokens: int = 4  # tokens per streamed chunk
+    responses: list[str] = field(default_factory=list)
+    seed: int | None = None
+
+
+def load_responses(path: Path) -> list[str]:
+    """Canned responses: a dataset's references (YAML), JSONL "response"s, or text lines."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        import yaml
+
+        cases = (yaml.safe_load(text) or {}).get("cases", [])
+        return [case["reference"] for case in cases if "reference" in case]
+    if path.suffix == ".jsonl":
+        return [json.loads(line)["response"] for line in text.splitlines() if line.strip()]
+    return [line for line in text.splitlines() if line.strip()]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _template_response(prompt: str, n_tokens: int) -> str:
+    head = " ".join(prompt.split()[:12])
+    words = [f"Stub reply to: {head}."]
+    words += [FILLER[i % len(FILLER)] for i in range(max(0, n_tokens - len(words[0].split())))]
+    return " ".join(words)
+
+
+def _pieces(text: str, size: int) -> list[str]:
+    """Text split into chunks of `size` words that concatenate back to it."""
+    words = text.split(" ")
+    return [
+        " ".join(words[i : i + size]) + (" " if i + size < len(words) else "")
+        for i in range(0, len(words), size)
+    ]
+
+
+def create_app(config: StubConfig) -> FastAPI:
+    rng = random.Random(config.seed)
+    app = FastAPI()
+    app.state.requests = 0
+
+    def pick_response(messages: list[dict]) -> str:
+        prompt = next(
+            (m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), ""
+        )
+        if config.responses:
+            return config.responses[zlib.crc32(str(prompt).encode()) % len(config.responses)]
+        return _template_response(str(prompt), config.output_tokens)
+
+    def first_token_delay() -> float:
+        if config.ttft_sigma <= 0:
+            return config.ttft
+        return rng.lognormvariate(math.log(max(config.ttft, 1e-6)), config.ttft_sigma)
+
+    def injected_error() -> JSONResponse | None:
+        roll = rng.random()
+        if roll < config.error_429:
+            return _error(429, "rate_limit_error", "stub: rate limit exceeded", {"Retry-After": "1"})
+        if roll < config.error_429 + config.error_5xx:
+            status = rng.choice((500, 503))
+            return _error(status, "server_error", f"stub: injected {status}")
+        return None
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok", "requests": app.state.requests}
+
+    @app.get("/v1/models")
+    def models():
+        return {"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "stub"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        app.state.requests += 1
+        body = await request.json()
+        error = injected_error()
+        if error is not None:
+            return error
+        messages = body.get("messages", [])
+        model = body.get("model", "stub")
+        text = pick_response(messages)
+        prompt_tokens = sum(estimate_tokens(str(m.get("content") or "")) for m in messages)
+        completion_tokens = estimate_tokens(text)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        ttft = first_token_delay()
+        per_token = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            await asyncio.sleep(ttft + completion_tokens * per_token)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+
+        def chunk(delta: dict, finish: str | None = None, **extra) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                **extra,
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def events():
+            await asyncio.sleep(ttft)
+            yield chunk({"role": "assistant", "content": ""})
+            pieces = _pieces(text, config.chunk_tokens)
+            for piece in pieces:
+                await asyncio.sleep(completion_tokens * per_token / len(pieces))
+                yield chunk({"content": piece})
+            include_usage = (body.get("stream_options") or {}).get("include_usage")
+            yield chunk({}, "stop", **({"usage": usage} if include_usage else {}))
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def _error(status: int, kind: str, message: str, headers: dict | None = None) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"message": message, "type": kind, "code": status}},
+        status_code=status,
+        headers=headers,
+    )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--ttft", type=float, default=0.5, help="median seconds to first token")
+    parser.add_argument("--ttft-sigma", type=float, default=0.3, help="lognormal sigma (0 = fixed)")
+    parser.add_argument("--tokens-per-second", type=float, default=60.0)
+    parser.add_argument("--output-tokens", type=int, default=200, help="template response length")
+    parser.add_argument("--chunk-tokens", type=int, default=4, help="tokens per streamed chunk")
+    parser.add_argument("--responses", type=Path, default=None, help="canned responses file")
+    parser.add_argument("--error-429", type=float, default=0.0, help="fraction of 429s")
+    parser.add_argument("--error-5xx", type=float, default=0.0, help="fraction of 500/503s")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.chunk_tokens < 1:
+        parser.error("--chunk-tokens must be at least 1")
+    return args
+
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        ttft=args.ttft,
+        ttft_sigma=args.ttft_sigma,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        chunk_tokens=args.chunk_tokens,
+        error_429=args.error_429,
+        error_5xx=args.error_5xx,
+        responses=load_responses(args.responses) if args.responses else [],
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
@@ -1,17 +1,29 @@
+import os
+import time
 import uuid
 
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from litellm import completion
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    ProcessCollector,
+    generate_latest,
+)
 from pydantic import BaseModel
 
 load_dotenv()
 
 # --- Config ---
 
-MODEL = "vertex_ai/gemini-3.0-flash-lite"
+# LLM_MODEL overrides the model, e.g. to point load tests at loadtest/stub_llm.py.
+MODEL = os.environ.get("LLM_MODEL", "vertex_ai/gemini-3.0-flash-lite")
 
 SYSTEM_PROMPT = """\
 <role>
@@ -225,6 +237,7 @@ def generate_response(messages: list[dict]) -> str:
     """
     try:
         response = completion(model=MODEL, messages=messages)
+        record_usage(response)
         return response.choices[0].message.content
     except Exception as e:
         return f"Something went wrong: {e}"
@@ -242,6 +255,59 @@ def generate_response(messages: list[dict]) -> str:
 sessions: dict[str, list[dict]] = {}
 
 
+# --- Metrics ---
+
+# Metrics go on a private registry. An A/B eval with `--b-app` runs two app
+# modules in one process, and on the global registry the second one's
+# chat_* metrics would fail as duplicates.
+REGISTRY = CollectorRegistry()
+ProcessCollector(registry=REGISTRY)
+
+FAST_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 0.01)
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+REQUEST_SECONDS = Histogram(
+    "chat_request_seconds", "Time in the /chat handler", buckets=SLOW_BUCKETS, registry=REGISTRY
+)
+LLM_SECONDS = Histogram(
+    "chat_llm_seconds", "Time in the LLM call", buckets=SLOW_BUCKETS, registry=REGISTRY
+)
+SERIALIZATION_SECONDS = Histogram(
+    "chat_serialization_seconds", "Time serializing the /chat response",
+    buckets=FAST_BUCKETS, registry=REGISTRY,
+)
+TOKENS = Counter("chat_llm_tokens", "LLM tokens used", ["kind"], registry=REGISTRY)
+_PROMPT_TOKENS = TOKENS.labels("prompt")
+_COMPLETION_TOKENS = TOKENS.labels("completion")
+
+# Session gauges are computed when scraped, so requests pay nothing for them.
+Gauge("chat_sessions", "Sessions held in memory", registry=REGISTRY).set_function(
+    lambda: len(sessions)
+)
+Gauge(
+    "chat_session_bytes", "UTF-8 bytes of message content held in sessions", registry=REGISTRY
+).set_function(
+    lambda: sum(
+        len((m["content"] or "").encode()) for s in list(sessions.values()) for m in list(s)
+    )
+)
+
+
+def record_usage(response) -> None:
+    """Count the prompt and completion tokens of an LLM response."""
+    usage = getattr(response, "usage", None)
+    if usage:
+        _PROMPT_TOKENS.inc(usage.prompt_tokens or 0)
+        _COMPLETION_TOKENS.inc(usage.completion_tokens or 0)
+
+
+def record_chat(total: float, serialization: float, llm: float) -> None:
+    """Record one /chat request's stage timings (seconds)."""
+    REQUEST_SECONDS.observe(total)
+    SERIALIZATION_SECONDS.observe(serialization)
+    LLM_SECONDS.observe(llm)
+
+
 # --- FastAPI App ---
 
 app = FastAPI()
@@ -264,6 +330,8 @@ def index():
 
 @app.post("/chat", response_model=ChatResponse)
 def chat(request: ChatRequest):
+    start = time.perf_counter()
+
     # Get or create session
     session_id = request.session_id or str(uuid.uuid4())
     if session_id not in sessions:
@@ -274,12 +342,24 @@ def chat(request: ChatRequest):
     sessions[session_id].append({"role": "user", "content": request.message})
 
     # Generate response
+    llm_start = time.perf_counter()
     response_text = generate_response(sessions[session_id])
+    llm = time.perf_counter() - llm_start
 
     # Add assistant response to conversation history
     sessions[session_id].append({"role": "assistant", "content": response_text})
 
-    return ChatResponse(response=response_text, session_id=session_id)
+    # Serialize here rather than letting FastAPI do it, so its time can be measured
+    serialize_start = time.perf_counter()
+    body = ChatResponse(response=response_text, session_id=session_id).model_dump_json()
+    end = time.perf_counter()
+    record_chat(end - start, end - serialize_start, llm)
+    return Response(body, media_type="application/json")
+
+
+@app.get("/metrics")
+def metrics():
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.post("/clear")